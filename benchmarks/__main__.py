@@ -0,0 +1,117 @@
+# benchmarks/__main__.py
+"""
+사용법 (저장소 루트에서):
+    python -m benchmarks                          # 두 서비스 모두 실행, 기준선과 비교
+    python -m benchmarks --service reward --sizes 1000
+    python -m benchmarks --output results.json    # 결과를 JSON으로 저장
+    python -m benchmarks --service review --workers 1,2,4   # 워커 수별 처리량도 측정
+    python -m benchmarks --save-baseline          # 결과를 기준선으로 저장
+
+두 서비스가 모두 최상위 패키지 이름으로 app을 쓰므로 서비스마다 별도 프로세스에서 실행합니다.
+기준선보다 회귀하거나 기준선에 없는 시나리오가 있으면 종료 코드 1로 끝납니다.
+"""
+import argparse
+import asyncio
+import os
+import subprocess
+import sys
+import tempfile
+from typing import List
+
+from .harness import DEFAULT_TOLERANCE, ScenarioResult, compare, format_table, read_results, write_results
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SERVICE_DIRS = {"review": "review_service", "reward": "reward_service"}
+DEFAULT_BASELINE = os.path.join(ROOT, "benchmarks", "baseline.json")
+
+
+def _parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description="Review system load and latency benchmarks.")
+    parser.add_argument("--service", choices=["all", *SERVICE_DIRS], default="all")
+    parser.add_argument("--requests", type=int, default=2000, help="HTTP requests per review scenario.")
+    parser.add_argument("--concurrency", type=int, default=16, help="Concurrent HTTP requests.")
+    parser.add_argument("--ids", type=int, default=1_000_000, help="Review ids generated per id scenario.")
+    parser.add_argument("--decode-events", type=int, default=100_000, help="Stored events decoded per decode scenario.")
+    parser.add_argument(
+        "--sizes", default="1000,100000,1000000",
+        type=lambda value: [int(size) for size in value.split(",")],
+        help="Comma-separated event counts for reward scenarios.",
+    )
+    parser.add_argument(
+        "--workers", default=[],
+        type=lambda value: [int(count) for count in value.split(",") if count],
+        help="Comma-separated worker counts for the multi-worker serving scenario (off by default).",
+    )
+    parser.add_argument("--output", help="Write results as JSON to this path.")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="Baseline JSON to compare against.")
+    parser.add_argument("--save-baseline", action="store_true", help="Overwrite the baseline with these results.")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE, help="Allowed slowdown ratio.")
+    return parser.parse_args(argv)
+
+
+def _run_service_in_process(service: str, args: argparse.Namespace) -> List[ScenarioResult]:
+    sys.path.insert(0, os.path.join(ROOT, SERVICE_DIRS[service]))
+    if service == "review":
+        from . import review_api, review_ids, review_workers
+        results = review_ids.run(args.ids) + asyncio.run(review_api.run(args.requests, args.concurrency))
+        return results + review_workers.run(args.workers, args.requests, args.concurrency)
+    from . import reward_decode, reward_store
+    return reward_decode.run(args.decode_events) + asyncio.run(reward_store.run(args.sizes))
+
+
+def _run_service_subprocess(service: str, args: argparse.Namespace) -> List[ScenarioResult]:
+    with tempfile.TemporaryDirectory() as directory:
+        output = os.path.join(directory, f"{service}.json")
+        subprocess.run(
+            [
+                sys.executable, "-m", "benchmarks",
+                "--service", service,
+                "--requests", str(args.requests),
+                "--concurrency", str(args.concurrency),
+                "--ids", str(args.ids),
+                "--decode-events", str(args.decode_events),
+                "--sizes", ",".join(map(str, args.sizes)),
+                "--workers", ",".join(map(str, args.workers)),
+                "--output", output,
+                "--baseline", "",
+            ],
+            cwd=ROOT,
+            check=True,
+            stdout=subprocess.DEVNULL,
+        )
+        return read_results(output)
+
+
+def main(argv=None) -> int:
+    args = _parse_args(argv)
+    if args.service == "all":
+        results = [result for service in SERVICE_DIRS for result in _run_service_subprocess(service, args)]
+    else:
+        results = _run_service_in_process(args.service, args)
+
+    print(format_table(results))
+    if args.output:
+        write_results(args.output, results)
+    if args.save_baseline:
+        write_results(DEFAULT_BASELINE, results)
+        print(f"Baseline saved to {DEFAULT_BASELINE}")
+        return 0
+
+    if args.baseline and os.path.exists(args.baseline):
+        comparison = compare(read_results(args.baseline), results, args.tolerance)
+        if comparison.regressions:
+            print(f"\n{len(comparison.regressions)} regression(s) against {args.baseline}:")
+            for regression in comparison.regressions:
+                print(f"  {regression}")
+        if comparison.missing:
+            print(f"\n{len(comparison.missing)} scenario(s) have no baseline; rerun with --save-baseline:")
+            for service, scenario, size in comparison.missing:
+                print(f"  {service}/{scenario}[{size}]")
+        if not comparison.ok:
+            return 1
+        print(f"\nNo regressions against {args.baseline} (tolerance {args.tolerance:.0%}).")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
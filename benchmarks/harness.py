@@ -0,0 +1,177 @@
+# benchmarks/harness.py
+"""
+벤치마크 공통 도구: 지연 측정, 백분위수 요약, JSON 결과 저장, 기준선(baseline) 비교.
+서비스 코드(app 패키지)에 의존하지 않으므로 두 서비스의 시나리오가 함께 씁니다.
+"""
+import asyncio
+import json
+import platform
+import statistics
+import time
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from typing import Awaitable, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+# 기준선보다 이 비율 이상 느려지면 회귀로 봅니다.
+DEFAULT_TOLERANCE = 0.3
+
+
+@dataclass
+class ScenarioResult:
+    service: str
+    scenario: str
+    size: int
+    operations: int
+    concurrency: int
+    elapsed_s: float
+    throughput: float
+    mean_ms: float
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+
+    @property
+    def key(self) -> Tuple[str, str, int]:
+        return self.service, self.scenario, self.size
+
+
+def percentile(sorted_values: Sequence[float], pct: float) -> float:
+    """선형 보간 백분위수. sorted_values는 오름차순이어야 합니다."""
+    if not sorted_values:
+        return 0.0
+    rank = (len(sorted_values) - 1) * pct / 100
+    lower = int(rank)
+    upper = min(lower + 1, len(sorted_values) - 1)
+    return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * (rank - lower)
+
+
+def summarize(
+    service: str,
+    scenario: str,
+    size: int,
+    latencies_s: List[float],
+    elapsed_s: float,
+    concurrency: int = 1,
+    operations: Optional[int] = None,
+) -> ScenarioResult:
+    """
+    측정한 지연 목록을 요약합니다. operations는 처리량 계산에 쓰는 작업 수이며,
+    한 번의 측정이 여러 건을 처리하는 경우(예: 이벤트 배치 저장) 지연 개수와 다를 수 있습니다.
+    """
+    ordered = sorted(latencies_s)
+    operations = len(ordered) if operations is None else operations
+    ms = [latency * 1000 for latency in ordered]
+    return ScenarioResult(
+        service=service,
+        scenario=scenario,
+        size=size,
+        operations=operations,
+        concurrency=concurrency,
+        elapsed_s=round(elapsed_s, 4),
+        throughput=round(operations / elapsed_s, 2) if elapsed_s > 0 else 0.0,
+        mean_ms=round(statistics.fmean(ms), 4) if ms else 0.0,
+        p50_ms=round(percentile(ms, 50), 4),
+        p95_ms=round(percentile(ms, 95), 4),
+        p99_ms=round(percentile(ms, 99), 4),
+    )
+
+
+async def measure(
+    operation: Callable[[int], Awaitable[object]],
+    count: int,
+    concurrency: int = 1,
+) -> Tuple[List[float], float]:
+    """
+    operation(i)를 count번, 최대 concurrency개씩 동시에 실행하고 (호출별 지연, 전체 경과 시간)을 돌려줍니다.
+    """
+    latencies: List[float] = []
+    indexes = iter(range(count))
+
+    async def worker():
+        for i in indexes:
+            started = time.perf_counter()
+            await operation(i)
+            latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(min(concurrency, count))))
+    return latencies, time.perf_counter() - started
+
+
+def write_results(path: str, results: Iterable[ScenarioResult]):
+    document = {
+        "meta": {
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+        },
+        "results": [asdict(result) for result in results],
+    }
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(document, f, ensure_ascii=False, indent=2)
+        f.write("\n")
+
+
+def read_results(path: str) -> List[ScenarioResult]:
+    with open(path, encoding="utf-8") as f:
+        return [ScenarioResult(**result) for result in json.load(f)["results"]]
+
+
+@dataclass
+class Regression:
+    key: Tuple[str, str, int]
+    metric: str
+    baseline: float
+    current: float
+
+    def __str__(self) -> str:
+        service, scenario, size = self.key
+        change = (self.current - self.baseline) / self.baseline * 100 if self.baseline else float("inf")
+        return f"{service}/{scenario}[{size}] {self.metric}: {self.baseline} -> {self.current} ({change:+.1f}%)"
+
+
+@dataclass
+class Comparison:
+    regressions: List[Regression]
+    # 기준선에 없어 비교하지 못한 시나리오. 새 시나리오를 추가했으면 기준선을 다시 저장해야 합니다.
+    missing: List[Tuple[str, str, int]]
+
+    @property
+    def ok(self) -> bool:
+        return not self.regressions and not self.missing
+
+
+def compare(
+    baseline: Iterable[ScenarioResult],
+    current: Iterable[ScenarioResult],
+    tolerance: float = DEFAULT_TOLERANCE,
+) -> Comparison:
+    """
+    이번 결과를 기준선과 비교합니다. 처리량은 낮아질 때, p95/p99는 높아질 때 회귀입니다.
+    기준선에 없는 시나리오는 건너뛰지 않고 missing으로 알립니다.
+    """
+    baseline_by_key: Dict[Tuple[str, str, int], ScenarioResult] = {result.key: result for result in baseline}
+    regressions = []
+    missing = []
+    for result in current:
+        before = baseline_by_key.get(result.key)
+        if before is None:
+            missing.append(result.key)
+            continue
+        if result.throughput < before.throughput * (1 - tolerance):
+            regressions.append(Regression(result.key, "throughput", before.throughput, result.throughput))
+        for metric in ("p95_ms", "p99_ms"):
+            if getattr(result, metric) > getattr(before, metric) * (1 + tolerance):
+                regressions.append(Regression(result.key, metric, getattr(before, metric), getattr(result, metric)))
+    return Comparison(regressions, missing)
+
+
+def format_table(results: Iterable[ScenarioResult]) -> str:
+    header = f"{'scenario':<34}{'size':>9}{'ops':>9}{'ops/s':>12}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}"
+    lines = [header, "-" * len(header)]
+    for r in results:
+        lines.append(
+            f"{r.service + '/' + r.scenario:<34}{r.size:>9}{r.operations:>9}"
+            f"{r.throughput:>12.1f}{r.p50_ms:>10.3f}{r.p95_ms:>10.3f}{r.p99_ms:>10.3f}"
+        )
+    return "\n".join(lines)
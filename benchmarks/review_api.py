@@ -0,0 +1,106 @@
+# benchmarks/review_api.py
+"""
+review_service API 시나리오. FastAPI 앱을 ASGITransport로 프로세스 안에서 호출하고,
+DB는 임시 SQLite 파일, 메시지 버스는 테스트용 FakeMessageBus를 씁니다.
+review_service 디렉터리가 sys.path에 있어야 합니다(benchmarks/__main__.py가 맞춰 줍니다).
+"""
+import os
+import random
+import tempfile
+from typing import List
+
+import httpx
+
+from .harness import ScenarioResult, measure, summarize
+
+SERVICE = "review"
+BATCH_SIZE = 100
+
+
+async def run(requests: int, concurrency: int) -> List[ScenarioResult]:
+    with tempfile.TemporaryDirectory() as directory:
+        # app.database가 엔진을 만들기 전에 DB를 지정해야 합니다.
+        os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{directory}/review_bench.db"
+        from app.database import engine
+        from app.main import app
+        from app.messaging.bus import get_message_bus
+        from app.schema import create_schema
+        from tests.conftest import FakeMessageBus
+
+        await create_schema(engine)
+        bus = FakeMessageBus()
+        app.dependency_overrides[get_message_bus] = lambda: bus
+        try:
+            # 압축은 별도 시나리오에서만 켭니다. 나머지 시나리오는 압축 전 처리 비용을 잽니다.
+            async with httpx.AsyncClient(
+                transport=httpx.ASGITransport(app=app), base_url="http://bench", headers={"Accept-Encoding": "identity"},
+            ) as client:
+                return await _run_scenarios(client, requests, concurrency)
+        finally:
+            app.dependency_overrides.clear()
+            await engine.dispose()
+
+
+async def _run_scenarios(client: httpx.AsyncClient, requests: int, concurrency: int) -> List[ScenarioResult]:
+    rng = random.Random(42)
+    results = []
+    review_ids: List[int] = []
+
+    async def create_review(i: int):
+        response = await client.post("/reviews/", json={
+            "rating": rng.randint(1, 5),
+            "comment": f"benchmark review {i} " + rng.choice(["great", "okay", "bad", "fast delivery"]),
+        })
+        response.raise_for_status()
+        review_ids.append(response.json()["id"])
+
+    async def create_batch(i: int):
+        response = await client.post("/reviews/batch", json=[
+            {"rating": rng.randint(1, 5), "comment": f"benchmark batch {i}-{j}"} for j in range(BATCH_SIZE)
+        ])
+        response.raise_for_status()
+
+    async def get_review(i: int):
+        response = await client.get(f"/reviews/{review_ids[i % len(review_ids)]}")
+        response.raise_for_status()
+
+    async def list_reviews(i: int):
+        response = await client.get("/reviews/", params={"limit": 20})
+        response.raise_for_status()
+
+    async def list_reviews_msgpack(i: int):
+        response = await client.get("/reviews/", params={"limit": 20}, headers={"Accept": "application/msgpack"})
+        response.raise_for_status()
+
+    async def list_reviews_gzip(i: int):
+        response = await client.get("/reviews/", params={"limit": 20}, headers={"Accept-Encoding": "gzip"})
+        response.raise_for_status()
+
+    async def list_product_reviews(i: int):
+        response = await client.get(f"/products/PROD-{i % 10 + 1:03}/reviews", params={"limit": 20})
+        response.raise_for_status()
+
+    async def search_reviews(i: int):
+        response = await client.get("/reviews/search", params={"q": rng.choice(["great", "fast delivery"]), "limit": 20})
+        response.raise_for_status()
+
+    latencies, elapsed = await measure(create_review, requests, concurrency)
+    results.append(summarize(SERVICE, "create_review", requests, latencies, elapsed, concurrency))
+
+    batches = max(1, requests // BATCH_SIZE)
+    latencies, elapsed = await measure(create_batch, batches, concurrency)
+    results.append(summarize(
+        SERVICE, "create_reviews_batch", requests, latencies, elapsed, concurrency, operations=batches * BATCH_SIZE,
+    ))
+
+    for name, operation in (
+        ("get_review", get_review),
+        ("list_reviews", list_reviews),
+        ("list_reviews_msgpack", list_reviews_msgpack),
+        ("list_reviews_gzip", list_reviews_gzip),
+        ("list_product_reviews", list_product_reviews),
+        ("search_reviews", search_reviews),
+    ):
+        latencies, elapsed = await measure(operation, requests, concurrency)
+        results.append(summarize(SERVICE, name, requests, latencies, elapsed, concurrency))
+    return results
@@ -0,0 +1,42 @@
+# benchmarks/review_ids.py
+"""
+리뷰 ID 생성 시나리오. 호출 하나는 타이머 해상도보다 짧으므로 ROUND_SIZE개씩 묶어 잽니다.
+review_service 디렉터리가 sys.path에 있어야 합니다.
+"""
+import time
+from typing import Callable, List
+
+from .harness import ScenarioResult, summarize
+
+SERVICE = "review"
+ROUND_SIZE = 1000
+BLOCK_SIZE = 500
+
+
+def _measure_rounds(generate_round: Callable[[], object], ids: int) -> tuple:
+    latencies = []
+    rounds = max(1, ids // ROUND_SIZE)
+    started = time.perf_counter()
+    for _ in range(rounds):
+        round_started = time.perf_counter()
+        generate_round()
+        latencies.append(time.perf_counter() - round_started)
+    return latencies, time.perf_counter() - started, rounds * ROUND_SIZE
+
+
+def run(ids: int) -> List[ScenarioResult]:
+    from tsidpy import TSID
+
+    from app.ids import IdGenerator
+
+    generator = IdGenerator(node=1)
+    scenarios = {
+        "tsidpy_create": lambda: [TSID.create().number for _ in range(ROUND_SIZE)],
+        "id_generator_next": lambda: [generator.next_id() for _ in range(ROUND_SIZE)],
+        "id_generator_allocate": lambda: [generator.allocate(BLOCK_SIZE) for _ in range(ROUND_SIZE // BLOCK_SIZE)],
+    }
+    results = []
+    for name, generate_round in scenarios.items():
+        latencies, elapsed, operations = _measure_rounds(generate_round, ids)
+        results.append(summarize(SERVICE, name, ids, latencies, elapsed, operations=operations))
+    return results
@@ -0,0 +1,71 @@
+# benchmarks/reward_decode.py
+"""
+저장된 이벤트 행을 도메인 이벤트로 바꾸는 비용. DB 없이 행 모양만 흉내 냅니다.
+- event_decode_getattr: 이전 경로. 드라이버가 JSON을 dict로 풀고 getattr로 클래스를 찾아 cls(**payload)
+- event_decode_registry: 레지스트리의 신뢰 경로. JSON 텍스트를 클래스 검증기가 바로 파싱
+- event_decode_upcast: 옛 이름으로 저장된 행을 업캐스터를 거쳐 복원
+reward_service 디렉터리가 sys.path에 있어야 합니다.
+"""
+import json
+import time
+from typing import Callable, List
+
+from .harness import ScenarioResult, summarize
+
+SERVICE = "reward"
+ROUND_SIZE = 1000
+
+
+def _stored_rows() -> List[tuple]:
+    from app.domain import events
+    from app.domain.registry import event_registry
+
+    rows = []
+    for i in range(ROUND_SIZE):
+        event = events.RewardPointsGranted(user_id=f"user-{i}", review_id=f"review-{i}", points=10, reason="benchmark")
+        rows.append((event_registry.name_of(event), json.dumps(event.model_dump(mode="json"))))
+    return rows
+
+
+def _measure_rounds(decode_round: Callable[[], object], count: int) -> tuple:
+    latencies = []
+    rounds = max(1, count // ROUND_SIZE)
+    started = time.perf_counter()
+    for _ in range(rounds):
+        round_started = time.perf_counter()
+        decode_round()
+        latencies.append(time.perf_counter() - round_started)
+    return latencies, time.perf_counter() - started, rounds * ROUND_SIZE
+
+
+def run(count: int) -> List[ScenarioResult]:
+    from app.domain import events
+    from app.domain.registry import EventRegistry, event_registry
+
+    rows = _stored_rows()
+    legacy_registry = EventRegistry()
+    legacy_registry.register(events.RewardPointsGranted)
+    legacy_registry.upcaster("PointsAwarded")(lambda payload: ("RewardPointsGranted", payload))
+    legacy_rows = [("PointsAwarded", payload) for _, payload in rows]
+
+    def decode_getattr():
+        # SQLAlchemy JSON 타입의 json.loads까지 포함해야 이전 경로와 같은 일을 합니다.
+        return [getattr(events, event_type)(**json.loads(payload)) for event_type, payload in rows]
+
+    def decode_registry():
+        decode = event_registry.decode_stored
+        return [decode(event_type, payload) for event_type, payload in rows]
+
+    def decode_upcast():
+        decode = legacy_registry.decode_stored
+        return [decode(event_type, payload) for event_type, payload in legacy_rows]
+
+    results = []
+    for name, decode_round in (
+        ("event_decode_getattr", decode_getattr),
+        ("event_decode_registry", decode_registry),
+        ("event_decode_upcast", decode_upcast),
+    ):
+        latencies, elapsed, operations = _measure_rounds(decode_round, count)
+        results.append(summarize(SERVICE, name, count, latencies, elapsed, operations=operations))
+    return results
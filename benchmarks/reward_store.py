@@ -0,0 +1,99 @@
+# benchmarks/reward_store.py
+"""
+reward_service 이벤트 저장소/프로젝션 시나리오. 크기(이벤트 수)마다 새 임시 SQLite 파일을 씁니다.
+reward_service 디렉터리가 sys.path에 있어야 합니다(benchmarks/__main__.py가 맞춰 줍니다).
+"""
+import tempfile
+import time
+from typing import List
+
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from .harness import ScenarioResult, summarize
+
+SERVICE = "reward"
+# 한 번의 save()에 담는 이벤트 수와 프로젝션 커밋 단위
+SAVE_BATCH_SIZE = 100
+PROJECTION_COMMIT_EVERY = 1000
+# 작은 크기에서는 load를 여러 번 반복해 백분위수를 의미 있게 만듭니다.
+LOAD_EVENT_BUDGET = 100_000
+MAX_LOAD_REPEATS = 20
+
+
+async def run(sizes: List[int]) -> List[ScenarioResult]:
+    results = []
+    for size in sizes:
+        with tempfile.TemporaryDirectory() as directory:
+            engine = create_async_engine(f"sqlite+aiosqlite:///{directory}/reward_bench.db")
+            try:
+                results.extend(await _run_size(engine, size))
+            finally:
+                await engine.dispose()
+    return results
+
+
+async def _run_size(engine, size: int) -> List[ScenarioResult]:
+    from app.adapters import orm  # noqa: F401  테이블을 메타데이터에 등록합니다.
+    from app.adapters.cache import RewardAccountCache
+    from app.adapters.repositories import RewardAccountRepository
+    from app.database import Base
+    from app.domain import events
+    from app.domain.models import RewardAccount
+    from app.services.projectors import PointProjector
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    session_factory = sessionmaker(bind=engine, class_=AsyncSession, expire_on_commit=False)
+    results = []
+    user_id = f"bench-user-{size}"
+
+    # save: 한 계정에 size개의 이벤트를 SAVE_BATCH_SIZE개씩 나눠 저장합니다.
+    latencies = []
+    account = RewardAccount(user_id=user_id)
+    started = time.perf_counter()
+    async with session_factory() as session:
+        repository = RewardAccountRepository(session)
+        for start in range(0, size, SAVE_BATCH_SIZE):
+            for i in range(start, min(start + SAVE_BATCH_SIZE, size)):
+                account.grant_points(10, reason="benchmark", review_id=f"review-{i}")
+            save_started = time.perf_counter()
+            await repository.save(account)
+            await session.commit()
+            latencies.append(time.perf_counter() - save_started)
+    results.append(summarize(
+        SERVICE, "repository_save", size, latencies, time.perf_counter() - started, operations=size,
+    ))
+
+    # load: 캐시 없이 스냅샷과 그 뒤 이벤트로 복원하는 경우와, 캐시된 계정을 다시 읽는 경우를 잽니다.
+    repeats = max(1, min(MAX_LOAD_REPEATS, LOAD_EVENT_BUDGET // size))
+    for scenario, cache in (("repository_load", None), ("repository_load_cached", RewardAccountCache())):
+        latencies = []
+        started = time.perf_counter()
+        for _ in range(repeats):
+            async with session_factory() as session:
+                load_started = time.perf_counter()
+                loaded = await RewardAccountRepository(session, cache=cache).load(user_id)
+                latencies.append(time.perf_counter() - load_started)
+            assert loaded.version == size
+        results.append(summarize(
+            SERVICE, scenario, size, latencies, time.perf_counter() - started, operations=repeats * size,
+        ))
+
+    # projector: size개의 이벤트를 여러 사용자/리뷰에 걸쳐 읽기 모델에 반영합니다.
+    latencies = []
+    started = time.perf_counter()
+    async with session_factory() as session:
+        projector = PointProjector(session)
+        for i in range(size):
+            event = events.RewardPointsGranted(
+                user_id=f"user-{i % 1000}", review_id=f"review-{i % max(1, size // 10)}", points=10, reason="benchmark",
+            )
+            handle_started = time.perf_counter()
+            await projector.handle(event)
+            latencies.append(time.perf_counter() - handle_started)
+            if (i + 1) % PROJECTION_COMMIT_EVERY == 0:
+                await session.commit()
+        await session.commit()
+    results.append(summarize(SERVICE, "projector_handle", size, latencies, time.perf_counter() - started))
+    return results
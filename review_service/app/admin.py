@@ -0,0 +1,28 @@
+# app/admin.py
+import os
+import secrets
+from typing import Optional
+
+from fastapi import Depends, Header, HTTPException, status
+
+# 모든 /admin/* API와 요청 단위 프로파일링(X-Profile) 인증용. 지정하지 않으면 관리자 API를 모두 거부합니다.
+ADMIN_TOKEN = os.getenv("ADMIN_TOKEN")
+
+ADMIN_TOKEN_HEADER = "x-admin-token"
+
+
+def is_admin_token(token: Optional[str], expected: Optional[str]) -> bool:
+    return bool(expected) and token is not None and secrets.compare_digest(token, expected)
+
+
+def get_admin_token() -> Optional[str]:
+    """테스트에서 오버라이드할 수 있도록 의존성으로 둡니다."""
+    return ADMIN_TOKEN
+
+
+async def require_admin_token(
+    x_admin_token: Optional[str] = Header(default=None),
+    expected: Optional[str] = Depends(get_admin_token),
+):
+    if not is_admin_token(x_admin_token, expected):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Admin access denied")
@@ -0,0 +1,196 @@
+# app/admission.py
+import asyncio
+import json
+import os
+import time
+from typing import Dict, Optional, Tuple
+
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from service_observability.metrics import MetricsRegistry, registry as default_registry
+
+# 동시에 처리할 요청 수(0이면 제한하지 않음)와 그 뒤에서 기다릴 수 있는 요청 수.
+# 동시 처리 수를 지정하지 않으면 워커의 DB 풀 크기에서 정합니다(admission_limits 참고).
+ADMISSION_READ_CONCURRENCY = os.getenv("ADMISSION_READ_CONCURRENCY")
+ADMISSION_READ_QUEUE = int(os.getenv("ADMISSION_READ_QUEUE", "64"))
+ADMISSION_WRITE_CONCURRENCY = os.getenv("ADMISSION_WRITE_CONCURRENCY")
+ADMISSION_WRITE_QUEUE = int(os.getenv("ADMISSION_WRITE_QUEUE", "32"))
+# 풀이 제한되지 않을 때(SQLite)의 기본값
+UNBOUNDED_POOL_READ_CONCURRENCY = 32
+UNBOUNDED_POOL_WRITE_CONCURRENCY = 16
+# 대기열에서 이 시간(초) 안에 차례가 오지 않으면 포기합니다.
+ADMISSION_QUEUE_TIMEOUT = float(os.getenv("ADMISSION_QUEUE_TIMEOUT", "2"))
+ADMISSION_RETRY_AFTER = int(os.getenv("ADMISSION_RETRY_AFTER", "1"))
+
+READ_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+# 운영용 엔드포인트는 과부하일 때도 응답해야 하므로 제한하지 않습니다.
+EXEMPT_PATH_PREFIXES = ("/metrics", "/health/", "/admin/")
+
+REJECTED_QUEUE_FULL = "queue_full"
+REJECTED_TIMEOUT = "timeout"
+
+
+class AdmissionConfigurationError(RuntimeError):
+    """입장 한도가 DB 풀보다 커서, 입장한 요청이 풀 앞에서 다시 줄을 서게 되는 설정입니다."""
+
+
+def admission_limits(
+    write_pool: Optional[int],
+    read_pool: Optional[int],
+    shared_pool: bool,
+    read_concurrency: Optional[str] = ADMISSION_READ_CONCURRENCY,
+    write_concurrency: Optional[str] = ADMISSION_WRITE_CONCURRENCY,
+) -> Dict[str, Tuple[int, int]]:
+    """
+    워커 하나의 풀 크기(write_pool: primary, read_pool: 읽기 엔진, None이면 제한 없음)에 맞춰
+    endpoint class별 (동시 처리 수, 대기열 길이)를 정합니다. 읽기와 쓰기가 같은 풀을 쓰면(shared_pool)
+    둘의 합이, 따로 쓰면 각자가 풀 크기를 넘을 수 없습니다. 지정하지 않은 값은 풀에 맞게 채우고,
+    지정한 값이 풀을 넘으면 AdmissionConfigurationError로 시작을 멈춥니다.
+    """
+    read = int(read_concurrency) if read_concurrency else None
+    write = int(write_concurrency) if write_concurrency else None
+
+    if write_pool is None or read_pool is None:
+        read = UNBOUNDED_POOL_READ_CONCURRENCY if read is None else read
+        write = UNBOUNDED_POOL_WRITE_CONCURRENCY if write is None else write
+    elif shared_pool:
+        # 나머지는 읽기에 주되, 쓰기에 풀의 1/3을 남깁니다.
+        if write is None:
+            write = max(1, write_pool // 3) if read is None else max(1, write_pool - read)
+        if read is None:
+            read = max(1, write_pool - write)
+        if read + write > write_pool:
+            raise AdmissionConfigurationError(
+                f"Read ({read}) + write ({write}) admission concurrency exceeds the per-worker "
+                f"database pool size ({write_pool}); lower ADMISSION_*_CONCURRENCY or raise "
+                "DATABASE_CONNECTION_BUDGET."
+            )
+    else:
+        read = read_pool if read is None else read
+        write = write_pool if write is None else write
+        for endpoint_class, limit, pool in (("read", read, read_pool), ("write", write, write_pool)):
+            if limit > pool:
+                raise AdmissionConfigurationError(
+                    f"{endpoint_class.capitalize()} admission concurrency ({limit}) exceeds the per-worker "
+                    f"database pool size ({pool}); lower ADMISSION_{endpoint_class.upper()}_CONCURRENCY "
+                    "or raise the connection budget."
+                )
+
+    return {"read": (read, ADMISSION_READ_QUEUE), "write": (write, ADMISSION_WRITE_QUEUE)}
+
+
+class ConcurrencyLimiter:
+    """
+    동시 실행 수를 limit으로 묶고, 초과분은 최대 max_queue개까지 queue_timeout 동안 기다리게 합니다.
+    대기열이 꽉 찼거나 시간 안에 차례가 오지 않으면 바로 거절해 지연이 끝없이 늘지 않게 합니다.
+    """
+    def __init__(self, limit: int, max_queue: int, queue_timeout: float):
+        self.limit = limit
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self._semaphore = asyncio.Semaphore(limit)
+        self.active = 0
+        self.waiting = 0
+
+    async def acquire(self) -> Optional[str]:
+        """입장하면 None, 거절되면 그 이유를 돌려줍니다."""
+        if not self._semaphore.locked():
+            await self._semaphore.acquire()
+        else:
+            if self.waiting >= self.max_queue:
+                return REJECTED_QUEUE_FULL
+            self.waiting += 1
+            try:
+                await asyncio.wait_for(self._semaphore.acquire(), self.queue_timeout)
+            except asyncio.TimeoutError:
+                return REJECTED_TIMEOUT
+            finally:
+                self.waiting -= 1
+        self.active += 1
+        return None
+
+    def release(self):
+        self.active -= 1
+        self._semaphore.release()
+
+
+class AdmissionControlMiddleware:
+    """
+    읽기(GET/HEAD/OPTIONS)와 쓰기 요청을 각각의 ConcurrencyLimiter로 입장시키는 ASGI 미들웨어.
+    거절된 요청은 DB 풀에 닿기 전에 503과 Retry-After로 끝납니다.
+    """
+    def __init__(
+        self,
+        app: ASGIApp,
+        limits: Optional[Dict[str, Tuple[int, int]]] = None,
+        queue_timeout: float = ADMISSION_QUEUE_TIMEOUT,
+        retry_after: int = ADMISSION_RETRY_AFTER,
+        registry: MetricsRegistry = default_registry,
+    ):
+        self.app = app
+        self.retry_after = retry_after
+        if limits is None:
+            limits = admission_limits(None, None, shared_pool=True)
+        self.limiters = {
+            endpoint_class: ConcurrencyLimiter(limit, max_queue, queue_timeout)
+            for endpoint_class, (limit, max_queue) in limits.items()
+            if limit > 0
+        }
+
+        in_flight = registry.gauge(
+            "admission_in_flight", "Admitted requests currently running.", ["endpoint_class"],
+        )
+        queue_depth = registry.gauge(
+            "admission_queue_depth", "Requests waiting for admission.", ["endpoint_class"],
+        )
+        for endpoint_class, limiter in self.limiters.items():
+            in_flight.set_function(lambda limiter=limiter: limiter.active, endpoint_class=endpoint_class)
+            queue_depth.set_function(lambda limiter=limiter: limiter.waiting, endpoint_class=endpoint_class)
+        self.rejections = registry.counter(
+            "admission_rejections", "Requests rejected with 503 by admission control.",
+            ["endpoint_class", "reason"],
+        )
+        self.queue_wait = registry.histogram(
+            "admission_queue_wait_seconds", "Time spent waiting for admission.", ["endpoint_class"],
+        )
+
+    @staticmethod
+    def _endpoint_class(scope: Scope) -> str:
+        return "read" if scope["method"] in READ_METHODS else "write"
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http" or scope["path"].startswith(EXEMPT_PATH_PREFIXES):
+            await self.app(scope, receive, send)
+            return
+
+        endpoint_class = self._endpoint_class(scope)
+        limiter = self.limiters.get(endpoint_class)
+        if limiter is None:
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        rejected = await limiter.acquire()
+        self.queue_wait.observe(time.perf_counter() - started, endpoint_class=endpoint_class)
+        if rejected is not None:
+            self.rejections.inc(endpoint_class=endpoint_class, reason=rejected)
+            await self._reject(send)
+            return
+
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            limiter.release()
+
+    async def _reject(self, send: Send):
+        body = json.dumps({"detail": "Server is busy, retry later."}).encode()
+        await send({
+            "type": "http.response.start",
+            "status": 503,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode()),
+                (b"retry-after", str(self.retry_after).encode()),
+            ],
+        })
+        await send({"type": "http.response.body", "body": body})
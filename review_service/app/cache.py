@@ -0,0 +1,105 @@
+# app/cache.py
+import asyncio
+import os
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+REVIEW_CACHE_MAXSIZE = int(os.getenv("REVIEW_CACHE_MAXSIZE", "10000"))
+REVIEW_CACHE_TTL = float(os.getenv("REVIEW_CACHE_TTL", "30"))
+
+
+class AsyncLRUCache:
+    """
+    크기 제한(LRU)과 TTL을 가진 프로세스 내 read-through 캐시.
+    같은 키에 대한 동시 miss는 하나의 로더 호출로 합쳐집니다(single-flight).
+    None은 캐싱하지 않습니다.
+    """
+    def __init__(self, maxsize: int = REVIEW_CACHE_MAXSIZE, ttl: Optional[float] = REVIEW_CACHE_TTL):
+        self._maxsize = maxsize
+        self._ttl = ttl
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._in_flight: Dict[Hashable, asyncio.Future] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del self._entries[key]
+            return None
+
+        self._entries.move_to_end(key)
+        return value
+
+    def set(self, key: Hashable, value: Any):
+        if self._maxsize <= 0:
+            return
+        expires_at = time.monotonic() + self._ttl if self._ttl else float("inf")
+        self._entries[key] = (expires_at, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._maxsize:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, key: Hashable):
+        """항목을 지우고, 진행 중인 로드 결과가 캐시에 들어가지 않도록 합니다."""
+        self._entries.pop(key, None)
+        self._in_flight.pop(key, None)
+
+    def clear(self):
+        self._entries.clear()
+        self._in_flight.clear()
+
+    async def get_or_load(self, key: Hashable, loader: Callable[[], Awaitable[Any]]) -> Any:
+        value = self.get(key)
+        if value is not None:
+            return value
+
+        future = self._in_flight.get(key)
+        if future is not None:
+            try:
+                return await asyncio.shield(future)
+            except asyncio.CancelledError:
+                if not future.cancelled():
+                    raise
+                # 먼저 로드하던 요청이 취소되었으면 직접 다시 로드합니다.
+                return await self.get_or_load(key, loader)
+
+        future = asyncio.get_running_loop().create_future()
+        self._in_flight[key] = future
+        try:
+            value = await loader()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # 대기 중인 호출이 없더라도 "exception was never retrieved" 경고를 막습니다.
+            future.exception()
+            raise
+        else:
+            future.set_result(value)
+        finally:
+            # 로드 도중 invalidate되었다면 다른 future로 바뀌었거나 비어 있으므로 저장하지 않습니다.
+            is_current = self._in_flight.get(key) is future
+            if is_current:
+                del self._in_flight[key]
+
+        if is_current and value is not None:
+            self.set(key, value)
+        return value
+
+
+def review_etag(review) -> str:
+    """마지막 수정 시각(없으면 생성 시각)으로 약한 ETag를 만듭니다."""
+    if review.updated_at is not None:
+        return f'W/"{review.id}-u{review.updated_at.timestamp():.6f}"'
+    return f'W/"{review.id}-c{review.created_at.timestamp():.6f}"'
+
+
+review_cache = AsyncLRUCache()
@@ -0,0 +1,88 @@
+# app/compression.py
+import os
+import zlib
+from typing import Dict
+
+from starlette.datastructures import Headers
+from starlette.middleware.gzip import GZipResponder, IdentityResponder
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+# 이보다 작은 응답은 압축해도 헤더/CPU 비용만 늘어나므로 그대로 보냅니다.
+RESPONSE_COMPRESSION_MIN_SIZE = int(os.getenv("RESPONSE_COMPRESSION_MIN_SIZE", "1024"))
+# 9는 6보다 몇 % 작아질 뿐 CPU를 훨씬 많이 씁니다.
+RESPONSE_COMPRESSION_LEVEL = int(os.getenv("RESPONSE_COMPRESSION_LEVEL", "6"))
+
+
+class DeflateResponder(GZipResponder):
+    """HTTP의 deflate는 zlib 형식(RFC 1950)입니다. raw deflate가 아닙니다."""
+    content_encoding = "deflate"
+
+    @property
+    def compressor(self):
+        if self._compressor is None:
+            self._compressor = zlib.compressobj(self.compresslevel, zlib.DEFLATED, zlib.MAX_WBITS)
+        return self._compressor
+
+
+RESPONDERS = {"gzip": GZipResponder, "deflate": DeflateResponder}
+
+
+def parse_accept_encoding(value: str) -> Dict[str, float]:
+    """Accept-Encoding을 {코딩: q} 로 바꿉니다. q=0은 거부를 뜻합니다."""
+    codings = {}
+    for part in value.split(","):
+        coding, _, params = part.partition(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        q = 1.0
+        for param in params.split(";"):
+            name, _, number = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    q = float(number)
+                except ValueError:
+                    q = 0.0
+        codings[coding] = q
+    return codings
+
+
+def choose_encoding(accept_encoding: str) -> str:
+    """클라이언트가 받는 코딩 중 q가 가장 높은 것(같으면 gzip 우선). 없으면 빈 문자열."""
+    codings = parse_accept_encoding(accept_encoding)
+    wildcard = codings.get("*", 0.0)
+    best, best_q = "", 0.0
+    for coding in RESPONDERS:
+        q = codings.get(coding, wildcard)
+        if q > best_q:
+            best, best_q = coding, q
+    return best
+
+
+class CompressionMiddleware:
+    """
+    Accept-Encoding에 따라 minimum_size 이상인 응답을 gzip 또는 deflate로 압축하는 ASGI 미들웨어.
+    응답 처리(버퍼링, 스트리밍, Vary 헤더)는 Starlette의 GZipMiddleware와 같습니다.
+    """
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = RESPONSE_COMPRESSION_MIN_SIZE,
+        compresslevel: int = RESPONSE_COMPRESSION_LEVEL,
+    ):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.compresslevel = compresslevel
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = choose_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        if encoding:
+            responder = RESPONDERS[encoding](self.app, self.minimum_size, compresslevel=self.compresslevel)
+        else:
+            # 압축하지 않아도 Vary: Accept-Encoding은 붙여 캐시가 섞이지 않게 합니다.
+            responder = IdentityResponder(self.app, self.minimum_size)
+        await responder(scope, receive, send)
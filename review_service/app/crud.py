@@ -1,58 +1,479 @@
 # app/crud.py
+from collections import Counter
+from datetime import datetime
+from typing import AsyncIterator, Iterable, List, Optional, Sequence, Tuple
+
+from pydantic import BaseModel
+from sqlalchemy import Row, delete, func, insert, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 
 from . import models, schemas
+from .cache import review_cache
+from .ids import allocate_ids
+
+BATCH_CHUNK_SIZE = 500
+EXPORT_BATCH_SIZE = 1000
+
+
+def _supports_returning(db: AsyncSession, kind: str) -> bool:
+    """현재 DB 방언이 INSERT/UPDATE/DELETE ... RETURNING을 지원하는지 확인합니다."""
+    return getattr(db.get_bind().dialect, f"{kind}_returning", False)
+
+
+def _supports_returning_from(db: AsyncSession) -> bool:
+    """
+    UPDATE ... FROM에 함께 쓴 다른 테이블(CTE)의 컬럼을 RETURNING할 수 있는지 확인합니다.
+    SQLite의 RETURNING은 수정 대상 테이블의 컬럼만 참조할 수 있습니다.
+    """
+    dialect = db.get_bind().dialect
+    return _supports_returning(db, "update") and dialect.update_returning_multifrom and dialect.name != "sqlite"
 
 
 async def create_review(db: AsyncSession, review: schemas.ReviewCreateInternal):
+    """
+    리뷰를 추가합니다. 커밋은 아웃박스 이벤트와 함께 호출자가 수행합니다.
+    INSERT ... RETURNING 한 번으로 created_at 같은 서버 기본값까지 받아옵니다.
+    """
+    if _supports_returning(db, "insert"):
+        result = await db.scalars(
+            insert(models.Review).returning(models.Review),
+            [review.model_dump()],
+        )
+        return result.one()
+
     db_review = models.Review(**review.model_dump())
     
     db.add(db_review)
-    await db.commit()
+    await db.flush()
     
     await db.refresh(db_review)
     return db_review
 
 
+async def create_reviews(
+    db: AsyncSession,
+    reviews: List[schemas.ReviewCreateInternal],
+    chunk_size: int = BATCH_CHUNK_SIZE,
+):
+    """
+    여러 리뷰를 chunk 단위의 multi-row INSERT ... RETURNING으로 저장합니다.
+    커밋은 아웃박스 이벤트와 함께 호출자가 수행합니다.
+    """
+    if not _supports_returning(db, "insert"):
+        created_reviews = [models.Review(**review.model_dump()) for review in reviews]
+        db.add_all(created_reviews)
+        await db.flush()
+        for db_review in created_reviews:
+            await db.refresh(db_review)
+        return created_reviews
+
+    created_reviews = []
+    for start in range(0, len(reviews), chunk_size):
+        chunk = reviews[start:start + chunk_size]
+        # 행마다 기본값 함수를 부르지 않고 chunk 크기만큼의 ID 블록을 한 번에 예약합니다.
+        result = await db.scalars(
+            insert(models.Review).returning(models.Review, sort_by_parameter_order=True),
+            [{**review.model_dump(), "id": review_id} for review, review_id in zip(chunk, allocate_ids(len(chunk)))],
+        )
+        created_reviews.extend(result.all())
+
+    return created_reviews
+
+
 async def get_review(db: AsyncSession, review_id: int):
     result = await db.execute(select(models.Review).filter(models.Review.id == review_id))
     return result.scalars().first()
 
 
-async def get_reviews(db: AsyncSession, skip: int = 0, limit: int = 100):
-    result = await db.execute(
-        select(models.Review)
-        .order_by(models.Review.id.desc())
-        .offset(skip)
-        .limit(limit)
-    )
-    return result.scalars().all()
+async def get_cached_review(db: AsyncSession, review_id: int) -> Optional[schemas.ReviewRead]:
+    """
+    review_cache를 거쳐 리뷰를 조회합니다. 세션에 묶이지 않도록 ReviewRead로 캐싱하며,
+    같은 ID에 대한 동시 miss는 한 번의 쿼리로 합쳐집니다.
+    db는 primary 세션이어야 합니다. 복제본으로 채우면 무효화 직후 옛 행이 다시 캐싱될 수 있습니다.
+    """
+    async def load() -> Optional[schemas.ReviewRead]:
+        db_review = await get_review(db, review_id)
+        return schemas.ReviewRead.model_validate(db_review) if db_review else None
+
+    return await review_cache.get_or_load(review_id, load)
+
+
+async def get_reviews(
+    db: AsyncSession,
+    skip: int = 0,
+    limit: int = 100,
+    before_id: Optional[int] = None,
+    product_id: Optional[str] = None,
+    user_id: Optional[str] = None,
+    review_type: Optional[models.ReviewType] = None,
+    as_rows: bool = False,
+):
+    """
+    리뷰 목록을 최신순(ID 내림차순)으로 조회합니다.
+    before_id가 주어지면 OFFSET 대신 `id < before_id` 조건으로 탐색(keyset)하므로
+    페이지 깊이와 무관하게 인덱스 범위 스캔 한 번으로 끝납니다.
+    product_id/user_id 필터는 (product_id, id DESC), (user_id, id DESC) 복합 인덱스를 탑니다.
+    as_rows=True이면 ORM 객체 대신 Row를 돌려줍니다. 세션에 올릴 필요 없이 바로 직렬화하는 목록 응답용입니다.
+    """
+    stmt = select(models.Review.__table__ if as_rows else models.Review).order_by(models.Review.id.desc()).limit(limit)
+    if product_id is not None:
+        stmt = stmt.filter(models.Review.product_id == product_id)
+    if user_id is not None:
+        stmt = stmt.filter(models.Review.user_id == user_id)
+    if review_type is not None:
+        stmt = stmt.filter(models.Review.review_type == review_type)
+    if before_id is not None:
+        stmt = stmt.filter(models.Review.id < before_id)
+    else:
+        stmt = stmt.offset(skip)
 
+    result = await db.execute(stmt)
+    return result.all() if as_rows else result.scalars().all()
+
+
+async def stream_reviews(
+    db: AsyncSession,
+    since_id: Optional[int] = None,
+    updated_after: Optional[datetime] = None,
+    batch_size: int = EXPORT_BATCH_SIZE,
+) -> AsyncIterator[Sequence[Row]]:
+    """
+    리뷰를 ID 오름차순으로 batch_size개씩 서버 사이드 커서로 읽어 돌려줍니다.
+    ORM 객체를 만들지 않고 Row를 그대로 넘기므로 테이블 크기와 무관하게 메모리가 일정합니다.
+    """
+    table = models.Review.__table__
+    stmt = select(table).order_by(table.c.id)
+    if since_id is not None:
+        stmt = stmt.filter(table.c.id > since_id)
+    if updated_after is not None:
+        stmt = stmt.filter(func.coalesce(table.c.updated_at, table.c.created_at) > updated_after)
+
+    result = await db.stream(stmt.execution_options(stream_results=True, yield_per=batch_size))
+    async for partition in result.partitions():
+        yield partition
+
+
+async def update_review(
+    db: AsyncSession,
+    review_id: int,
+    review_update: schemas.ReviewUpdateInternal,
+) -> Optional[Tuple[models.Review, int]]:
+    """
+    리뷰를 수정하고 (수정된 리뷰, 수정 전 평점)을 돌려줍니다. 리뷰가 없으면 None입니다.
+    커밋은 아웃박스 이벤트와 함께 호출자가 수행합니다.
+    UPDATE ... RETURNING 한 번으로 존재 확인, 수정, updated_at과 이전 평점 조회를 끝냅니다.
+    """
+    update_data = review_update.model_dump(exclude_unset=True)
+
+    if _supports_returning_from(db):
+        # 이전 평점은 행을 잠그는 CTE에서 읽어 동시 수정 중에도 최신 값 기준의 delta가 되도록 합니다.
+        previous = (
+            select(models.Review.id, models.Review.rating)
+            .filter(models.Review.id == review_id)
+            .with_for_update()
+            .cte("previous")
+        )
+        result = await db.execute(
+            update(models.Review)
+            .filter(models.Review.id == previous.c.id)
+            .values(**update_data)
+            .returning(models.Review, previous.c.rating)
+            .execution_options(synchronize_session=False, populate_existing=True)
+        )
+        row = result.one_or_none()
+        return (row[0], row[1]) if row else None
 
-async def update_review(db: AsyncSession, review_id: int, review_update: schemas.ReviewUpdateInternal):
     db_review = await get_review(db, review_id)
     if not db_review:
         return None
 
-    update_data = review_update.model_dump(exclude_unset=True)
-
+    previous_rating = db_review.rating
     for key, value in update_data.items():
         setattr(db_review, key, value)
     
     db.add(db_review)
-    await db.commit()
+    await db.flush()
     await db.refresh(db_review)
-    return db_review
+    return db_review, previous_rating
 
 
 async def delete_review(db: AsyncSession, review_id: int):
-    """ID를 기준으로 리뷰를 삭제합니다."""
+    """ID를 기준으로 리뷰를 삭제합니다. 가능하면 DELETE ... RETURNING 한 번으로 처리합니다."""
+    if _supports_returning(db, "delete"):
+        result = await db.scalars(
+            delete(models.Review)
+            .filter(models.Review.id == review_id)
+            .returning(models.Review)
+            .execution_options(synchronize_session=False)
+        )
+        db_review = result.one_or_none()
+        if db_review is None:
+            return None  # 리뷰가 없으면 None 반환
+
+        await adjust_rating_stats(db, db_review.product_id, removed_ratings=[db_review.rating])
+        await db.commit()
+        review_cache.invalidate(review_id)
+        return db_review
+
     db_review = await get_review(db, review_id)
     if not db_review:
         return None  # 리뷰가 없으면 None 반환
 
     # 객체 삭제 후 커밋
     await db.delete(db_review)
+    await adjust_rating_stats(db, db_review.product_id, removed_ratings=[db_review.rating])
     await db.commit()
-    return db_review
\ No newline at end of file
+    review_cache.invalidate(review_id)
+    return db_review
+
+
+MODERATION_CHUNK_SIZE = 1000
+
+
+def _moderation_filter(product_id: Optional[str], user_id: Optional[str]) -> list:
+    conditions = []
+    if product_id is not None:
+        conditions.append(models.Review.product_id == product_id)
+    if user_id is not None:
+        conditions.append(models.Review.user_id == user_id)
+    return conditions
+
+
+async def count_reviews(db: AsyncSession, product_id: Optional[str] = None, user_id: Optional[str] = None) -> int:
+    stmt = select(func.count()).select_from(models.Review).filter(*_moderation_filter(product_id, user_id))
+    return (await db.execute(stmt)).scalar_one()
+
+
+async def _apply_to_chunk(db: AsyncSession, kind: str, stmt, conditions: list, chunk_size: int) -> Sequence[Row]:
+    """
+    조건에 맞는 리뷰 중 ID가 작은 chunk_size개에 stmt(UPDATE/DELETE)를 한 번에 적용하고
+    적용된 행을 돌려줍니다. RETURNING을 지원하지 않으면 ID를 먼저 읽습니다.
+    """
+    columns = models.Review.__table__.c
+    chunk_ids = select(models.Review.id).filter(*conditions).order_by(models.Review.id).limit(chunk_size)
+    if _supports_returning(db, kind):
+        result = await db.execute(
+            stmt.filter(models.Review.id.in_(chunk_ids.scalar_subquery()))
+            .returning(*columns)
+            .execution_options(synchronize_session=False)
+        )
+        return result.all()
+
+    ids = (await db.execute(chunk_ids)).scalars().all()
+    if not ids:
+        return []
+    before = (await db.execute(select(*columns).filter(models.Review.id.in_(ids)))).all()
+    await db.execute(stmt.filter(models.Review.id.in_(ids)).execution_options(synchronize_session=False))
+    if kind == "delete":
+        return before
+    return (await db.execute(select(*columns).filter(models.Review.id.in_(ids)))).all()
+
+
+async def delete_reviews_chunk(
+    db: AsyncSession,
+    product_id: Optional[str] = None,
+    user_id: Optional[str] = None,
+    chunk_size: int = MODERATION_CHUNK_SIZE,
+) -> Sequence[Row]:
+    """조건에 맞는 리뷰를 최대 chunk_size개 삭제하고 삭제된 행을 돌려줍니다. 커밋은 호출자가 합니다."""
+    conditions = _moderation_filter(product_id, user_id)
+    return await _apply_to_chunk(db, "delete", delete(models.Review), conditions, chunk_size)
+
+
+async def retype_reviews_chunk(
+    db: AsyncSession,
+    review_type: models.ReviewType,
+    product_id: Optional[str] = None,
+    user_id: Optional[str] = None,
+    chunk_size: int = MODERATION_CHUNK_SIZE,
+) -> Sequence[Row]:
+    """
+    조건에 맞으면서 아직 review_type이 아닌 리뷰를 최대 chunk_size개 바꾸고 바뀐 행을 돌려줍니다.
+    바뀐 행은 조건에서 빠지므로 반복 호출하면 빈 결과가 나올 때까지 진행됩니다.
+    """
+    conditions = _moderation_filter(product_id, user_id) + [models.Review.review_type != review_type]
+    stmt = update(models.Review).values(review_type=review_type, updated_at=func.now())
+    return await _apply_to_chunk(db, "update", stmt, conditions, chunk_size)
+
+
+# ON CONFLICT ... DO UPDATE는 방언마다 자신의 insert 구문으로 만들어야 합니다.
+_UPSERT_INSERTS = {"postgresql": pg_insert, "sqlite": sqlite_insert}
+
+
+def _upsert_insert(db: AsyncSession, table):
+    dialect = db.get_bind().dialect.name
+    try:
+        return _UPSERT_INSERTS[dialect](table)
+    except KeyError:
+        raise NotImplementedError(f"Upsert is not supported for the {dialect!r} dialect.") from None
+
+
+async def adjust_rating_stats(
+    db: AsyncSession,
+    product_id: str,
+    added_ratings: Iterable[int] = (),
+    removed_ratings: Iterable[int] = (),
+):
+    """
+    상품 평점 요약에 증감(delta)을 반영합니다. 읽지 않고 UPSERT 한 번으로 더하므로
+    동시 쓰기에도 안전하며, 커밋은 리뷰 변경과 함께 호출자가 수행합니다.
+    요약이 생기기 전의 리뷰는 스키마 버전 4 마이그레이션이 reviews에서 다시 계산해 채웁니다.
+    """
+    added = Counter(added_ratings)
+    removed = Counter(removed_ratings)
+    histogram_delta = {
+        f"rating_{rating}": added[rating] - removed[rating] for rating in range(1, 6)
+    }
+    count_delta = sum(added.values()) - sum(removed.values())
+    sum_delta = (
+        sum(rating * n for rating, n in added.items())
+        - sum(rating * n for rating, n in removed.items())
+    )
+    if count_delta == 0 and sum_delta == 0 and not any(histogram_delta.values()):
+        return
+
+    table = models.ProductRatingStats.__table__
+    stmt = _upsert_insert(db, table).values(
+        product_id=product_id,
+        review_count=count_delta,
+        rating_sum=sum_delta,
+        **histogram_delta,
+    )
+    upsert_stmt = stmt.on_conflict_do_update(
+        index_elements=["product_id"],
+        set_={
+            "review_count": table.c.review_count + count_delta,
+            "rating_sum": table.c.rating_sum + sum_delta,
+            **{column: table.c[column] + delta for column, delta in histogram_delta.items()},
+            "updated_at": func.now(),
+        },
+    )
+    await db.execute(upsert_stmt)
+
+
+async def get_rating_stats(db: AsyncSession, product_id: str) -> schemas.ProductRatingStats:
+    result = await db.execute(
+        select(models.ProductRatingStats).filter(models.ProductRatingStats.product_id == product_id)
+    )
+    stats = result.scalars().first()
+    if stats is None or stats.review_count <= 0:
+        return schemas.ProductRatingStats(
+            product_id=product_id,
+            review_count=0,
+            histogram={rating: 0 for rating in range(1, 6)},
+        )
+
+    return schemas.ProductRatingStats(
+        product_id=product_id,
+        review_count=stats.review_count,
+        average_rating=round(stats.rating_sum / stats.review_count, 2),
+        histogram={rating: getattr(stats, f"rating_{rating}") for rating in range(1, 6)},
+    )
+
+
+def add_outbox_events(db: AsyncSession, topic: str, events: List[BaseModel]):
+    """이벤트를 아웃박스에 기록합니다. 리뷰 변경과 같은 트랜잭션에서 커밋되어야 합니다."""
+    db.add_all(
+        models.OutboxEvent(id=event_id, topic=topic, payload=event.model_dump_json())
+        for event, event_id in zip(events, allocate_ids(len(events)))
+    )
+
+
+async def try_lock_outbox_relay(db: AsyncSession, lock_id: int) -> bool:
+    """
+    PostgreSQL에서 트랜잭션 advisory lock을 시도합니다. 커밋·롤백할 때 풀리므로 한 배치 동안만 잡힙니다.
+    다른 방언(개발·테스트용 SQLite)은 한 프로세스에서 돈다고 보고 항상 True입니다.
+    """
+    if db.get_bind().dialect.name != "postgresql":
+        return True
+    result = await db.execute(select(func.pg_try_advisory_xact_lock(lock_id)))
+    return bool(result.scalar_one())
+
+
+async def get_unpublished_outbox_events(db: AsyncSession, limit: int = 100):
+    """발행되지 않은 이벤트를 아웃박스 ID 순서로 읽습니다. try_lock_outbox_relay를 잡은 트랜잭션에서 호출합니다."""
+    result = await db.execute(
+        select(models.OutboxEvent)
+        .filter(models.OutboxEvent.published_at.is_(None))
+        .order_by(models.OutboxEvent.id)
+        .limit(limit)
+    )
+    return result.scalars().all()
+
+
+async def mark_outbox_events_published(db: AsyncSession, event_ids: List[int]):
+    await db.execute(
+        update(models.OutboxEvent)
+        .filter(models.OutboxEvent.id.in_(event_ids))
+        .values(published_at=func.now())
+    )
+
+
+async def delete_published_outbox_events(db: AsyncSession, before: datetime, limit: int = 1000) -> int:
+    """before 이전에 발행된 이벤트를 최대 limit개 지웁니다. 한 번에 큰 트랜잭션이 되지 않도록 나눠 호출합니다."""
+    ids = (
+        select(models.OutboxEvent.id)
+        .filter(models.OutboxEvent.published_at < before)
+        .limit(limit)
+        .scalar_subquery()
+    )
+    result = await db.execute(delete(models.OutboxEvent).filter(models.OutboxEvent.id.in_(ids)))
+    return result.rowcount
+
+
+def add_idempotency_key(
+    db: AsyncSession, key: str, request_hash: str, status_code: int, response_body: str, expires_at: datetime,
+):
+    """응답을 키와 함께 기록합니다. 같은 키가 이미 있으면 커밋할 때 IntegrityError가 납니다."""
+    db.add(models.IdempotencyKey(
+        key=key,
+        request_hash=request_hash,
+        status_code=status_code,
+        response_body=response_body,
+        expires_at=expires_at,
+    ))
+
+
+async def get_idempotency_key(db: AsyncSession, key: str, now: datetime) -> Optional[models.IdempotencyKey]:
+    result = await db.execute(
+        select(models.IdempotencyKey)
+        .filter(models.IdempotencyKey.key == key, models.IdempotencyKey.expires_at > now)
+    )
+    return result.scalar_one_or_none()
+
+
+async def delete_expired_idempotency_keys(db: AsyncSession, now: datetime, key: Optional[str] = None) -> int:
+    stmt = delete(models.IdempotencyKey).filter(models.IdempotencyKey.expires_at <= now)
+    if key is not None:
+        stmt = stmt.filter(models.IdempotencyKey.key == key)
+    result = await db.execute(stmt)
+    return result.rowcount
+
+
+async def create_moderation_job(db: AsyncSession, **values) -> models.ModerationJob:
+    job = models.ModerationJob(**values)
+    db.add(job)
+    await db.flush()
+    await db.refresh(job)
+    return job
+
+
+async def get_moderation_job(db: AsyncSession, job_id: int) -> Optional[models.ModerationJob]:
+    return await db.get(models.ModerationJob, job_id)
+
+
+async def list_moderation_jobs(db: AsyncSession, limit: int = 100) -> Sequence[models.ModerationJob]:
+    """최근에 제출된 순서. ID가 TSID이므로 ID 내림차순이 곧 제출 역순입니다."""
+    result = await db.execute(select(models.ModerationJob).order_by(models.ModerationJob.id.desc()).limit(limit))
+    return result.scalars().all()
+
+
+async def update_moderation_job(db: AsyncSession, job_id: int, processed_delta: int = 0, **values):
+    """processed는 덮어쓰지 않고 증가시키고, updated_at을 갱신해 작업이 살아 있음을 남깁니다."""
+    if processed_delta:
+        values["processed"] = models.ModerationJob.processed + processed_delta
+    values.setdefault("updated_at", func.now())
+    await db.execute(update(models.ModerationJob).filter(models.ModerationJob.id == job_id).values(**values))
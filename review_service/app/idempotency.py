@@ -0,0 +1,153 @@
+# app/idempotency.py
+import asyncio
+import hashlib
+import os
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Awaitable, Callable, Optional, Tuple
+
+from pydantic import BaseModel
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from . import crud, models
+from .cache import AsyncLRUCache
+
+IDEMPOTENCY_KEY_TTL = float(os.getenv("IDEMPOTENCY_KEY_TTL", str(24 * 60 * 60)))
+IDEMPOTENCY_CACHE_MAXSIZE = int(os.getenv("IDEMPOTENCY_CACHE_MAXSIZE", "10000"))
+IDEMPOTENCY_PURGE_INTERVAL = float(os.getenv("IDEMPOTENCY_PURGE_INTERVAL", "600"))
+
+IDEMPOTENCY_KEY_HEADER = "Idempotency-Key"
+IDEMPOTENT_REPLAYED_HEADER = "Idempotent-Replayed"
+MAX_IDEMPOTENCY_KEY_LENGTH = 255
+
+
+class IdempotencyKeyConflict(Exception):
+    """같은 키가 다른 요청 본문으로 재사용되었습니다."""
+
+
+@dataclass(frozen=True)
+class IdempotencyRecord:
+    """핸들러가 자신의 트랜잭션에 함께 기록해야 하는 키 정보."""
+    key: str
+    request_hash: str
+    expires_at: datetime
+
+
+@dataclass(frozen=True)
+class StoredResponse:
+    request_hash: str
+    status_code: int
+    body: str
+    expires_at: datetime
+
+    @classmethod
+    def from_row(cls, row: models.IdempotencyKey) -> "StoredResponse":
+        expires_at = row.expires_at
+        if expires_at.tzinfo is None:  # SQLite는 시간대를 저장하지 않습니다(항상 UTC로 기록).
+            expires_at = expires_at.replace(tzinfo=timezone.utc)
+        return cls(row.request_hash, row.status_code, row.response_body, expires_at)
+
+
+def request_hash(payload: BaseModel) -> str:
+    """클라이언트가 보낸 필드만 해싱합니다. 서버가 채우는 기본값(임의 값 포함)은 비교에서 뺍니다."""
+    return hashlib.sha256(payload.model_dump_json(exclude_unset=True).encode()).hexdigest()
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+class IdempotencyStore:
+    """
+    Idempotency-Key별 응답 저장소. DB 테이블이 원본이고, 앞단의 프로세스 내 LRU 캐시가
+    반복 요청을 DB 없이 응답합니다. 같은 키의 동시 요청은 캐시의 single-flight로 첫 요청을 기다립니다.
+    다른 프로세스와의 경합은 키의 기본 키 제약으로 막고, 진 쪽은 이긴 쪽의 응답을 돌려줍니다.
+    """
+    def __init__(
+        self,
+        ttl: float = IDEMPOTENCY_KEY_TTL,
+        cache_maxsize: int = IDEMPOTENCY_CACHE_MAXSIZE,
+    ):
+        self.ttl = ttl
+        self._cache = AsyncLRUCache(maxsize=cache_maxsize, ttl=ttl)
+        self._purge_task: Optional[asyncio.Task] = None
+
+    async def execute(
+        self,
+        db: AsyncSession,
+        key: str,
+        request_hash: str,
+        handler: Callable[[IdempotencyRecord], Awaitable[object]],
+    ) -> Tuple[StoredResponse, bool]:
+        """
+        키에 저장된 응답을 돌려주거나, 없으면 handler를 실행합니다.
+        handler는 받은 레코드를 crud.add_idempotency_key로 기록하고 커밋해야 합니다.
+        (응답, 재사용 여부)를 반환합니다.
+        """
+        executed = False
+
+        async def load() -> StoredResponse:
+            nonlocal executed
+            now = _utcnow()
+            row = await crud.get_idempotency_key(db, key, now)
+            if row is not None:
+                return StoredResponse.from_row(row)
+
+            await crud.delete_expired_idempotency_keys(db, now, key=key)
+            record = IdempotencyRecord(key, request_hash, now + timedelta(seconds=self.ttl))
+            try:
+                await handler(record)
+            except IntegrityError:
+                # 다른 프로세스가 같은 키를 먼저 커밋했습니다. 이 요청의 변경은 버립니다.
+                await db.rollback()
+                row = await crud.get_idempotency_key(db, key, _utcnow())
+                if row is None:
+                    raise
+                return StoredResponse.from_row(row)
+
+            executed = True
+            # 방금 커밋한 행은 세션의 identity map에 있으므로 다시 조회하지 않습니다.
+            return StoredResponse.from_row(await db.get(models.IdempotencyKey, key))
+
+        stored = await self._cache.get_or_load(key, load)
+        if not executed and stored.expires_at <= _utcnow():
+            self._cache.invalidate(key)
+            stored = await self._cache.get_or_load(key, load)
+
+        if stored.request_hash != request_hash:
+            raise IdempotencyKeyConflict(f"Idempotency key {key!r} was used with a different request.")
+        return stored, not executed
+
+    def clear_cache(self):
+        self._cache.clear()
+
+    async def purge_expired(self, session_factory) -> int:
+        async with session_factory() as session:
+            deleted = await crud.delete_expired_idempotency_keys(session, _utcnow())
+            await session.commit()
+        return deleted
+
+    async def _purge_loop(self, session_factory, interval: float):
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await self.purge_expired(session_factory)
+            except Exception as e:
+                print(f"[idempotency] Purge failed, retrying: {e!r}")
+
+    def start_purging(self, session_factory, interval: float = IDEMPOTENCY_PURGE_INTERVAL):
+        if self._purge_task is None:
+            self._purge_task = asyncio.create_task(self._purge_loop(session_factory, interval))
+
+    async def stop_purging(self):
+        if self._purge_task is not None:
+            self._purge_task.cancel()
+            try:
+                await self._purge_task
+            except asyncio.CancelledError:
+                pass
+            self._purge_task = None
+
+
+idempotency_store = IdempotencyStore()
@@ -0,0 +1,103 @@
+# app/ids.py
+import os
+import random
+import threading
+import time
+from typing import List, Optional
+
+from tsidpy import TSID
+from tsidpy.tsid import RANDOM_BITS, TSID_EPOCH
+
+# 프로세스(워커, 파드)마다 다른 노드 ID를 주면 서로 같은 ID를 만들 수 없습니다.
+# 노드는 app.serve가 워커를 시작할 때 configure_id_generator로 정합니다. 그 전까지(또는
+# app.serve를 거치지 않고 띄운 경우)는 무작위 노드를 쓰므로 노드 수가 많을수록 충돌 가능성이 생깁니다.
+TSID_NODE_BITS = int(os.getenv("TSID_NODE_BITS", "10"))
+
+_EPOCH_MS = int(TSID_EPOCH)
+
+
+class IdGenerator:
+    """
+    TSID(42비트 밀리초 + 노드 비트 + 카운터 비트) 생성기.
+    같은 밀리초 안에서는 카운터를 올리고, 카운터가 넘치거나 시계가 뒤로 가면 마지막 밀리초를
+    앞당겨 씁니다. 따라서 한 생성기가 만든 ID는 항상 단조 증가합니다.
+    allocate(n)은 잠금을 한 번만 잡고 연속된 ID 블록을 예약하므로 일괄 INSERT에 씁니다.
+    """
+    def __init__(self, node: Optional[int] = None, node_bits: int = TSID_NODE_BITS):
+        if not 0 <= node_bits <= 20:
+            raise ValueError(f"Invalid node_bits: {node_bits}")
+        if node is None:
+            node = random.getrandbits(node_bits) if node_bits else 0
+        if not 0 <= node < (1 << node_bits):
+            raise ValueError(f"Node {node} does not fit in {node_bits} bits")
+
+        self.node = node
+        self.node_bits = node_bits
+        self._counter_bits = RANDOM_BITS - node_bits
+        self._counter_limit = 1 << self._counter_bits
+        self._node_part = node << self._counter_bits
+        self._millis = -1
+        self._counter = 0
+        self._lock = threading.Lock()
+
+    def _first_counter(self) -> int:
+        # 새 밀리초의 시작 카운터는 하위 절반에서 무작위로 골라 예측을 어렵게 하고 여유를 남깁니다.
+        return random.getrandbits(self._counter_bits - 1) if self._counter_bits > 1 else 0
+
+    def _tick(self):
+        """잠금 안에서 호출합니다. (밀리초, 카운터)를 다음 ID 자리로 옮깁니다."""
+        now = time.time_ns() // 1_000_000 - _EPOCH_MS
+        if now > self._millis:
+            self._millis = now
+            self._counter = self._first_counter()
+        else:
+            self._counter += 1
+            if self._counter >= self._counter_limit:
+                self._millis += 1
+                self._counter = 0
+
+    def next_id(self) -> int:
+        with self._lock:
+            self._tick()
+            return (self._millis << RANDOM_BITS) | self._node_part | self._counter
+
+    def allocate(self, count: int) -> List[int]:
+        """단조 증가하는 ID count개를 한 번에 예약합니다. 밀리초가 넘어가는 지점마다 구간을 나눕니다."""
+        if count <= 0:
+            return []
+        ids: List[int] = []
+        with self._lock:
+            self._tick()
+            while True:
+                take = min(count, self._counter_limit - self._counter)
+                base = (self._millis << RANDOM_BITS) | self._node_part
+                ids.extend(range(base + self._counter, base + self._counter + take))
+                count -= take
+                if count == 0:
+                    self._counter += take - 1  # 마지막으로 쓴 카운터
+                    return ids
+                self._millis += 1
+                self._counter = 0
+
+    def create(self) -> TSID:
+        return TSID(self.next_id())
+
+
+id_generator = IdGenerator()
+
+
+def configure_id_generator(node: Optional[int], node_bits: int = TSID_NODE_BITS):
+    """
+    이 프로세스의 생성기를 node로 교체합니다. 앱이 ID를 만들기 전, 워커가 시작할 때 호출합니다.
+    next_id/allocate_ids는 호출할 때마다 모듈의 생성기를 찾으므로 먼저 import한 곳에도 반영됩니다.
+    """
+    global id_generator
+    id_generator = IdGenerator(node=node, node_bits=node_bits)
+
+
+def next_id() -> int:
+    return id_generator.next_id()
+
+
+def allocate_ids(count: int) -> List[int]:
+    return id_generator.allocate(count)
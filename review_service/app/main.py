@@ -1,70 +1,252 @@
 # app/main.py
+import asyncio
 from contextlib import asynccontextmanager
-from fastapi import FastAPI, Depends, HTTPException, status, Response
+from datetime import datetime
+from fastapi import FastAPI, Body, Depends, Header, HTTPException, Query, Request, Response, status
+from fastapi.responses import JSONResponse, PlainTextResponse, StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
-from typing import List
+from typing import Any, List, Optional
+from service_observability.metrics import PROMETHEUS_CONTENT_TYPE, registry
 
 from . import crud, models, schemas, services
-from .database import engine, Base, get_db
-from .messaging.bus import message_bus, MessageBus, get_message_bus
+from .admin import require_admin_token
+from .admission import AdmissionControlMiddleware, admission_limits
+from .cache import review_etag
+from .compression import CompressionMiddleware
+from .pagination import (
+    NEXT_CURSOR_HEADER, decode_cursor, decode_ranked_cursor, encode_ranked_cursor, next_cursor,
+)
+from .idempotency import (
+    IDEMPOTENCY_KEY_HEADER,
+    IDEMPOTENT_REPLAYED_HEADER,
+    MAX_IDEMPOTENCY_KEY_LENGTH,
+    IdempotencyKeyConflict,
+    idempotency_store,
+    request_hash,
+)
+from .moderation import ModerationJobs, get_moderation_jobs, moderation_jobs
+from .schema import SCHEMA_STARTUP_MODE, prepare_schema
+from .search import check_search_support, get_search_backend
+from .serialization import LIST_RESPONSES, review_list_response
+from .database import (
+    DATABASE_READ_URL, READ_POOL_CAPACITY, WRITE_POOL_CAPACITY,
+    init_engines, get_db, get_read_db, wants_primary_read, AsyncSessionLocal,
+)
+from .messaging.bus import connect_with_retry, message_bus
+from .messaging.outbox import OutboxRelay
+from .observability.http import HTTPMetricsMiddleware
+from .observability.profiling import ProfilingMiddleware, request_profiler
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    print("🚀 Application startup: Initializing database...")
-    async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.create_all)
-    print("[infrastructure] Database initialized.")
-    
-    await message_bus.connect()
+    # 워커 프로세스마다 자신의 풀 크기로 엔진을 새로 만듭니다.
+    engine, read_engine = await init_engines()
+    check_search_support(engine, read_engine)
+    print(f"🚀 Application startup: Preparing database schema ({SCHEMA_STARTUP_MODE})...")
+    await prepare_schema(engine)
+    print("[infrastructure] Database schema ready.")
+    app.state.schema_ready = True
+
+    # 쓰기는 아웃박스로 가므로 요청 처리에 버스가 필요 없습니다. 연결은 백그라운드에서 맺습니다.
+    bus_connect_task = asyncio.create_task(connect_with_retry(message_bus))
+
+    outbox_relay = OutboxRelay(AsyncSessionLocal, message_bus)
+    outbox_relay.start()
+    idempotency_store.start_purging(AsyncSessionLocal)
     
     yield
     
-    await message_bus.disconnect()
+    app.state.schema_ready = False
+    await idempotency_store.stop_purging()
+    await moderation_jobs.cancel_all()
+    await outbox_relay.stop()
+    bus_connect_task.cancel()
+    try:
+        await bus_connect_task
+    except asyncio.CancelledError:
+        pass
+    if message_bus.is_connected:
+        await message_bus.disconnect()
     await engine.dispose()
+    if read_engine is not engine:
+        await read_engine.dispose()
 
 app = FastAPI(
     title="Review Service API",
     lifespan=lifespan,
 )
+app.add_middleware(CompressionMiddleware)
+app.add_middleware(ProfilingMiddleware)
+# 거절된 요청도 HTTP 지표에 남도록 지표 미들웨어 안쪽에 둡니다.
+# 한도는 워커의 풀 크기에서 정하고, 풀보다 크게 지정하면 여기서 시작을 멈춥니다.
+app.add_middleware(
+    AdmissionControlMiddleware,
+    limits=admission_limits(WRITE_POOL_CAPACITY, READ_POOL_CAPACITY, shared_pool=not DATABASE_READ_URL),
+)
+app.add_middleware(HTTPMetricsMiddleware)
 
 
 @app.post("/reviews/", response_model=schemas.ReviewRead, status_code=status.HTTP_201_CREATED, tags=["Reviews"])
 async def create_review_endpoint(
     review: schemas.ReviewCreateRequest, 
     db: AsyncSession = Depends(get_db),
-    bus: MessageBus = Depends(get_message_bus),
+    idempotency_key: Optional[str] = Header(
+        default=None, alias=IDEMPOTENCY_KEY_HEADER, min_length=1, max_length=MAX_IDEMPOTENCY_KEY_LENGTH,
+    ),
 ):
     """
     새로운 리뷰를 생성합니다.
+    Idempotency-Key 헤더가 있으면 같은 키의 재시도에는 처음 응답을 그대로 돌려줍니다.
     """
-    return await services.create_review(db=db, bus=bus, review_request=review)
+    if idempotency_key is None:
+        return await services.create_review(db=db, review_request=review)
+
+    try:
+        stored, replayed = await idempotency_store.execute(
+            db,
+            key=idempotency_key,
+            request_hash=request_hash(review),
+            handler=lambda record: services.create_review(db=db, review_request=review, idempotency=record),
+        )
+    except IdempotencyKeyConflict as e:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
+
+    return Response(
+        content=stored.body,
+        status_code=stored.status_code,
+        media_type="application/json",
+        headers={IDEMPOTENT_REPLAYED_HEADER: "true"} if replayed else None,
+    )
 
 
-@app.get("/reviews/", response_model=List[schemas.ReviewRead], tags=["Reviews"])
+MAX_BATCH_SIZE = 1000
+
+@app.post("/reviews/batch", response_model=schemas.ReviewBatchResult, tags=["Reviews"])
+async def create_reviews_batch_endpoint(
+    reviews: List[Any] = Body(..., min_length=1, max_length=MAX_BATCH_SIZE),
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    여러 리뷰를 한 번에 생성합니다. 항목별 성공/실패 결과를 요청 순서대로 돌려줍니다.
+    """
+    return await services.create_reviews(db=db, items=reviews)
+
+
+def _cursor_to_before_id(cursor: Optional[str]) -> Optional[int]:
+    if cursor is None:
+        return None
+    try:
+        return decode_cursor(cursor)
+    except ValueError:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+
+
+def _next_cursor_headers(rows: list, limit: int) -> dict:
+    cursor_value = next_cursor(rows, limit)
+    return {NEXT_CURSOR_HEADER: cursor_value} if cursor_value is not None else {}
+
+
+@app.get("/reviews/", response_model=List[schemas.ReviewRead], responses=LIST_RESPONSES, tags=["Reviews"])
 async def read_reviews_endpoint(
+    request: Request,
     skip: int = 0, 
     limit: int = 100, 
-    db: AsyncSession = Depends(get_db)
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_read_db)
 ):
     """
     모든 리뷰 목록을 페이지네이션하여 조회합니다.
+
+    `cursor`를 넘기면 keyset 방식으로 조회하며 `skip`은 무시됩니다.
+    다음 페이지가 있을 수 있으면 응답 헤더 `X-Next-Cursor`에 커서가 담깁니다.
+    `Accept: application/msgpack`이면 같은 내용을 MessagePack으로 돌려줍니다.
     """
-    reviews = await crud.get_reviews(db, skip=skip, limit=limit)
-    return reviews
+    reviews = await crud.get_reviews(
+        db, skip=skip, limit=limit, before_id=_cursor_to_before_id(cursor), as_rows=True,
+    )
+    return review_list_response(request, reviews, headers=_next_cursor_headers(reviews, limit))
+
+
+@app.get("/reviews/export", response_class=StreamingResponse, tags=["Reviews"])
+async def export_reviews_endpoint(
+    since_id: Optional[int] = None,
+    updated_after: Optional[datetime] = None,
+    db: AsyncSession = Depends(get_read_db),
+):
+    """
+    리뷰 테이블을 NDJSON(한 줄에 리뷰 하나)으로 스트리밍합니다.
+    `since_id`보다 큰 ID만, 또는 `updated_after` 이후 변경된 리뷰만 내보낼 수 있습니다.
+    """
+    async def ndjson_lines():
+        async for rows in crud.stream_reviews(db, since_id=since_id, updated_after=updated_after):
+            yield b"".join(
+                schemas.ReviewRead.model_validate(row).model_dump_json().encode() + b"\n"
+                for row in rows
+            )
+
+    return StreamingResponse(ndjson_lines(), media_type="application/x-ndjson")
+
+
+@app.get("/reviews/search", response_model=List[schemas.ReviewSearchHit], tags=["Reviews"])
+async def search_reviews_endpoint(
+    response: Response,
+    q: str = Query(..., min_length=1),
+    product_id: Optional[str] = None,
+    limit: int = 20,
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_read_db),
+):
+    """
+    리뷰 본문을 전문 검색합니다. 관련도 순으로 정렬되며 `X-Next-Cursor`로 다음 페이지를 조회합니다.
+    """
+    after = None
+    if cursor is not None:
+        try:
+            after = decode_ranked_cursor(cursor)
+        except ValueError:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+
+    hits = await get_search_backend(db).search(db, q, limit=limit, product_id=product_id, after=after)
+
+    if limit > 0 and len(hits) == limit:
+        last_score, last_review = hits[-1]
+        response.headers[NEXT_CURSOR_HEADER] = encode_ranked_cursor(last_score, last_review.id)
+    return [
+        schemas.ReviewSearchHit(**schemas.ReviewRead.model_validate(review).model_dump(), score=score)
+        for score, review in hits
+    ]
 
 
 @app.get("/reviews/{review_id}", response_model=schemas.ReviewRead, tags=["Reviews"])
-async def read_review_endpoint(review_id: int, db: AsyncSession = Depends(get_db)):
-    db_review = await crud.get_review(db, review_id=review_id)
+async def read_review_endpoint(
+    review_id: int,
+    response: Response,
+    request: Request,
+    if_none_match: Optional[str] = Header(default=None),
+    db: AsyncSession = Depends(get_db),
+):
+    # 캐시 miss는 복제본이 아니라 primary에서 채웁니다. 수정 직후 무효화된 항목을 지연된 복제본의
+    # 옛 행으로 다시 채우면 그 행과 ETag가 TTL 동안 그대로 나가기 때문입니다.
+    if wants_primary_read(request):
+        # 쓰기 직후의 읽기는 캐시를 건너뜁니다.
+        db_review = await crud.get_review(db, review_id=review_id)
+    else:
+        db_review = await crud.get_cached_review(db, review_id=review_id)
     if db_review is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Review not found")
+
+    etag = review_etag(db_review)
+    if if_none_match is not None and etag in (tag.strip() for tag in if_none_match.split(",")):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+
+    response.headers["ETag"] = etag
     return db_review
 
 @app.put("/reviews/{review_id}", response_model=schemas.ReviewRead, tags=["Reviews"])
 async def update_review_endpoint(
-    review_id: int, review: schemas.ReviewUpdateRequest, db: AsyncSession = Depends(get_db), bus: MessageBus = Depends(get_message_bus),
+    review_id: int, review: schemas.ReviewUpdateRequest, db: AsyncSession = Depends(get_db),
 ):
-    db_review = await services.update_review(db=db, bus=bus, review_id=review_id, review_update=review)
+    db_review = await services.update_review(db=db, review_id=review_id, review_update=review)
     if db_review is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Review not found")
     return db_review
@@ -74,4 +256,162 @@ async def delete_review_endpoint(review_id: int, db: AsyncSession = Depends(get_
     db_review = await crud.delete_review(db, review_id=review_id)
     if db_review is None:
         raise HTTPException(status_code=404, detail="Review not found")
-    return Response(status_code=status.HTTP_204_NO_CONTENT)
\ No newline at end of file
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
+
+
+@app.get("/products/{product_id}/rating-stats", response_model=schemas.ProductRatingStats, tags=["Products"])
+async def read_product_rating_stats_endpoint(product_id: str, db: AsyncSession = Depends(get_read_db)):
+    """
+    상품의 리뷰 수, 평균 평점, 1~5점 분포를 요약 테이블에서 조회합니다.
+    """
+    return await crud.get_rating_stats(db, product_id=product_id)
+
+
+@app.get(
+    "/products/{product_id}/reviews", response_model=List[schemas.ReviewRead], responses=LIST_RESPONSES, tags=["Products"],
+)
+async def read_product_reviews_endpoint(
+    product_id: str,
+    request: Request,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    review_type: Optional[models.ReviewType] = None,
+    db: AsyncSession = Depends(get_read_db),
+):
+    """
+    상품의 리뷰를 최신순으로 조회합니다. (product_id, id DESC) 인덱스 범위 스캔으로 처리됩니다.
+    """
+    reviews = await crud.get_reviews(
+        db,
+        limit=limit,
+        before_id=_cursor_to_before_id(cursor),
+        product_id=product_id,
+        review_type=review_type,
+        as_rows=True,
+    )
+    return review_list_response(request, reviews, headers=_next_cursor_headers(reviews, limit))
+
+
+@app.get("/users/{user_id}/reviews", response_model=List[schemas.ReviewRead], responses=LIST_RESPONSES, tags=["Users"])
+async def read_user_reviews_endpoint(
+    user_id: str,
+    request: Request,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    review_type: Optional[models.ReviewType] = None,
+    db: AsyncSession = Depends(get_read_db),
+):
+    """
+    유저가 작성한 리뷰를 최신순으로 조회합니다. (user_id, id DESC) 인덱스 범위 스캔으로 처리됩니다.
+    """
+    reviews = await crud.get_reviews(
+        db,
+        limit=limit,
+        before_id=_cursor_to_before_id(cursor),
+        user_id=user_id,
+        review_type=review_type,
+        as_rows=True,
+    )
+    return review_list_response(request, reviews, headers=_next_cursor_headers(reviews, limit))
+
+
+@app.get("/health/live", include_in_schema=False)
+async def liveness_endpoint():
+    """프로세스가 요청을 받을 수 있으면 항상 200입니다."""
+    return {"status": "alive"}
+
+
+@app.get("/health/ready", include_in_schema=False)
+async def readiness_endpoint():
+    """
+    스키마 확인이 끝났으면 준비 완료입니다. 버스 연결 상태는 함께 보고하지만,
+    이벤트는 아웃박스에 쌓이므로 준비 여부를 막지 않습니다.
+    """
+    ready = getattr(app.state, "schema_ready", False)
+    body = {
+        "status": "ready" if ready else "starting",
+        "message_bus": "connected" if message_bus.is_connected else "connecting",
+    }
+    if not ready:
+        return JSONResponse(body, status_code=status.HTTP_503_SERVICE_UNAVAILABLE)
+    return body
+
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics_endpoint():
+    return PlainTextResponse(registry.render(), media_type=PROMETHEUS_CONTENT_TYPE)
+
+
+@app.get(
+    "/admin/profiles",
+    response_model=List[schemas.RequestProfileSummary],
+    dependencies=[Depends(require_admin_token)],
+    tags=["Admin"],
+)
+async def list_request_profiles_endpoint():
+    """
+    보관 중인 요청 프로파일을 느린 순으로 조회합니다.
+    """
+    return request_profiler.profiles()
+
+
+@app.get(
+    "/admin/profiles/{profile_id}",
+    response_class=PlainTextResponse,
+    dependencies=[Depends(require_admin_token)],
+    tags=["Admin"],
+)
+async def read_request_profile_endpoint(profile_id: int):
+    """
+    요청 프로파일의 pstats 출력(누적 시간순)을 텍스트로 돌려줍니다.
+    """
+    profile = request_profiler.get(profile_id)
+    if profile is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Profile not found")
+    return PlainTextResponse(profile.stats)
+
+
+@app.post(
+    "/admin/reviews/moderation",
+    response_model=schemas.ModerationJobRead,
+    status_code=status.HTTP_202_ACCEPTED,
+    dependencies=[Depends(require_admin_token)],
+    tags=["Admin"],
+)
+async def moderate_reviews_endpoint(
+    moderation: schemas.ReviewModerationRequest,
+    jobs: ModerationJobs = Depends(get_moderation_jobs),
+):
+    """
+    product_id/user_id에 해당하는 리뷰를 모두 삭제하거나 유형을 바꾸는 작업을 시작합니다.
+    진행 상황은 /admin/moderation-jobs/{job_id}에서 확인합니다.
+    """
+    return await jobs.submit(
+        moderation.action,
+        product_id=moderation.product_id,
+        user_id=moderation.user_id,
+        review_type=moderation.review_type,
+    )
+
+
+@app.get(
+    "/admin/moderation-jobs",
+    response_model=List[schemas.ModerationJobRead],
+    dependencies=[Depends(require_admin_token)],
+    tags=["Admin"],
+)
+async def list_moderation_jobs_endpoint(jobs: ModerationJobs = Depends(get_moderation_jobs)):
+    return await jobs.jobs()
+
+
+@app.get(
+    "/admin/moderation-jobs/{job_id}",
+    response_model=schemas.ModerationJobRead,
+    dependencies=[Depends(require_admin_token)],
+    tags=["Admin"],
+)
+async def read_moderation_job_endpoint(job_id: int, jobs: ModerationJobs = Depends(get_moderation_jobs)):
+    job = await jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Moderation job not found")
+    return job
@@ -0,0 +1,136 @@
+# app/messaging/outbox.py
+import asyncio
+import itertools
+import os
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import sessionmaker
+
+from .. import crud, schemas
+from .bus import MessageBus
+
+OUTBOX_BATCH_SIZE = int(os.getenv("OUTBOX_BATCH_SIZE", "100"))
+OUTBOX_POLL_INTERVAL = float(os.getenv("OUTBOX_POLL_INTERVAL", "0.5"))
+# 발행된 행은 이 기간(초)이 지나면 지웁니다. 재처리나 조사에 쓸 수 있도록 잠시 남겨 둡니다.
+OUTBOX_RETENTION = float(os.getenv("OUTBOX_RETENTION", str(7 * 24 * 60 * 60)))
+OUTBOX_PURGE_INTERVAL = float(os.getenv("OUTBOX_PURGE_INTERVAL", "600"))
+OUTBOX_PURGE_BATCH_SIZE = int(os.getenv("OUTBOX_PURGE_BATCH_SIZE", "1000"))
+
+# 파드·워커마다 릴레이가 돌지만, 배치는 이 advisory lock을 잡은 릴레이 하나만 처리합니다.
+OUTBOX_RELAY_LOCK_ID = 0x7265766965770002
+
+
+class OutboxRelay:
+    """
+    아웃박스 테이블에서 발행되지 않은 이벤트를 배치로 읽어 메시지 버스로 보내고,
+    발행된 행에 published_at을 기록하는 백그라운드 작업.
+
+    보장하는 것(PostgreSQL 기준):
+    - 배치는 OUTBOX_RELAY_LOCK_ID를 잡은 릴레이 하나만 처리하고, 다음 배치는 앞 배치가 커밋된 뒤에 읽으므로
+      여러 파드에서 돌아도 이벤트는 커밋된 행 기준 아웃박스 ID 순서로 나갑니다.
+    - 같은 리뷰의 변경은 행 잠금으로 직렬화되어 앞 변경이 커밋된 뒤에 ID를 받으므로 created/updated/deleted
+      순서가 지켜집니다. 서로 다른 리뷰 사이의 전역 순서는 보장하지 않습니다(작은 ID가 늦게 커밋될 수 있음).
+    - 발행 후 published_at을 커밋하기 전에 실패하면 같은 이벤트가 다시 나갑니다(at-least-once).
+      소비자는 이벤트 ID로 중복을 걸러야 합니다.
+    SQLite(개발·테스트)는 advisory lock이 없으므로 한 프로세스에서만 돌린다고 가정합니다.
+    """
+    def __init__(
+        self,
+        session_factory: sessionmaker,
+        bus: MessageBus,
+        batch_size: int = OUTBOX_BATCH_SIZE,
+        poll_interval: float = OUTBOX_POLL_INTERVAL,
+        retention: float = OUTBOX_RETENTION,
+        purge_interval: float = OUTBOX_PURGE_INTERVAL,
+    ):
+        self._session_factory = session_factory
+        self._bus = bus
+        self._batch_size = batch_size
+        self._poll_interval = poll_interval
+        self._retention = retention
+        self._purge_interval = purge_interval
+        self._task: Optional[asyncio.Task] = None
+
+    async def run_once(self) -> int:
+        """한 배치를 발행하고, 발행한 이벤트 수를 돌려줍니다."""
+        async with self._session_factory() as session:
+            session: AsyncSession
+            if not await crud.try_lock_outbox_relay(session, OUTBOX_RELAY_LOCK_ID):
+                # 다른 릴레이가 배치를 처리하는 중입니다.
+                return 0
+            outbox_events = await crud.get_unpublished_outbox_events(session, limit=self._batch_size)
+            if not outbox_events:
+                return 0
+
+            # 아웃박스 ID(TSID) 순서를 유지한 채, 같은 토픽이 연속된 구간마다 publish_many로 묶어 발행합니다.
+            for topic, group in itertools.groupby(outbox_events, key=lambda e: e.topic):
+                messages = [schemas.ReviewEvent.model_validate_json(e.payload) for e in group]
+                await self._bus.publish_many(topic=topic, messages=messages)
+
+            await crud.mark_outbox_events_published(session, [e.id for e in outbox_events])
+            await session.commit()
+            return len(outbox_events)
+
+    async def drain(self) -> int:
+        """남은 이벤트가 없을 때까지 발행합니다."""
+        total = 0
+        while published := await self.run_once():
+            total += published
+        return total
+
+    async def purge_published(self, now: Optional[datetime] = None) -> int:
+        """보존 기간이 지난 발행 완료 행을 배치로 나눠 지우고, 지운 행 수를 돌려줍니다."""
+        before = (now or datetime.now(timezone.utc)) - timedelta(seconds=self._retention)
+        total = 0
+        while True:
+            async with self._session_factory() as session:
+                deleted = await crud.delete_published_outbox_events(session, before, limit=OUTBOX_PURGE_BATCH_SIZE)
+                await session.commit()
+            total += deleted
+            if deleted < OUTBOX_PURGE_BATCH_SIZE:
+                return total
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        next_purge = loop.time() + self._purge_interval
+        while True:
+            if loop.time() >= next_purge:
+                next_purge = loop.time() + self._purge_interval
+                try:
+                    await self.purge_published()
+                except Exception as e:
+                    print(f"[outbox] Purge failed, retrying: {e!r}")
+
+            if not self._bus.is_connected:
+                # 버스가 백그라운드에서 연결되는 동안 이벤트는 아웃박스에 쌓입니다.
+                await asyncio.sleep(self._poll_interval)
+                continue
+
+            try:
+                published = await self.run_once()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                # 브로커/DB 장애 시 이벤트는 아웃박스에 남아 있으므로 잠시 후 재시도합니다.
+                print(f"[outbox] Relay failed, retrying: {e!r}")
+                published = 0
+
+            if published < self._batch_size:
+                await asyncio.sleep(self._poll_interval)
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+        print("[infrastructure] Outbox relay started.")
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        print("🚮 Outbox relay stopped.")
@@ -0,0 +1,139 @@
+# app/migrations.py
+"""
+스키마 버전별 마이그레이션 SQL. SCHEMA_VERSION을 올릴 때마다 같은 번호의 항목을 추가합니다.
+
+버전 0은 버전 기록이 없던 시절의 DB(reviews 테이블만 있거나, 그 뒤 create_all이 새 테이블만
+만든 상태)입니다. 그래서 모든 구문은 IF NOT EXISTS로 쓰고, 이미 일부가 있어도 끝까지 적용됩니다.
+운영 DB는 PostgreSQL이고, SQLite 구문은 개발 DB와 테스트용입니다.
+항목을 추가하면 tests/test_migrations.py가 create_all로 만든 스키마와 같은지 확인합니다.
+"""
+from typing import Dict, List
+
+from .models import SEARCH_DDL
+
+_TYPES = {
+    "postgresql": {"timestamp": "TIMESTAMP WITH TIME ZONE", "now": "now()", "review_type": "reviewtype"},
+    "sqlite": {"timestamp": "DATETIME", "now": "CURRENT_TIMESTAMP", "review_type": "VARCHAR(6)"},
+}
+
+_COMMON: Dict[int, List[str]] = {
+    # user-003, user-007, user-008, user-014: 아웃박스, 평점 요약, 복합 인덱스, 버전 기록
+    1: [
+        """
+        CREATE TABLE IF NOT EXISTS review_outbox (
+            id BIGINT NOT NULL,
+            topic VARCHAR NOT NULL,
+            payload TEXT NOT NULL,
+            created_at {timestamp} DEFAULT {now},
+            published_at {timestamp},
+            PRIMARY KEY (id)
+        )
+        """,
+        "CREATE INDEX IF NOT EXISTS ix_review_outbox_unpublished ON review_outbox (id) WHERE published_at IS NULL",
+        """
+        CREATE TABLE IF NOT EXISTS product_rating_stats (
+            product_id VARCHAR NOT NULL,
+            review_count INTEGER NOT NULL,
+            rating_sum INTEGER NOT NULL,
+            rating_1 INTEGER NOT NULL,
+            rating_2 INTEGER NOT NULL,
+            rating_3 INTEGER NOT NULL,
+            rating_4 INTEGER NOT NULL,
+            rating_5 INTEGER NOT NULL,
+            updated_at {timestamp} DEFAULT {now},
+            PRIMARY KEY (product_id)
+        )
+        """,
+        "CREATE INDEX IF NOT EXISTS ix_reviews_product_id_id ON reviews (product_id, id DESC)",
+        "CREATE INDEX IF NOT EXISTS ix_reviews_user_id_id ON reviews (user_id, id DESC)",
+        # 복합 인덱스가 앞부분으로 대신하므로 처음의 단일 컬럼 인덱스는 지웁니다.
+        "DROP INDEX IF EXISTS ix_reviews_product_id",
+        "DROP INDEX IF EXISTS ix_reviews_user_id",
+    ],
+    # user-016: Idempotency-Key 응답 저장
+    2: [
+        """
+        CREATE TABLE IF NOT EXISTS idempotency_keys (
+            key VARCHAR(255) NOT NULL,
+            request_hash VARCHAR(64) NOT NULL,
+            status_code INTEGER NOT NULL,
+            response_body TEXT NOT NULL,
+            expires_at {timestamp} NOT NULL,
+            PRIMARY KEY (key)
+        )
+        """,
+        "CREATE INDEX IF NOT EXISTS ix_idempotency_keys_expires_at ON idempotency_keys (expires_at)",
+    ],
+    # user-019: 일괄 처리 작업
+    3: [
+        """
+        CREATE TABLE IF NOT EXISTS moderation_jobs (
+            id BIGINT NOT NULL,
+            action VARCHAR NOT NULL,
+            product_id VARCHAR,
+            user_id VARCHAR,
+            review_type {review_type},
+            status VARCHAR NOT NULL,
+            total INTEGER,
+            processed INTEGER NOT NULL,
+            error TEXT,
+            created_at {timestamp} DEFAULT {now},
+            finished_at {timestamp},
+            PRIMARY KEY (id)
+        )
+        """,
+    ],
+    # user-007: 평점 요약을 reviews에서 다시 계산합니다. 요약 테이블은 그 뒤의 쓰기만 증감으로 반영하므로,
+    # 이 단계가 없으면 기존 리뷰를 지우거나 고칠 때 개수가 음수로 어긋납니다.
+    4: [
+        "DELETE FROM product_rating_stats",
+        """
+        INSERT INTO product_rating_stats (
+            product_id, review_count, rating_sum, rating_1, rating_2, rating_3, rating_4, rating_5, updated_at
+        )
+        SELECT
+            product_id,
+            count(*),
+            coalesce(sum(rating), 0),
+            sum(CASE WHEN rating = 1 THEN 1 ELSE 0 END),
+            sum(CASE WHEN rating = 2 THEN 1 ELSE 0 END),
+            sum(CASE WHEN rating = 3 THEN 1 ELSE 0 END),
+            sum(CASE WHEN rating = 4 THEN 1 ELSE 0 END),
+            sum(CASE WHEN rating = 5 THEN 1 ELSE 0 END),
+            {now}
+        FROM reviews
+        GROUP BY product_id
+        """,
+    ],
+    # user-019: 작업 heartbeat. 이미 있던 작업은 마지막으로 바뀐 시각으로 채웁니다.
+    5: ["UPDATE moderation_jobs SET updated_at = coalesce(finished_at, created_at)"],
+}
+
+_DIALECT_ONLY: Dict[str, Dict[int, List[str]]] = {
+    "postgresql": {
+        # user-010: 검색 컬럼과 GIN 인덱스. 생성 컬럼이므로 기존 행도 바로 채워집니다.
+        1: list(SEARCH_DDL["postgresql"]),
+        # 다시 계산하는 동안 들어온 리뷰 쓰기가 요약에서 빠지지 않도록, 커밋할 때까지 쓰기를 막습니다.
+        4: ["LOCK TABLE reviews IN SHARE MODE"],
+        5: ["ALTER TABLE moderation_jobs ADD COLUMN IF NOT EXISTS updated_at TIMESTAMP WITH TIME ZONE DEFAULT now()"],
+    },
+    "sqlite": {
+        # user-010: FTS5 테이블과 동기화 트리거. 트리거가 없던 시절의 행은 직접 채웁니다.
+        1: list(SEARCH_DDL["sqlite"]) + [
+            """
+            INSERT INTO reviews_fts(rowid, comment)
+            SELECT id, coalesce(comment, '') FROM reviews WHERE id NOT IN (SELECT rowid FROM reviews_fts)
+            """,
+        ],
+        # SQLite는 ALTER TABLE로 상수가 아닌 기본값을 붙일 수 없어 기본값 없이 추가합니다.
+        5: ["ALTER TABLE moderation_jobs ADD COLUMN updated_at DATETIME"],
+    },
+}
+
+
+def migration_statements(dialect: str, version: int) -> List[str]:
+    """version으로 올리는 구문들. 방언 전용 구문(잠금 등)이 공통 구문보다 먼저 옵니다."""
+    if dialect not in _TYPES:
+        raise ValueError(f"No migrations are provided for the {dialect!r} dialect.")
+    statements = [statement.format(**_TYPES[dialect]) for statement in _COMMON.get(version, [])]
+    return _DIALECT_ONLY[dialect].get(version, []) + statements
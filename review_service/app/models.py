@@ -1,9 +1,9 @@
 import enum
 
-from tsidpy import TSID
-from sqlalchemy import BigInteger, Column, Integer, String, Text, DateTime, Enum
+from sqlalchemy import BigInteger, Column, DDL, Integer, String, Text, DateTime, Enum, Index, event
 from sqlalchemy.sql import func
 from .database import Base
+from .ids import next_id
 
 class ReviewType(str, enum.Enum):
     RATING = "RATING"
@@ -13,11 +13,128 @@ class ReviewType(str, enum.Enum):
 class Review(Base):
     __tablename__ = "reviews"
 
-    id = Column(BigInteger, primary_key=True, default=lambda: TSID.create().number)
-    product_id = Column(String, nullable=False, index=True)
-    user_id = Column(String, nullable=False, index=True)
+    id = Column(BigInteger, primary_key=True, default=next_id)
+    product_id = Column(String, nullable=False)
+    user_id = Column(String, nullable=False)
     rating = Column(Integer, nullable=False, default=0)
     comment = Column(Text, nullable=True)
     review_type = Column(Enum(ReviewType), nullable=False, default=ReviewType.NORMAL)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
-    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
\ No newline at end of file
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+
+    __table_args__ = (
+        # "상품/유저별 최신 N개" 조회가 인덱스 범위 스캔 한 번으로 끝나도록 합니다.
+        Index("ix_reviews_product_id_id", "product_id", id.desc()),
+        Index("ix_reviews_user_id_id", "user_id", id.desc()),
+    )
+
+# 리뷰 본문 전문 검색 구조는 방언마다 다르므로 reviews 테이블 생성 직후 DDL로 만듭니다.
+# PostgreSQL: tsvector 생성 컬럼 + GIN 인덱스 / SQLite: 트리거로 동기화되는 FTS5 테이블
+# 조회는 app/search.py의 백엔드가 담당합니다.
+SEARCH_TS_CONFIG = "simple"
+
+SEARCH_DDL = {
+    "postgresql": [
+        f"""
+        ALTER TABLE reviews ADD COLUMN IF NOT EXISTS search_vector tsvector
+        GENERATED ALWAYS AS (to_tsvector('{SEARCH_TS_CONFIG}', coalesce(comment, ''))) STORED
+        """,
+        "CREATE INDEX IF NOT EXISTS ix_reviews_search_vector ON reviews USING GIN (search_vector)",
+    ],
+    "sqlite": [
+        "CREATE VIRTUAL TABLE IF NOT EXISTS reviews_fts USING fts5(comment)",
+        """
+        CREATE TRIGGER IF NOT EXISTS reviews_fts_insert AFTER INSERT ON reviews BEGIN
+            INSERT INTO reviews_fts(rowid, comment) VALUES (new.id, coalesce(new.comment, ''));
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS reviews_fts_update AFTER UPDATE OF comment ON reviews BEGIN
+            DELETE FROM reviews_fts WHERE rowid = old.id;
+            INSERT INTO reviews_fts(rowid, comment) VALUES (new.id, coalesce(new.comment, ''));
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS reviews_fts_delete AFTER DELETE ON reviews BEGIN
+            DELETE FROM reviews_fts WHERE rowid = old.id;
+        END
+        """,
+    ],
+}
+
+for _dialect, _statements in SEARCH_DDL.items():
+    for _statement in _statements:
+        event.listen(Review.__table__, "after_create", DDL(_statement).execute_if(dialect=_dialect))
+
+class OutboxEvent(Base):
+    """리뷰 변경과 같은 트랜잭션에서 기록되고, 백그라운드 릴레이가 발행하는 이벤트"""
+    __tablename__ = "review_outbox"
+
+    id = Column(BigInteger, primary_key=True, default=next_id)
+    topic = Column(String, nullable=False)
+    payload = Column(Text, nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    published_at = Column(DateTime(timezone=True), nullable=True)
+
+    __table_args__ = (
+        Index(
+            "ix_review_outbox_unpublished",
+            "id",
+            postgresql_where=published_at.is_(None),
+            sqlite_where=published_at.is_(None),
+        ),
+    )
+
+
+class ProductRatingStats(Base):
+    """상품별 평점 요약. 리뷰 쓰기와 같은 트랜잭션에서 증감(delta)으로 갱신됩니다."""
+    __tablename__ = "product_rating_stats"
+
+    product_id = Column(String, primary_key=True)
+    review_count = Column(Integer, nullable=False, default=0)
+    rating_sum = Column(Integer, nullable=False, default=0)
+    rating_1 = Column(Integer, nullable=False, default=0)
+    rating_2 = Column(Integer, nullable=False, default=0)
+    rating_3 = Column(Integer, nullable=False, default=0)
+    rating_4 = Column(Integer, nullable=False, default=0)
+    rating_5 = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+
+class IdempotencyKey(Base):
+    """Idempotency-Key로 처리한 요청의 응답. 리뷰 생성과 같은 트랜잭션에서 기록되고 만료 후 정리됩니다."""
+    __tablename__ = "idempotency_keys"
+
+    key = Column(String(255), primary_key=True)
+    request_hash = Column(String(64), nullable=False)
+    status_code = Column(Integer, nullable=False)
+    response_body = Column(Text, nullable=False)
+    expires_at = Column(DateTime(timezone=True), nullable=False, index=True)
+
+
+class ModerationJob(Base):
+    """일괄 삭제·유형 변경 작업. 어느 워커가 실행하든 모든 워커가 같은 진행 상황을 조회합니다."""
+    __tablename__ = "moderation_jobs"
+
+    id = Column(BigInteger, primary_key=True, default=next_id)
+    action = Column(String, nullable=False)
+    product_id = Column(String, nullable=True)
+    user_id = Column(String, nullable=True)
+    review_type = Column(Enum(ReviewType), nullable=True)
+    status = Column(String, nullable=False)
+    total = Column(Integer, nullable=True)
+    processed = Column(Integer, nullable=False, default=0)
+    error = Column(Text, nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    # 실행 중인 워커가 chunk를 커밋할 때마다 갱신합니다(heartbeat).
+    updated_at = Column(DateTime(timezone=True), server_default=func.now())
+    finished_at = Column(DateTime(timezone=True), nullable=True)
+
+
+class SchemaVersion(Base):
+    """스키마 버전(단일 행). 마이그레이션이 올리고, 서비스는 시작할 때 확인만 합니다."""
+    __tablename__ = "schema_version"
+
+    id = Column(Integer, primary_key=True, default=1)
+    version = Column(Integer, nullable=False)
+    applied_at = Column(DateTime(timezone=True), server_default=func.now())
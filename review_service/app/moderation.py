@@ -0,0 +1,154 @@
+# app/moderation.py
+import asyncio
+import os
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Optional, Sequence
+
+from . import crud, models, services
+from .database import AsyncSessionLocal
+
+MODERATION_CHUNK_SIZE = int(os.getenv("MODERATION_CHUNK_SIZE", str(crud.MODERATION_CHUNK_SIZE)))
+# 작업 목록에 보여줄 최근 작업 수
+MODERATION_JOBS_KEEP = int(os.getenv("MODERATION_JOBS_KEEP", "100"))
+# 이 시간(초) 동안 진행 기록이 없는 pending/running 작업은 실행하던 워커가 죽은 것으로 보고 stale로 보여줍니다.
+# chunk 하나를 처리하는 시간보다 충분히 길어야 합니다.
+MODERATION_JOB_STALE_AFTER = float(os.getenv("MODERATION_JOB_STALE_AFTER", "300"))
+
+JOB_PENDING = "pending"
+JOB_RUNNING = "running"
+JOB_COMPLETED = "completed"
+JOB_FAILED = "failed"
+JOB_STALE = "stale"
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+class ModerationJobs:
+    """
+    상품/사용자 단위 일괄 삭제·유형 변경을 백그라운드 작업으로 실행합니다.
+    작업은 chunk마다 별도 트랜잭션으로 커밋하므로 수백만 건이어도 잠금이 짧고,
+    중간에 실패해도 이미 처리한 chunk는 이벤트와 함께 반영되어 있습니다.
+    작업과 진행 상황은 moderation_jobs 테이블에 기록하므로 어느 워커에서든 조회할 수 있습니다.
+    실행은 제출을 받은 워커가 맡고, chunk를 커밋할 때마다 updated_at을 갱신합니다. 그 워커가 죽어
+    stale_after 동안 갱신이 없으면 조회 결과의 status가 stale로 바뀝니다(DB의 상태는 그대로).
+    chunk는 조건으로 고르므로 같은 작업을 다시 제출하면 남은 리뷰만 처리됩니다.
+    """
+    def __init__(
+        self,
+        session_factory=AsyncSessionLocal,
+        chunk_size: int = MODERATION_CHUNK_SIZE,
+        keep: int = MODERATION_JOBS_KEEP,
+        stale_after: float = MODERATION_JOB_STALE_AFTER,
+    ):
+        self.session_factory = session_factory
+        self.chunk_size = chunk_size
+        self.keep = keep
+        self.stale_after = stale_after
+        self._tasks: Dict[int, asyncio.Task] = {}
+
+    async def submit(
+        self,
+        action: str,
+        product_id: Optional[str] = None,
+        user_id: Optional[str] = None,
+        review_type: Optional[models.ReviewType] = None,
+    ) -> models.ModerationJob:
+        async with self.session_factory() as session:
+            job = await crud.create_moderation_job(
+                session, action=action, product_id=product_id, user_id=user_id, review_type=review_type,
+                status=JOB_PENDING,
+            )
+            await session.commit()
+
+        task = asyncio.create_task(self._run(job))
+        self._tasks[job.id] = task
+        task.add_done_callback(lambda _: self._tasks.pop(job.id, None))
+        return job
+
+    async def get(self, job_id: int) -> Optional[models.ModerationJob]:
+        async with self.session_factory() as session:
+            job = await crud.get_moderation_job(session, job_id)
+        if job is not None:
+            self._mark_stale(job, _utcnow())
+        return job
+
+    async def jobs(self) -> Sequence[models.ModerationJob]:
+        """최근에 제출된 순서."""
+        async with self.session_factory() as session:
+            jobs = await crud.list_moderation_jobs(session, limit=self.keep)
+        now = _utcnow()
+        for job in jobs:
+            self._mark_stale(job, now)
+        return jobs
+
+    def _mark_stale(self, job: models.ModerationJob, now: datetime):
+        """세션에서 떨어진 객체의 status만 바꿉니다. DB에는 쓰지 않습니다."""
+        if job.status not in (JOB_PENDING, JOB_RUNNING):
+            return
+        last_update = job.updated_at or job.created_at
+        if last_update.tzinfo is None:  # SQLite는 시간대를 저장하지 않습니다(항상 UTC로 기록).
+            last_update = last_update.replace(tzinfo=timezone.utc)
+        if now - last_update > timedelta(seconds=self.stale_after):
+            job.status = JOB_STALE
+
+    async def wait(self, job_id: int):
+        """이 워커에서 실행 중인 작업이 끝날 때까지 기다립니다."""
+        task = self._tasks.get(job_id)
+        if task is not None:
+            await asyncio.shield(task)
+
+    async def cancel_all(self):
+        for task in list(self._tasks.values()):
+            task.cancel()
+        await asyncio.gather(*self._tasks.values(), return_exceptions=True)
+
+    async def _update(self, job_id: int, processed_delta: int = 0, **values):
+        async with self.session_factory() as session:
+            await crud.update_moderation_job(session, job_id, processed_delta=processed_delta, **values)
+            await session.commit()
+
+    async def _run_chunk(self, job: models.ModerationJob) -> int:
+        async with self.session_factory() as session:
+            if job.action == "delete":
+                return await services.delete_reviews_chunk(
+                    session, product_id=job.product_id, user_id=job.user_id, chunk_size=self.chunk_size,
+                )
+            return await services.retype_reviews_chunk(
+                session, review_type=job.review_type, product_id=job.product_id, user_id=job.user_id,
+                chunk_size=self.chunk_size,
+            )
+
+    async def _run(self, job: models.ModerationJob):
+        try:
+            # total은 시작 시점의 추정치입니다. 작업 중에 새로 들어온 리뷰도 처리될 수 있습니다.
+            async with self.session_factory() as session:
+                total = await crud.count_reviews(session, product_id=job.product_id, user_id=job.user_id)
+            await self._update(job.id, status=JOB_RUNNING, total=total)
+
+            while True:
+                processed = await self._run_chunk(job)
+                if processed:
+                    await self._update(job.id, processed_delta=processed)
+                if processed < self.chunk_size:
+                    break
+            await self._update(job.id, status=JOB_COMPLETED, finished_at=_utcnow())
+        except asyncio.CancelledError:
+            await self._record_failure(job, "cancelled")
+            raise
+        except Exception as e:
+            print(f"[moderation] Job {job.id} failed: {e!r}")
+            await self._record_failure(job, repr(e))
+
+    async def _record_failure(self, job: models.ModerationJob, error: str):
+        try:
+            await self._update(job.id, status=JOB_FAILED, error=error, finished_at=_utcnow())
+        except Exception as e:
+            print(f"[moderation] Could not record failure of job {job.id}: {e!r}")
+
+
+moderation_jobs = ModerationJobs()
+
+async def get_moderation_jobs() -> ModerationJobs:
+    return moderation_jobs
@@ -0,0 +1,61 @@
+# app/observability/http.py
+import time
+
+from starlette.routing import Match
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from service_observability.metrics import MetricsRegistry, registry as default_registry
+
+UNMATCHED_ROUTE = "unmatched"
+
+
+class HTTPMetricsMiddleware:
+    """
+    라우트(경로 템플릿)별 요청 수, 처리 중인 요청 수, 응답 지연을 기록하는 ASGI 미들웨어.
+    지연은 스트리밍 응답을 포함해 응답 본문이 끝날 때까지 잽니다.
+    """
+    def __init__(self, app: ASGIApp, registry: MetricsRegistry = default_registry):
+        self.app = app
+        self.requests = registry.counter(
+            "http_requests", "HTTP requests by route, method and status code.",
+            ["method", "route", "status_code"],
+        )
+        self.in_flight = registry.gauge(
+            "http_requests_in_flight", "HTTP requests currently being served.", ["method", "route"],
+        )
+        self.duration = registry.histogram(
+            "http_request_duration_seconds", "HTTP request latency by route.", ["method", "route"],
+        )
+
+    @staticmethod
+    def _route_template(scope: Scope) -> str:
+        # 라벨 수가 경로 값(리뷰 ID 등)만큼 늘지 않도록 템플릿을 씁니다.
+        for route in scope["app"].router.routes:
+            match, _ = route.matches(scope)
+            if match == Match.FULL:
+                return route.path
+        return UNMATCHED_ROUTE
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        route = self._route_template(scope)
+        status_code = 500
+
+        async def send_wrapper(message: Message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        self.in_flight.inc(method=method, route=route)
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            self.duration.observe(time.perf_counter() - started, method=method, route=route)
+            self.requests.inc(method=method, route=route, status_code=str(status_code))
+            self.in_flight.dec(method=method, route=route)
@@ -0,0 +1,141 @@
+# app/observability/profiling.py
+import cProfile
+import heapq
+import io
+import itertools
+import os
+import pstats
+import random
+import time
+from dataclasses import dataclass, field
+from typing import List, Optional
+
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from ..admin import ADMIN_TOKEN, ADMIN_TOKEN_HEADER, is_admin_token
+
+PROFILING_SAMPLE_RATE = float(os.getenv("PROFILING_SAMPLE_RATE", "0"))
+PROFILING_KEEP = int(os.getenv("PROFILING_KEEP", "20"))
+PROFILING_STATS_LINES = int(os.getenv("PROFILING_STATS_LINES", "40"))
+
+# 관리자 토큰(X-Admin-Token)과 함께 보내면 그 요청을 프로파일링합니다.
+PROFILE_HEADER = "x-profile"
+
+
+@dataclass(order=True)
+class RequestProfile:
+    duration_ms: float
+    id: int = field(compare=False)
+    method: str = field(compare=False)
+    path: str = field(compare=False)
+    status_code: int = field(compare=False)
+    started_at: float = field(compare=False)
+    stats: str = field(compare=False, repr=False)
+
+
+class RequestProfiler:
+    """
+    요청 단위 cProfile 결과 중 가장 느린 N개만 보관합니다(min-heap).
+    cProfile은 스레드 전체를 기록하므로 같은 이벤트 루프에서 동시에 처리된 다른 요청의
+    시간도 섞일 수 있고, 한 번에 하나의 요청만 프로파일링합니다.
+    """
+    def __init__(
+        self,
+        sample_rate: float = PROFILING_SAMPLE_RATE,
+        token: Optional[str] = ADMIN_TOKEN,
+        keep: int = PROFILING_KEEP,
+        stats_lines: int = PROFILING_STATS_LINES,
+    ):
+        self.sample_rate = sample_rate
+        self.token = token
+        self.keep = keep
+        self.stats_lines = stats_lines
+        self._profiles: List[RequestProfile] = []
+        self._ids = itertools.count(1)
+        self.active = False
+
+    @property
+    def enabled(self) -> bool:
+        return self.sample_rate > 0 or bool(self.token)
+
+    def should_profile(self, scope: Scope) -> bool:
+        if self.active:
+            return False
+        if self.token:
+            headers = {name.decode("latin-1"): value.decode("latin-1") for name, value in scope["headers"]}
+            if headers.get(PROFILE_HEADER, "").lower() in ("1", "true"):
+                return is_admin_token(headers.get(ADMIN_TOKEN_HEADER), self.token)
+        return self.sample_rate > 0 and random.random() < self.sample_rate
+
+    def record(self, profiler: cProfile.Profile, method: str, path: str, status_code: int,
+               started_at: float, duration_ms: float):
+        if len(self._profiles) >= self.keep and duration_ms <= self._profiles[0].duration_ms:
+            return  # 보관 중인 것보다 빠르면 통계 문자열을 만들지 않습니다.
+
+        buffer = io.StringIO()
+        pstats.Stats(profiler, stream=buffer).sort_stats("cumulative").print_stats(self.stats_lines)
+        profile = RequestProfile(
+            duration_ms=duration_ms,
+            id=next(self._ids),
+            method=method,
+            path=path,
+            status_code=status_code,
+            started_at=started_at,
+            stats=buffer.getvalue(),
+        )
+        if len(self._profiles) < self.keep:
+            heapq.heappush(self._profiles, profile)
+        else:
+            heapq.heapreplace(self._profiles, profile)
+
+    def profiles(self) -> List[RequestProfile]:
+        """느린 순으로 정렬된 보관 중인 프로파일."""
+        return sorted(self._profiles, reverse=True)
+
+    def get(self, profile_id: int) -> Optional[RequestProfile]:
+        return next((p for p in self._profiles if p.id == profile_id), None)
+
+    def clear(self):
+        self._profiles.clear()
+
+
+request_profiler = RequestProfiler()
+
+
+class ProfilingMiddleware:
+    """샘플링되었거나 관리자가 요청한 요청만 프로파일링합니다. 꺼져 있으면 바로 통과시킵니다."""
+    def __init__(self, app: ASGIApp, profiler: RequestProfiler = request_profiler):
+        self.app = app
+        self.profiler = profiler
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http" or not self.profiler.enabled or not self.profiler.should_profile(scope):
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        profiler = cProfile.Profile()
+        self.profiler.active = True
+        started_at = time.time()
+        started = time.perf_counter()
+        profiler.enable()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            profiler.disable()
+            self.profiler.active = False
+            self.profiler.record(
+                profiler,
+                method=scope["method"],
+                path=scope["path"],
+                status_code=status_code,
+                started_at=started_at,
+                duration_ms=(time.perf_counter() - started) * 1000,
+            )
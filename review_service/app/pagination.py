@@ -0,0 +1,51 @@
+# app/pagination.py
+import base64
+import binascii
+from typing import Optional, Tuple
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def _encode(value: str) -> str:
+    return base64.urlsafe_b64encode(value.encode()).decode().rstrip("=")
+
+
+def _decode(cursor: str) -> str:
+    padded = cursor + "=" * (-len(cursor) % 4)
+    try:
+        return base64.urlsafe_b64decode(padded.encode()).decode()
+    except (binascii.Error, UnicodeDecodeError, ValueError) as e:
+        raise ValueError(f"Invalid cursor: {cursor!r}") from e
+
+
+def encode_cursor(last_id: int) -> str:
+    """마지막으로 반환한 리뷰 ID를 클라이언트에 노출할 불투명(opaque) 커서로 변환합니다."""
+    return _encode(str(last_id))
+
+
+def decode_cursor(cursor: str) -> int:
+    """커서를 리뷰 ID로 되돌립니다. 잘못된 커서는 ValueError를 발생시킵니다."""
+    try:
+        return int(_decode(cursor))
+    except ValueError as e:
+        raise ValueError(f"Invalid cursor: {cursor!r}") from e
+
+
+def encode_ranked_cursor(last_score: float, last_id: int) -> str:
+    """(점수, ID) 순으로 정렬된 검색 결과용 커서를 만듭니다."""
+    return _encode(f"{last_score!r}:{last_id}")
+
+
+def decode_ranked_cursor(cursor: str) -> Tuple[float, int]:
+    try:
+        score, last_id = _decode(cursor).split(":")
+        return float(score), int(last_id)
+    except ValueError as e:
+        raise ValueError(f"Invalid cursor: {cursor!r}") from e
+
+
+def next_cursor(rows: list, limit: int) -> Optional[str]:
+    """페이지가 가득 찼을 때만 다음 페이지 커서를 돌려줍니다."""
+    if limit <= 0 or len(rows) < limit:
+        return None
+    return encode_cursor(rows[-1].id)
@@ -0,0 +1,141 @@
+# app/schema.py
+"""
+스키마 준비. 배포 전에 마이그레이션을 적용하려면
+
+    python -m app.schema migrate                 # review_service 디렉터리에서
+    python -m review_service.app.schema migrate  # 저장소 루트(컨테이너)에서
+"""
+import argparse
+import asyncio
+import os
+from typing import Optional
+
+from sqlalchemy import inspect, select
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine
+
+from . import models
+from .database import Base
+from .migrations import migration_statements
+
+# 모델(테이블, 인덱스, 검색용 DDL)을 바꾸면 올리고, app/migrations.py에 같은 번호의 마이그레이션을 추가합니다.
+SCHEMA_VERSION = 5
+
+# create: 개발·테스트용. 빈 DB면 create_all 후 현재 버전을 기록하고, 이미 테이블이 있으면 check와 같습니다.
+#         create_all은 있는 테이블을 고치지 않으므로 오래된 DB를 현재 버전으로 표시하지 않습니다.
+# migrate: 밀린 마이그레이션을 적용합니다. 빈 DB면 create와 같습니다.
+# check: 운영 환경용(이미지 기본값). 마이그레이션은 따로 적용하고, 시작할 때는 버전 행 하나만 읽습니다.
+SCHEMA_STARTUP_MODES = ("create", "migrate", "check")
+SCHEMA_STARTUP_MODE = os.getenv("SCHEMA_STARTUP_MODE", "create")
+
+# 여러 파드가 동시에 migrate로 시작해도 한 곳만 적용하도록 PostgreSQL advisory lock을 잡습니다.
+SCHEMA_MIGRATION_LOCK_ID = 0x7265766965770001
+
+
+class SchemaVersionError(RuntimeError):
+    pass
+
+
+async def _has_tables(conn: AsyncConnection) -> bool:
+    names = await conn.run_sync(lambda sync_conn: inspect(sync_conn).get_table_names())
+    return bool(set(names) & set(Base.metadata.tables))
+
+
+async def _read_version(conn: AsyncConnection) -> Optional[int]:
+    """버전 테이블이 없으면(버전을 기록하기 전의 DB) None입니다."""
+    has_table = await conn.run_sync(
+        lambda sync_conn: inspect(sync_conn).has_table(models.SchemaVersion.__tablename__)
+    )
+    if not has_table:
+        return None
+    return (await conn.execute(select(models.SchemaVersion.version))).scalar_one_or_none()
+
+
+async def _set_version(conn: AsyncConnection, version: int):
+    await conn.execute(models.SchemaVersion.__table__.delete())
+    await conn.execute(models.SchemaVersion.__table__.insert().values(id=1, version=version))
+
+
+async def _create_all(conn: AsyncConnection):
+    await conn.run_sync(Base.metadata.create_all)
+    await _set_version(conn, SCHEMA_VERSION)
+
+
+async def create_schema(engine: AsyncEngine):
+    async with engine.begin() as conn:
+        if not await _has_tables(conn):
+            await _create_all(conn)
+            return
+    await check_schema(engine)
+
+
+async def migrate_schema(engine: AsyncEngine, target: int = SCHEMA_VERSION) -> int:
+    """
+    현재 버전에서 target까지 마이그레이션을 차례로 적용하고 target을 반환합니다.
+    전체를 한 트랜잭션으로 실행하므로 중간에 실패하면 아무것도 바뀌지 않습니다.
+    """
+    async with engine.begin() as conn:
+        if conn.dialect.name == "postgresql":
+            await conn.exec_driver_sql(f"SELECT pg_advisory_xact_lock({SCHEMA_MIGRATION_LOCK_ID})")
+        if not await _has_tables(conn):
+            await _create_all(conn)
+            return SCHEMA_VERSION
+
+        version = await _read_version(conn) or 0
+        if version > target:
+            raise SchemaVersionError(f"Database schema version is {version}, newer than this build ({target}).")
+
+        await conn.run_sync(models.SchemaVersion.__table__.create, checkfirst=True)
+        for next_version in range(version + 1, target + 1):
+            for statement in migration_statements(conn.dialect.name, next_version):
+                await conn.exec_driver_sql(statement)
+            await _set_version(conn, next_version)
+            print(f"[schema] Migrated to version {next_version}.")
+    return target
+
+
+async def check_schema(engine: AsyncEngine):
+    try:
+        async with engine.connect() as conn:
+            version = (await conn.execute(select(models.SchemaVersion.version))).scalar_one_or_none()
+    except DBAPIError as e:
+        raise SchemaVersionError(
+            "Schema version table is missing; apply migrations with `python -m app.schema migrate`."
+        ) from e
+
+    if version != SCHEMA_VERSION:
+        raise SchemaVersionError(
+            f"Database schema version is {version}, but this build expects {SCHEMA_VERSION}. "
+            "Apply migrations with `python -m app.schema migrate`."
+        )
+
+
+async def prepare_schema(engine: AsyncEngine, mode: str = SCHEMA_STARTUP_MODE):
+    if mode == "create":
+        await create_schema(engine)
+    elif mode == "migrate":
+        await migrate_schema(engine)
+    elif mode == "check":
+        await check_schema(engine)
+    else:
+        raise ValueError(f"Unknown SCHEMA_STARTUP_MODE: {mode!r}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m app.schema", description="Prepare the review database schema.")
+    parser.add_argument("mode", choices=SCHEMA_STARTUP_MODES)
+    args = parser.parse_args(argv)
+
+    from .database import engine
+
+    async def run():
+        try:
+            await prepare_schema(engine, args.mode)
+        finally:
+            await engine.dispose()
+
+    asyncio.run(run())
+
+
+if __name__ == "__main__":
+    main()
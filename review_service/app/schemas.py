@@ -1,8 +1,8 @@
 import random
 from datetime import datetime
-from typing import Optional
+from typing import Dict, List, Literal, Optional
 
-from pydantic import BaseModel, ConfigDict, Field
+from pydantic import BaseModel, ConfigDict, Field, model_validator
 
 from .models import ReviewType
 
@@ -44,6 +44,66 @@ class ReviewRead(ReviewBase):
         coerce_numbers_to_str=True,
     )
 
+class ReviewSearchHit(ReviewRead):
+    score: float
+
 class ReviewEvent(BaseModel):
     event_type: str
-    review: ReviewRead
\ No newline at end of file
+    review: ReviewRead
+
+class ReviewBatchItemResult(BaseModel):
+    index: int
+    success: bool
+    review: Optional[ReviewRead] = None
+    error: Optional[str] = None
+
+class ReviewBatchResult(BaseModel):
+    created: int
+    failed: int
+    results: List[ReviewBatchItemResult]
+
+class ProductRatingStats(BaseModel):
+    product_id: str
+    review_count: int
+    average_rating: Optional[float] = None
+    histogram: Dict[int, int]
+
+class RequestProfileSummary(BaseModel):
+    id: int
+    method: str
+    path: str
+    status_code: int
+    duration_ms: float
+    started_at: datetime
+
+    model_config = ConfigDict(from_attributes=True)
+
+class ReviewModerationRequest(BaseModel):
+    action: Literal["delete", "retype"]
+    product_id: Optional[str] = None
+    user_id: Optional[str] = None
+    review_type: Optional[ReviewType] = None
+
+    @model_validator(mode="after")
+    def check_target(self):
+        if self.product_id is None and self.user_id is None:
+            raise ValueError("product_id or user_id is required")
+        if (self.action == "retype") != (self.review_type is not None):
+            raise ValueError("review_type is required for retype and only allowed for retype")
+        return self
+
+class ModerationJobRead(BaseModel):
+    id: int
+    action: str
+    product_id: Optional[str] = None
+    user_id: Optional[str] = None
+    review_type: Optional[ReviewType] = None
+    status: str
+    total: Optional[int] = None
+    processed: int
+    error: Optional[str] = None
+    created_at: datetime
+    updated_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
+    model_config = ConfigDict(from_attributes=True)
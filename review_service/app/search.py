@@ -0,0 +1,116 @@
+# app/search.py
+import abc
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import Float, and_, column, func, literal_column, or_, table
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+from sqlalchemy.future import select
+
+from . import models
+
+# (검색 점수, 리뷰) 목록. 점수가 클수록 관련도가 높습니다.
+SearchHits = List[Tuple[float, models.Review]]
+
+
+class SearchBackend(abc.ABC):
+    """리뷰 본문 전문 검색 백엔드. 인덱스 구조는 models의 DDL 이벤트가 만듭니다."""
+    @abc.abstractmethod
+    async def search(
+        self,
+        db: AsyncSession,
+        query: str,
+        limit: int,
+        product_id: Optional[str] = None,
+        after: Optional[Tuple[float, int]] = None,
+    ) -> SearchHits:
+        """
+        점수 내림차순, 같은 점수는 ID 내림차순으로 정렬합니다.
+        after=(점수, ID)가 주어지면 그 다음 결과부터 돌려줍니다(keyset).
+        """
+        raise NotImplementedError
+
+    @staticmethod
+    def _after_filter(score, after: Tuple[float, int]):
+        last_score, last_id = after
+        return or_(score < last_score, and_(score == last_score, models.Review.id < last_id))
+
+    @staticmethod
+    async def _execute(db: AsyncSession, stmt) -> SearchHits:
+        result = await db.execute(stmt)
+        return [(score, review) for review, score in result.all()]
+
+
+class PostgresSearchBackend(SearchBackend):
+    """tsvector 생성 컬럼(search_vector)과 GIN 인덱스를 사용합니다."""
+    async def search(self, db, query, limit, product_id=None, after=None) -> SearchHits:
+        search_vector = literal_column("reviews.search_vector")
+        ts_query = func.plainto_tsquery(models.SEARCH_TS_CONFIG, query)
+        score = func.ts_rank_cd(search_vector, ts_query, type_=Float)
+
+        stmt = select(models.Review, score).filter(search_vector.op("@@")(ts_query))
+        if product_id is not None:
+            stmt = stmt.filter(models.Review.product_id == product_id)
+        if after is not None:
+            stmt = stmt.filter(self._after_filter(score, after))
+        stmt = stmt.order_by(score.desc(), models.Review.id.desc()).limit(limit)
+        return await self._execute(db, stmt)
+
+
+_FTS_TABLE = table("reviews_fts", column("rowid"), column("comment"))
+
+
+class SQLiteSearchBackend(SearchBackend):
+    """트리거로 동기화되는 FTS5 가상 테이블(reviews_fts)을 사용합니다."""
+    async def search(self, db, query, limit, product_id=None, after=None) -> SearchHits:
+        terms = self._to_match_expression(query)
+        if not terms:
+            return []
+
+        # bm25()는 작을수록 관련도가 높으므로 부호를 바꿔 다른 백엔드와 방향을 맞춥니다.
+        score = -func.bm25(literal_column(_FTS_TABLE.name), type_=Float)
+        stmt = (
+            select(models.Review, score)
+            .select_from(_FTS_TABLE)
+            .join(models.Review, models.Review.id == _FTS_TABLE.c.rowid)
+            .filter(literal_column(_FTS_TABLE.name).op("MATCH")(terms))
+        )
+        if product_id is not None:
+            stmt = stmt.filter(models.Review.product_id == product_id)
+        if after is not None:
+            stmt = stmt.filter(self._after_filter(score, after))
+        stmt = stmt.order_by(score.desc(), models.Review.id.desc()).limit(limit)
+        return await self._execute(db, stmt)
+
+    @staticmethod
+    def _to_match_expression(query: str) -> str:
+        """사용자 입력을 FTS5 문법으로 해석하지 않도록 각 단어를 따옴표로 감쌉니다(AND 검색)."""
+        return " ".join('"' + term.replace('"', '""') + '"' for term in query.split())
+
+
+_BACKENDS: Dict[str, SearchBackend] = {
+    "postgresql": PostgresSearchBackend(),
+    "sqlite": SQLiteSearchBackend(),
+}
+
+
+class SearchConfigurationError(RuntimeError):
+    """DB 방언에 맞는 검색 백엔드가 없습니다."""
+
+
+def _backend_for(dialect_name: str) -> SearchBackend:
+    try:
+        return _BACKENDS[dialect_name]
+    except KeyError:
+        raise SearchConfigurationError(
+            f"Full-text search is not supported on {dialect_name!r}; use one of {sorted(_BACKENDS)}."
+        ) from None
+
+
+def check_search_support(*engines: AsyncEngine):
+    """시작할 때 호출해, 지원하지 않는 DB면 요청마다 500을 내는 대신 바로 실패하게 합니다."""
+    for engine in engines:
+        _backend_for(engine.dialect.name)
+
+
+def get_search_backend(db: AsyncSession) -> SearchBackend:
+    return _backend_for(db.get_bind().dialect.name)
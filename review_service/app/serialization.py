@@ -0,0 +1,87 @@
+# app/serialization.py
+from datetime import datetime
+from operator import attrgetter
+from typing import Dict, Iterable, List, Mapping, Optional
+
+import msgpack
+import pydantic_core
+from fastapi import Request, Response
+
+JSON_MEDIA_TYPE = "application/json"
+MSGPACK_MEDIA_TYPE = "application/msgpack"
+MSGPACK_MEDIA_TYPES = (MSGPACK_MEDIA_TYPE, "application/x-msgpack")
+
+# OpenAPI 문서에 목록 엔드포인트가 MessagePack도 돌려줄 수 있음을 알립니다.
+LIST_RESPONSES = {200: {"content": {MSGPACK_MEDIA_TYPE: {}}}}
+
+_review_fields = attrgetter(
+    "rating", "comment", "id", "product_id", "user_id", "review_type", "created_at", "updated_at",
+)
+
+
+def _isoformat(value: Optional[datetime]) -> Optional[str]:
+    # pydantic과 같은 표기(UTC는 Z)를 써서 JSON 경로와 응답이 똑같게 합니다.
+    if value is None:
+        return None
+    text = value.isoformat()
+    return text[:-6] + "Z" if text.endswith("+00:00") else text
+
+
+def review_to_dict(review) -> Dict:
+    """
+    ReviewRead.model_dump(mode="json")과 같은 dict를 pydantic 모델을 거치지 않고 만듭니다.
+    review는 ORM 객체여도 되고 crud.get_reviews(as_rows=True)의 Row여도 됩니다.
+    목록 응답은 행마다 모델을 검증하고 다시 덤프하는 비용이 대부분이라 이 경로를 씁니다.
+    필드가 바뀌면 tests/test_serialization.py가 ReviewRead와 어긋난 것을 잡아냅니다.
+    """
+    rating, comment, review_id, product_id, user_id, review_type, created_at, updated_at = _review_fields(review)
+    return {
+        "rating": rating,
+        "comment": comment,
+        "id": str(review_id),
+        "product_id": product_id,
+        "user_id": user_id,
+        "review_type": review_type,  # ReviewType은 str을 상속하므로 그대로 직렬화됩니다.
+        "created_at": _isoformat(created_at),
+        "updated_at": _isoformat(updated_at),
+    }
+
+
+def _accept_q(accept: str) -> Dict[str, float]:
+    media_types = {}
+    for part in accept.split(","):
+        media_type, *params = part.split(";")
+        q = 1.0
+        for param in params:
+            name, _, number = param.partition("=")
+            if name.strip() == "q":
+                try:
+                    q = float(number)
+                except ValueError:
+                    q = 0.0
+        media_types[media_type.strip().lower()] = q
+    return media_types
+
+
+def wants_msgpack(request: Request) -> bool:
+    """Accept에서 MessagePack의 q가 JSON 이상일 때만 MessagePack으로 답합니다. 기본은 JSON입니다."""
+    accept = request.headers.get("accept")
+    if not accept or "msgpack" not in accept:
+        return False
+    media_types = _accept_q(accept)
+    msgpack_q = max(media_types.get(media_type, 0.0) for media_type in MSGPACK_MEDIA_TYPES)
+    json_q = media_types.get(JSON_MEDIA_TYPE, media_types.get("application/*", media_types.get("*/*", 0.0)))
+    return msgpack_q > 0 and msgpack_q >= json_q
+
+
+def review_list_response(
+    request: Request, reviews: Iterable, headers: Optional[Mapping[str, str]] = None,
+) -> Response:
+    rows: List[Dict] = [review_to_dict(review) for review in reviews]
+    if wants_msgpack(request):
+        body, media_type = msgpack.packb(rows), MSGPACK_MEDIA_TYPE
+    else:
+        body, media_type = pydantic_core.to_json(rows), JSON_MEDIA_TYPE
+    response = Response(content=body, media_type=media_type, headers=headers)
+    response.headers["Vary"] = "Accept"
+    return response
@@ -0,0 +1,184 @@
+# app/serve.py
+"""
+멀티 워커 실행 진입점.
+
+    python -m app.serve --workers 4                 # review_service 디렉터리에서
+    python -m review_service.app.serve --workers 4  # 저장소 루트(컨테이너)에서
+
+부모 프로세스가 소켓을 한 번 열고 스키마를 한 번 준비한 뒤, 워커를 spawn으로 띄웁니다.
+워커마다 WEB_CONCURRENCY(풀/채널 예산 분배)를 받고, 시작할 때 TSID 노드(기준값 + 워커 번호)로
+ID 생성기를 교체하므로 워커끼리 ID가 겹치지 않습니다. SIGTERM을 받으면 워커에 전달하고,
+각 워커는 처리 중인 요청을 최대 --graceful-timeout초 동안 마친 뒤 lifespan 종료 절차를 밟습니다.
+
+TSID 노드 기준값은 파드마다 겹치지 않게 TSID_NODE로 지정합니다. 파드 하나가 노드
+[TSID_NODE, TSID_NODE + 워커 수)를 쓰므로, 예를 들어 StatefulSet이면 순번 × WEB_CONCURRENCY를
+넣습니다. 지정하지 않으면 TSID_NODE_BITS 안에서 무작위 기준값을 고릅니다. 이 경우 파드끼리
+노드 구간이 겹칠 수 있으므로 파드가 여럿이면 지정하는 것이 안전합니다.
+
+워커 사이에 공유되지 않는 상태가 있어 기본값은 워커 1개입니다. 워커를 늘리면 다음을 감안해야 합니다.
+- GET /reviews/{id} 캐시(review_cache)는 수정을 처리한 워커에서만 무효화됩니다. 다른 워커는
+  REVIEW_CACHE_TTL 동안 이전 리뷰와 ETag를 돌려줄 수 있습니다.
+- /metrics와 /admin/profiles는 요청을 받은 워커 하나의 값만 보여 줍니다.
+일괄 처리 작업(/admin/moderation-jobs)은 DB에 기록되므로 어느 워커에서든 조회됩니다.
+
+이 모듈은 워커 안에서도 import되므로, 환경 변수를 정하기 전에 app 모듈을 import하지 않습니다.
+"""
+import argparse
+import asyncio
+import multiprocessing
+import os
+import random
+import signal
+import threading
+from typing import Dict, List
+
+import uvicorn
+
+APP = f"{__package__}.main:app"
+WORKER_RESTART_DELAY = 1.0
+
+multiprocessing.allow_connection_pickling()
+_spawn = multiprocessing.get_context("spawn")
+
+
+def _parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog="python -m app.serve", description="Run the review service.")
+    parser.add_argument("--host", default=os.getenv("HOST", "127.0.0.1"))
+    parser.add_argument("--port", type=int, default=int(os.getenv("PORT", "8000")))
+    parser.add_argument("--workers", type=int, default=int(os.getenv("WEB_CONCURRENCY", "1")))
+    parser.add_argument(
+        "--graceful-timeout", type=float, default=float(os.getenv("GRACEFUL_SHUTDOWN_TIMEOUT", "30")),
+        help="Seconds a worker waits for in-flight requests on shutdown.",
+    )
+    return parser.parse_args(argv)
+
+
+def _uvicorn_options(args: argparse.Namespace) -> dict:
+    return {
+        "host": args.host,
+        "port": args.port,
+        "timeout_graceful_shutdown": args.graceful_timeout,
+        "log_level": os.getenv("LOG_LEVEL", "info"),
+    }
+
+
+def _prepare_schema_once():
+    """워커들이 동시에 create_all을 돌리지 않도록 부모에서 한 번 준비하고, 워커는 확인만 합니다."""
+    from .database import engine
+    from .schema import SCHEMA_STARTUP_MODE, prepare_schema
+
+    async def prepare():
+        try:
+            await prepare_schema(engine, SCHEMA_STARTUP_MODE)
+        finally:
+            await engine.dispose()
+
+    asyncio.run(prepare())
+    os.environ["SCHEMA_STARTUP_MODE"] = "check"
+
+
+def _node_base(workers: int) -> int:
+    """이 파드의 워커들이 쓸 TSID 노드의 시작값. 모든 워커의 노드가 TSID_NODE_BITS 안에 들어가야 합니다."""
+    from .ids import TSID_NODE_BITS
+
+    nodes = 1 << TSID_NODE_BITS
+    if workers > nodes:
+        raise SystemExit(f"{workers} workers need more TSID nodes than TSID_NODE_BITS={TSID_NODE_BITS} allows.")
+
+    configured = os.getenv("TSID_NODE")
+    if configured is None:
+        base = random.randrange(nodes - workers + 1)
+        print(f"[serve] TSID_NODE is not set; using random TSID nodes {base}..{base + workers - 1}.")
+        return base
+
+    base = int(configured)
+    if not 0 <= base <= nodes - workers:
+        raise SystemExit(
+            f"TSID_NODE={base} with {workers} workers does not fit in TSID_NODE_BITS={TSID_NODE_BITS}."
+        )
+    return base
+
+
+def _configure_node(node: int):
+    from .ids import configure_id_generator
+
+    configure_id_generator(node)
+
+
+def _run_worker(index: int, node: int, sockets, options: dict):
+    os.environ["WORKER_INDEX"] = str(index)
+    _configure_node(node)
+    config = uvicorn.Config(APP, **options)
+    uvicorn.Server(config).run(sockets=sockets)
+
+
+class WorkerSupervisor:
+    """워커를 띄우고, 비정상 종료한 워커는 같은 번호(같은 TSID 노드)로 다시 띄웁니다."""
+    def __init__(self, workers: int, options: dict, node_base: int, graceful_timeout: float):
+        self.workers = workers
+        self.options = options
+        self.node_base = node_base
+        self.graceful_timeout = graceful_timeout
+        self._processes: Dict[int, multiprocessing.Process] = {}
+        self._should_exit = threading.Event()
+
+    def _start(self, index: int, sockets: List):
+        process = _spawn.Process(
+            target=_run_worker,
+            args=(index, self.node_base + index, sockets, self.options),
+            name=f"review-worker-{index}",
+        )
+        process.start()
+        self._processes[index] = process
+
+    def _handle_exit(self, signum, frame):
+        self._should_exit.set()
+
+    def run(self):
+        config = uvicorn.Config(APP, **self.options)
+        sockets = [config.bind_socket()]
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            signal.signal(signum, self._handle_exit)
+
+        print(f"[serve] Starting {self.workers} workers on {self.options['host']}:{self.options['port']}")
+        for index in range(self.workers):
+            self._start(index, sockets)
+
+        while not self._should_exit.wait(WORKER_RESTART_DELAY):
+            for index, process in list(self._processes.items()):
+                if not process.is_alive():
+                    print(f"[serve] Worker {index} exited with {process.exitcode}; restarting.")
+                    self._start(index, sockets)
+
+        print("[serve] Shutting down workers...")
+        for process in self._processes.values():
+            if process.is_alive():
+                process.terminate()  # SIGTERM: 워커가 처리 중인 요청을 마치고 종료합니다.
+        for process in self._processes.values():
+            process.join(self.graceful_timeout + 10)
+            if process.is_alive():
+                process.kill()
+                process.join()
+        for sock in sockets:
+            sock.close()
+
+
+def main(argv=None):
+    args = _parse_args(argv)
+    workers = max(1, args.workers)
+    # 워커가 import할 때 풀/채널 예산을 워커 수로 나눌 수 있도록 먼저 정합니다.
+    os.environ["WEB_CONCURRENCY"] = str(workers)
+    node_base = _node_base(workers)
+
+    options = _uvicorn_options(args)
+    if workers == 1:
+        _configure_node(node_base)
+        uvicorn.run(APP, **options)
+        return
+
+    _prepare_schema_once()
+    WorkerSupervisor(workers, options, node_base, args.graceful_timeout).run()
+
+
+if __name__ == "__main__":
+    main()
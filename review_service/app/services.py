@@ -1,7 +1,12 @@
+from collections import defaultdict
+from typing import Any, List, Optional
+
+from pydantic import ValidationError
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from . import schemas, crud, models
-from .messaging.bus import MessageBus
+from .cache import review_cache
+from .idempotency import IdempotencyRecord
 
 def define_review_type(data: dict) -> models.ReviewType:
     if not data.get("comment"):
@@ -14,8 +19,8 @@ def define_review_type(data: dict) -> models.ReviewType:
 
 async def create_review(
     db: AsyncSession,
-    bus: MessageBus,
     review_request: schemas.ReviewCreateRequest,
+    idempotency: Optional[IdempotencyRecord] = None,
     ) -> models.Review:
     
     review_type = define_review_type(review_request.model_dump())
@@ -26,21 +31,87 @@ async def create_review(
     )
     
     created_review = await crud.create_review(db=db, review=internal_review_data)
+    await crud.adjust_rating_stats(db, created_review.product_id, added_ratings=[created_review.rating])
 
     event = schemas.ReviewEvent(
         event_type="review.created",
         review=schemas.ReviewRead.model_validate(created_review)
     )
-    await bus.publish(topic="review.created", message=event)
+    crud.add_outbox_events(db, topic="review.created", events=[event])
+    if idempotency is not None:
+        # 응답을 같은 트랜잭션에 기록해 재시도가 리뷰를 두 번 만들지 않게 합니다.
+        crud.add_idempotency_key(
+            db,
+            key=idempotency.key,
+            request_hash=idempotency.request_hash,
+            status_code=201,
+            response_body=event.review.model_dump_json(),
+            expires_at=idempotency.expires_at,
+        )
+    await db.commit()
     
     return created_review
 
+async def create_reviews(
+    db: AsyncSession,
+    items: List[Any],
+    ) -> schemas.ReviewBatchResult:
+    """
+    여러 리뷰를 한 번에 생성합니다.
+    항목별로 검증하여 실패한 항목만 결과에 에러로 남기고, 나머지는 일괄 INSERT 후
+    review.created 이벤트를 같은 트랜잭션에서 아웃박스에 기록합니다.
+    """
+    results: List[schemas.ReviewBatchItemResult] = []
+    valid_indexes: List[int] = []
+    internal_reviews: List[schemas.ReviewCreateInternal] = []
+
+    for index, item in enumerate(items):
+        try:
+            review_request = schemas.ReviewCreateRequest.model_validate(item)
+        except ValidationError as e:
+            results.append(schemas.ReviewBatchItemResult(
+                index=index,
+                success=False,
+                error=str(e.errors(include_url=False, include_input=False)),
+            ))
+            continue
+
+        request_data = review_request.model_dump()
+        internal_reviews.append(schemas.ReviewCreateInternal(
+            **request_data,
+            review_type=define_review_type(request_data),
+        ))
+        valid_indexes.append(index)
+
+    created_reviews = await crud.create_reviews(db=db, reviews=internal_reviews)
+
+    events = []
+    for index, created_review in zip(valid_indexes, created_reviews):
+        review_read = schemas.ReviewRead.model_validate(created_review)
+        events.append(schemas.ReviewEvent(event_type="review.created", review=review_read))
+        results.append(schemas.ReviewBatchItemResult(index=index, success=True, review=review_read))
+
+    ratings_by_product = defaultdict(list)
+    for created_review in created_reviews:
+        ratings_by_product[created_review.product_id].append(created_review.rating)
+    for product_id, ratings in ratings_by_product.items():
+        await crud.adjust_rating_stats(db, product_id, added_ratings=ratings)
+
+    crud.add_outbox_events(db, topic="review.created", events=events)
+    await db.commit()
+
+    results.sort(key=lambda result: result.index)
+    return schemas.ReviewBatchResult(
+        created=len(created_reviews),
+        failed=len(items) - len(created_reviews),
+        results=results,
+    )
+
 async def update_review(
     db: AsyncSession, 
-    bus: MessageBus,
     review_id: int, 
     review_update: schemas.ReviewUpdateRequest,
-    ) -> models.Review:
+    ) -> Optional[models.Review]:
     
     update_data_dict = review_update.model_dump(exclude_unset=True)
     review_type = define_review_type(update_data_dict)
@@ -50,13 +121,74 @@ async def update_review(
         review_type=review_type
     )
     
-    updated_review = await crud.update_review(db=db, review_id=review_id, review_update=internal_review_data)
+    updated = await crud.update_review(db=db, review_id=review_id, review_update=internal_review_data)
+    if updated is None:
+        return None
 
-    if updated_review:
-        event = schemas.ReviewEvent(
-            event_type="review.updated",
-            review=schemas.ReviewRead.model_validate(updated_review)
+    updated_review, previous_rating = updated
+    if updated_review.rating != previous_rating:
+        await crud.adjust_rating_stats(
+            db,
+            updated_review.product_id,
+            added_ratings=[updated_review.rating],
+            removed_ratings=[previous_rating],
         )
-        await bus.publish(topic="review.updated", message=event)
+
+    event = schemas.ReviewEvent(
+        event_type="review.updated",
+        review=schemas.ReviewRead.model_validate(updated_review)
+    )
+    crud.add_outbox_events(db, topic="review.updated", events=[event])
+    await db.commit()
+    review_cache.invalidate(review_id)
         
-    return updated_review
\ No newline at end of file
+    return updated_review
+
+def _review_events(event_type: str, rows) -> List[schemas.ReviewEvent]:
+    return [schemas.ReviewEvent(event_type=event_type, review=schemas.ReviewRead.model_validate(row)) for row in rows]
+
+async def delete_reviews_chunk(
+    db: AsyncSession,
+    product_id: Optional[str] = None,
+    user_id: Optional[str] = None,
+    chunk_size: int = crud.MODERATION_CHUNK_SIZE,
+    ) -> int:
+    """
+    조건에 맞는 리뷰를 한 chunk만큼 삭제하고, 평점 요약 차감과 review.deleted 이벤트를
+    같은 트랜잭션에 기록합니다. 삭제한 개수를 반환합니다.
+    """
+    deleted = await crud.delete_reviews_chunk(db, product_id=product_id, user_id=user_id, chunk_size=chunk_size)
+    if not deleted:
+        return 0
+
+    ratings_by_product = defaultdict(list)
+    for row in deleted:
+        ratings_by_product[row.product_id].append(row.rating)
+    for deleted_product_id, ratings in ratings_by_product.items():
+        await crud.adjust_rating_stats(db, deleted_product_id, removed_ratings=ratings)
+
+    crud.add_outbox_events(db, topic="review.deleted", events=_review_events("review.deleted", deleted))
+    await db.commit()
+    for row in deleted:
+        review_cache.invalidate(row.id)
+    return len(deleted)
+
+async def retype_reviews_chunk(
+    db: AsyncSession,
+    review_type: models.ReviewType,
+    product_id: Optional[str] = None,
+    user_id: Optional[str] = None,
+    chunk_size: int = crud.MODERATION_CHUNK_SIZE,
+    ) -> int:
+    """조건에 맞는 리뷰의 유형을 한 chunk만큼 바꾸고 review.updated 이벤트를 기록합니다."""
+    updated = await crud.retype_reviews_chunk(
+        db, review_type=review_type, product_id=product_id, user_id=user_id, chunk_size=chunk_size,
+    )
+    if not updated:
+        return 0
+
+    crud.add_outbox_events(db, topic="review.updated", events=_review_events("review.updated", updated))
+    await db.commit()
+    for row in updated:
+        review_cache.invalidate(row.id)
+    return len(updated)
@@ -8,9 +8,12 @@ from httpx import ASGITransport
 from pydantic import BaseModel
 
 # We need the actual message_bus instance and its dependency getter
+from app.admin import get_admin_token
 from app.messaging.bus import MessageBus, get_message_bus
-from app.database import Base, get_db
+from app.database import Base, get_db, get_read_db
 from app.main import app
+from app.messaging.outbox import OutboxRelay
+from app.moderation import ModerationJobs, get_moderation_jobs
 
 class FakeMessageBus(MessageBus):
     """테스트용 가짜 메시지 버스. 메시지를 보내는 척하고 내부에 저장만 합니다."""
@@ -27,6 +30,10 @@ class FakeMessageBus(MessageBus):
         print(f"Fake bus captured message on topic '{topic}'")
         self.messages.append(message)
 
+    async def publish_many(self, topic: str, messages: List[BaseModel]):
+        print(f"Fake bus captured {len(messages)} messages on topic '{topic}'")
+        self.messages.extend(messages)
+
 TEST_DATABASE_URL = "sqlite+aiosqlite:///:memory:"
 
 engine = create_async_engine(TEST_DATABASE_URL)
@@ -52,6 +59,22 @@ async def bus() -> FakeMessageBus:
     """FakeMessageBus 인스턴스를 제공하는 픽스처."""
     return FakeMessageBus()
 
+@pytest_asyncio.fixture(scope="function")
+async def outbox_relay(db_engine, bus: FakeMessageBus) -> OutboxRelay:
+    """테스트 DB의 아웃박스를 FakeMessageBus로 발행하는 릴레이."""
+    return OutboxRelay(TestingSessionLocal, bus)
+
+@pytest_asyncio.fixture(scope="function")
+async def moderation_jobs(db_engine) -> AsyncGenerator[ModerationJobs, None]:
+    """테스트 DB에서 작은 chunk로 실행되고, 테스트 토큰으로 인증되는 일괄 처리 작업 관리자."""
+    jobs = ModerationJobs(TestingSessionLocal, chunk_size=2)
+    app.dependency_overrides[get_moderation_jobs] = lambda: jobs
+    app.dependency_overrides[get_admin_token] = lambda: "test-admin-token"
+    yield jobs
+    await jobs.cancel_all()
+    app.dependency_overrides.pop(get_moderation_jobs, None)
+    app.dependency_overrides.pop(get_admin_token, None)
+
 @pytest_asyncio.fixture(scope="function")
 async def client(db_session: AsyncSession, bus: FakeMessageBus) -> AsyncGenerator[httpx.AsyncClient, None]:
     """DB와 Bus 의존성이 모두 오버라이드된 테스트 클라이언트를 생성합니다."""
@@ -63,6 +86,7 @@ async def client(db_session: AsyncSession, bus: FakeMessageBus) -> AsyncGenerato
         return bus
 
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_read_db] = override_get_db
     app.dependency_overrides[get_message_bus] = override_get_bus
 
     async with httpx.AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as c:
@@ -0,0 +1,107 @@
+# tests/test_admission.py
+import asyncio
+
+import httpx
+import pytest
+from httpx import ASGITransport
+from starlette.applications import Starlette
+from starlette.responses import PlainTextResponse
+from starlette.routing import Route
+
+from app.admission import (
+    REJECTED_QUEUE_FULL,
+    REJECTED_TIMEOUT,
+    AdmissionConfigurationError,
+    AdmissionControlMiddleware,
+    ConcurrencyLimiter,
+    admission_limits,
+)
+from app.database import pool_capacity
+from service_observability.metrics import MetricsRegistry
+
+pytestmark = pytest.mark.asyncio
+
+async def test_limiter_queues_then_rejects():
+    """Test that the limiter admits up to the limit, queues up to max_queue and rejects the rest."""
+    limiter = ConcurrencyLimiter(limit=1, max_queue=1, queue_timeout=0.05)
+    assert await limiter.acquire() is None
+
+    waiter = asyncio.create_task(limiter.acquire())
+    await asyncio.sleep(0)
+    assert limiter.waiting == 1
+    assert await limiter.acquire() == REJECTED_QUEUE_FULL
+
+    limiter.release()
+    assert await waiter is None
+    assert (limiter.active, limiter.waiting) == (1, 0)
+
+    assert await limiter.acquire() == REJECTED_TIMEOUT
+    limiter.release()
+    assert limiter.active == 0
+
+async def test_default_limits_fit_the_worker_pool():
+    """Test that unset limits are derived so admitted requests never outnumber the worker's pool."""
+    shared = admission_limits(12, 12, shared_pool=True, read_concurrency=None, write_concurrency=None)
+    assert (shared["read"][0], shared["write"][0]) == (8, 4)
+
+    separate = admission_limits(5, 20, shared_pool=False, read_concurrency=None, write_concurrency=None)
+    assert (separate["read"][0], separate["write"][0]) == (20, 5)
+
+    explicit_read = admission_limits(12, 12, shared_pool=True, read_concurrency="10", write_concurrency=None)
+    assert (explicit_read["read"][0], explicit_read["write"][0]) == (10, 2)
+
+    # 예산을 워커 수로 나눈 고정 풀, 예산이 없으면 SQLAlchemy 기본 풀(5 + 10)입니다.
+    assert pool_capacity("postgresql+asyncpg://u:p@db/review_db", 40, workers=4) == 10
+    assert pool_capacity("postgresql+asyncpg://u:p@db/review_db", None, workers=4) == 15
+    assert pool_capacity("sqlite+aiosqlite:///./test.db", 40, workers=4) is None
+
+async def test_limits_larger_than_the_pool_are_refused():
+    """Test that explicit limits exceeding the per-worker pool fail at startup."""
+    with pytest.raises(AdmissionConfigurationError, match="pool size \\(10\\)"):
+        admission_limits(10, 10, shared_pool=True, read_concurrency="8", write_concurrency="4")
+    with pytest.raises(AdmissionConfigurationError, match="ADMISSION_WRITE_CONCURRENCY"):
+        admission_limits(5, 20, shared_pool=False, read_concurrency="20", write_concurrency="6")
+
+    # SQLite처럼 풀에 상한이 없으면 지정한 값을 그대로 씁니다.
+    unbounded = admission_limits(None, None, shared_pool=True, read_concurrency="100", write_concurrency=None)
+    assert unbounded["read"][0] == 100
+
+async def test_middleware_returns_503_with_retry_after_when_saturated():
+    """Test that saturated writes fail fast while reads and exempt paths keep working."""
+    release = asyncio.Event()
+
+    async def slow_write(request):
+        await release.wait()
+        return PlainTextResponse("written")
+
+    async def read(request):
+        return PlainTextResponse("read")
+
+    inner = Starlette(routes=[
+        Route("/reviews/", slow_write, methods=["POST"]),
+        Route("/reviews/", read, methods=["GET"]),
+        Route("/metrics", read, methods=["GET"]),
+    ])
+    registry = MetricsRegistry()
+    app = AdmissionControlMiddleware(
+        inner, limits={"read": (1, 0), "write": (1, 0)}, queue_timeout=0.05, retry_after=3, registry=registry,
+    )
+
+    async with httpx.AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        in_flight = asyncio.create_task(client.post("/reviews/"))
+        while app.limiters["write"].active == 0:
+            await asyncio.sleep(0)
+
+        rejected = await client.post("/reviews/")
+        assert rejected.status_code == 503
+        assert rejected.headers["retry-after"] == "3"
+
+        assert (await client.get("/reviews/")).status_code == 200
+        assert (await client.post("/metrics")).status_code != 503
+
+        release.set()
+        assert (await in_flight).status_code == 200
+
+    rendered = registry.render()
+    assert 'admission_rejections_total{endpoint_class="write",reason="queue_full"} 1' in rendered
+    assert 'admission_queue_depth{endpoint_class="write"} 0' in rendered
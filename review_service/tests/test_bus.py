@@ -0,0 +1,58 @@
+# tests/test_bus.py
+import asyncio
+import itertools
+
+import pytest
+
+from app.messaging.bus import PUBLISH_DURATION, PUBLISHED_MESSAGES, RabbitMQBus
+from app.schemas import ReviewEvent
+
+pytestmark = pytest.mark.asyncio
+
+class SlowConfirmExchange:
+    """브로커 confirm이 늦게 도착하는 것을 흉내 내며 동시 in-flight 수를 기록합니다."""
+    def __init__(self):
+        self.routing_keys = []
+        self.bodies = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def publish(self, message, routing_key):
+        self.routing_keys.append(routing_key)
+        self.bodies.append(message.body)
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(0.01)
+        self.in_flight -= 1
+
+def make_event(index: int) -> ReviewEvent:
+    return ReviewEvent.model_validate({
+        "event_type": "review.created",
+        "review": {
+            "id": str(index), "product_id": "PROD-001", "user_id": "USER-001",
+            "rating": 5, "review_type": "RATING", "created_at": "2025-01-01T00:00:00Z",
+        },
+    })
+
+async def test_publish_many_pipelines_within_in_flight_window():
+    """Test that publish_many overlaps confirms, bounded by max_in_flight, in order."""
+    bus = RabbitMQBus("amqp://unused", max_in_flight=4)
+    exchange = SlowConfirmExchange()
+    bus._exchanges = itertools.cycle([exchange])
+    bus._in_flight = asyncio.Semaphore(4)
+
+    events = [make_event(i) for i in range(10)]
+    published_before = PUBLISHED_MESSAGES.value(topic="review.created")
+    await bus.publish_many("review.created", events)
+
+    assert exchange.max_in_flight == 4
+    assert exchange.routing_keys == ["review.created"] * 10
+    assert exchange.bodies == [event.model_dump_json().encode() for event in events]
+    assert PUBLISHED_MESSAGES.value(topic="review.created") == published_before + 10
+    assert PUBLISH_DURATION.count(operation="publish_many", topic="review.created") >= 1
+
+async def test_publish_requires_connection():
+    """Test that publishing before connect fails loudly."""
+    bus = RabbitMQBus("amqp://unused")
+    with pytest.raises(RuntimeError, match="Bus is not connected."):
+        await bus.publish("review.created", make_event(1))
@@ -0,0 +1,65 @@
+# tests/test_cache.py
+import asyncio
+
+import pytest
+from httpx import AsyncClient
+
+from app.cache import AsyncLRUCache
+
+pytestmark = pytest.mark.asyncio
+
+async def test_concurrent_misses_share_one_load():
+    """Test that concurrent misses for the same key coalesce into one loader call."""
+    cache = AsyncLRUCache(maxsize=10, ttl=60)
+    calls = 0
+
+    async def loader():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return "value"
+
+    results = await asyncio.gather(*(cache.get_or_load("key", loader) for _ in range(10)))
+    assert results == ["value"] * 10
+    assert calls == 1
+    assert cache.get("key") == "value"
+
+async def test_lru_eviction_and_ttl_expiry():
+    """Test that the cache stays size-bounded and drops expired entries."""
+    cache = AsyncLRUCache(maxsize=2, ttl=0.01)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    await asyncio.sleep(0.02)
+    assert cache.get("a") is None
+
+async def test_invalidate_during_load_is_not_cached():
+    """Test that a load finishing after invalidation does not repopulate stale data."""
+    cache = AsyncLRUCache(maxsize=10, ttl=60)
+
+    async def loader():
+        cache.invalidate("key")
+        return "stale"
+
+    assert await cache.get_or_load("key", loader) == "stale"
+    assert cache.get("key") is None
+
+async def test_read_review_etag_and_invalidation(client: AsyncClient):
+    """Test ETag/304 handling and that updates invalidate the cached review."""
+    review_id = (await client.post("/reviews/", json={"rating": 4, "comment": "Cached"})).json()["id"]
+
+    first = await client.get(f"/reviews/{review_id}")
+    etag = first.headers["ETag"]
+    not_modified = await client.get(f"/reviews/{review_id}", headers={"If-None-Match": etag})
+    assert not_modified.status_code == 304
+    assert not_modified.headers["ETag"] == etag
+
+    await client.put(f"/reviews/{review_id}", json={"rating": 1, "comment": "Changed"})
+
+    updated = await client.get(f"/reviews/{review_id}", headers={"If-None-Match": etag})
+    assert updated.status_code == 200
+    assert updated.json()["rating"] == 1
+    assert updated.headers["ETag"] != etag
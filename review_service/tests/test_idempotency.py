@@ -0,0 +1,74 @@
+# tests/test_idempotency.py
+import asyncio
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import func, select
+
+from app.idempotency import IDEMPOTENT_REPLAYED_HEADER, idempotency_store
+from app.models import OutboxEvent, Review
+
+pytestmark = pytest.mark.asyncio
+
+async def _count_reviews(db_session, comment: str) -> int:
+    return (await db_session.execute(
+        select(func.count()).select_from(Review).filter(Review.comment == comment)
+    )).scalar_one()
+
+async def test_retry_with_same_key_replays_first_response(client: AsyncClient, db_session):
+    """Test that a retried POST returns the stored response without creating another review."""
+    payload = {"rating": 5, "comment": "Idempotent retry"}
+    headers = {"Idempotency-Key": "retry-key-1"}
+
+    first = await client.post("/reviews/", json=payload, headers=headers)
+    assert first.status_code == 201
+    assert IDEMPOTENT_REPLAYED_HEADER not in first.headers
+
+    second = await client.post("/reviews/", json=payload, headers=headers)
+    assert second.status_code == 201
+    assert second.headers[IDEMPOTENT_REPLAYED_HEADER] == "true"
+    assert second.json() == first.json()
+
+    # 다른 프로세스처럼 앞단 캐시가 비어 있어도 DB에 저장된 응답을 돌려줍니다.
+    idempotency_store.clear_cache()
+    third = await client.post("/reviews/", json=payload, headers=headers)
+    assert third.json() == first.json()
+
+    assert await _count_reviews(db_session, "Idempotent retry") == 1
+    outbox_events = (await db_session.execute(
+        select(OutboxEvent).filter(OutboxEvent.payload.contains(str(first.json()["id"])))
+    )).scalars().all()
+    assert len(outbox_events) == 1
+
+async def test_same_key_with_different_body_is_rejected(client: AsyncClient):
+    """Test that reusing a key for a different request is a client error."""
+    headers = {"Idempotency-Key": "retry-key-2"}
+    assert (await client.post("/reviews/", json={"rating": 1, "comment": "A"}, headers=headers)).status_code == 201
+
+    response = await client.post("/reviews/", json={"rating": 2, "comment": "B"}, headers=headers)
+    assert response.status_code == 409
+
+async def test_concurrent_duplicates_wait_for_first_request(client: AsyncClient, db_session):
+    """Test that concurrent requests with the same key produce a single review."""
+    payload = {"rating": 3, "comment": "Idempotent concurrent"}
+    headers = {"Idempotency-Key": "retry-key-3"}
+
+    responses = await asyncio.gather(*(client.post("/reviews/", json=payload, headers=headers) for _ in range(5)))
+
+    assert {r.status_code for r in responses} == {201}
+    assert len({r.json()["id"] for r in responses}) == 1
+    assert sum(IDEMPOTENT_REPLAYED_HEADER in r.headers for r in responses) == 4
+    assert await _count_reviews(db_session, "Idempotent concurrent") == 1
+
+async def test_expired_key_runs_request_again(client: AsyncClient, db_session, monkeypatch):
+    """Test that an expired key no longer replays and is purged."""
+    payload = {"rating": 4, "comment": "Idempotent expired"}
+    headers = {"Idempotency-Key": "retry-key-4"}
+
+    monkeypatch.setattr(idempotency_store, "ttl", -1)
+    first = await client.post("/reviews/", json=payload, headers=headers)
+    second = await client.post("/reviews/", json=payload, headers=headers)
+
+    assert IDEMPOTENT_REPLAYED_HEADER not in second.headers
+    assert second.json()["id"] != first.json()["id"]
+    assert await _count_reviews(db_session, "Idempotent expired") == 2
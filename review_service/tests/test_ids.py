@@ -0,0 +1,76 @@
+# tests/test_ids.py
+import threading
+
+import pytest
+from tsidpy import TSID
+
+from app import ids
+from app.ids import IdGenerator
+
+COUNTER_BITS_MASK = (1 << 22) - 1
+
+def _node_of(generated_id: int, node_bits: int) -> int:
+    return (generated_id & COUNTER_BITS_MASK) >> (22 - node_bits)
+
+def test_ids_are_monotonic_and_carry_the_node():
+    """Test that ids from one generator strictly increase and embed the configured node."""
+    generator = IdGenerator(node=5, node_bits=10)
+    ids = [generator.next_id() for _ in range(10_000)]
+
+    assert ids == sorted(set(ids))
+    assert {_node_of(i, 10) for i in ids} == {5}
+    assert abs(TSID(ids[-1]).timestamp - TSID(ids[0]).timestamp) < 5_000
+
+def test_counter_overflow_borrows_next_millisecond():
+    """Test that exhausting the per-millisecond counter keeps ids unique and ordered."""
+    generator = IdGenerator(node=1, node_bits=20)  # 밀리초당 4개
+    ids = generator.allocate(50) + [generator.next_id() for _ in range(50)]
+
+    assert ids == sorted(set(ids))
+    assert len({TSID(i).timestamp for i in ids}) >= 25
+
+def test_allocate_returns_a_contiguous_increasing_block():
+    """Test that block allocation interleaves correctly with single ids."""
+    generator = IdGenerator(node=3, node_bits=10)
+    before = generator.next_id()
+    block = generator.allocate(5_000)
+    after = generator.next_id()
+
+    assert before < block[0] and block[-1] < after
+    assert block == sorted(set(block))
+    assert len(block) == 5_000
+
+def test_no_collisions_across_simulated_workers():
+    """Test that workers with distinct node ids never produce the same id, even concurrently."""
+    workers = [IdGenerator(node=node, node_bits=10) for node in range(8)]
+    results = [[] for _ in workers]
+
+    def run(index: int):
+        generator = workers[index]
+        for _ in range(200):
+            results[index].extend(generator.allocate(10))
+            results[index].append(generator.next_id())
+
+    threads = [threading.Thread(target=run, args=(i,)) for i in range(len(workers))]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    all_ids = [i for ids in results for i in ids]
+    assert len(all_ids) == len(set(all_ids)) == 8 * 200 * 11
+    for ids in results:
+        assert ids == sorted(ids)
+
+def test_invalid_node_is_rejected():
+    """Test that a node id wider than node_bits is refused instead of silently truncated."""
+    with pytest.raises(ValueError):
+        IdGenerator(node=1024, node_bits=10)
+
+def test_configure_id_generator_switches_the_node_for_next_id(monkeypatch):
+    """Test that a worker's configured node is used by the module-level id functions."""
+    monkeypatch.setattr(ids, "id_generator", ids.id_generator)
+    ids.configure_id_generator(7, node_bits=10)
+
+    assert _node_of(ids.next_id(), 10) == 7
+    assert {_node_of(i, 10) for i in ids.allocate_ids(3)} == {7}
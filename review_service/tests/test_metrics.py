@@ -0,0 +1,59 @@
+# tests/test_metrics.py
+import logging
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from service_observability.database import fingerprint_statement, instrument_engine
+from service_observability.metrics import MetricsRegistry
+
+def test_fingerprint_collapses_literals_and_lists():
+    """Test that statements differing only in values share one fingerprint."""
+    assert fingerprint_statement("SELECT * FROM reviews WHERE id IN (?, ?, ?)") == \
+        fingerprint_statement("SELECT * FROM reviews WHERE id IN (?)")
+    assert fingerprint_statement("INSERT INTO t (a, b) VALUES ($1::INTEGER, $2), ($3, $4)") == \
+        fingerprint_statement("INSERT INTO t (a, b) VALUES ($1, $2)")
+    assert fingerprint_statement("SELECT 1 WHERE name = 'x'") == fingerprint_statement("SELECT 2 WHERE name = 'y'")
+
+
+@pytest.mark.asyncio
+async def test_instrumented_engine_records_latency_pool_wait_and_slow_queries(caplog):
+    """Test that engine and pool events feed the registry and the slow query log."""
+    registry = MetricsRegistry()
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    instrument_engine(engine, registry=registry, slow_query_ms=0)
+
+    with caplog.at_level(logging.WARNING, logger="app.db.slow_query"):
+        async with engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+            await conn.execute(text("SELECT 2"))
+            with pytest.raises(Exception):
+                await conn.execute(text("SELECT * FROM missing_table"))
+    await engine.dispose()
+
+    rendered = registry.render()
+    assert 'db_query_duration_seconds_count{database=":memory:",fingerprint="SELECT ?"} 2.0' in rendered
+    assert 'db_query_errors_total{database=":memory:",fingerprint="SELECT * FROM missing_table"} 1.0' in rendered
+    assert 'db_pool_checkout_wait_seconds_count{database=":memory:"} 1.0' in rendered
+    assert any('"event": "slow_query"' in record.getMessage() for record in caplog.records)
+
+@pytest.mark.asyncio
+async def test_metrics_endpoint(client: AsyncClient):
+    """Test that /metrics serves the Prometheus text format."""
+    response = await client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+
+@pytest.mark.asyncio
+async def test_http_metrics_use_route_templates(client: AsyncClient):
+    """Test that request metrics are labelled by route template, not by raw path."""
+    await client.get("/reviews/1")
+    await client.get("/reviews/2")
+
+    body = (await client.get("/metrics")).text
+    assert 'http_requests_total{method="GET",route="/reviews/{review_id}",status_code="404"}' in body
+    assert 'http_request_duration_seconds_count{method="GET",route="/reviews/{review_id}"}' in body
+    assert 'http_requests_in_flight{method="GET",route="/reviews/{review_id}"} 0.0' in body
+    assert 'route="/reviews/1"' not in body
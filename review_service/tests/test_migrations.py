@@ -0,0 +1,88 @@
+# tests/test_migrations.py
+import pytest
+from sqlalchemy import inspect
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app import schema
+
+pytestmark = pytest.mark.asyncio
+
+# 버전 기록을 시작하기 전, 처음 배포된 reviews 테이블
+BASELINE_DDL = [
+    """
+    CREATE TABLE reviews (
+        id BIGINT NOT NULL,
+        product_id VARCHAR NOT NULL,
+        user_id VARCHAR NOT NULL,
+        rating INTEGER NOT NULL,
+        comment TEXT,
+        review_type VARCHAR(6) NOT NULL,
+        created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+        updated_at DATETIME,
+        PRIMARY KEY (id)
+    )
+    """,
+    "CREATE INDEX ix_reviews_product_id ON reviews (product_id)",
+    "CREATE INDEX ix_reviews_user_id ON reviews (user_id)",
+    """
+    INSERT INTO reviews (id, product_id, user_id, rating, comment, review_type) VALUES
+        (1, 'PROD-A', 'USER-1', 5, 'legacy great', 'NORMAL'),
+        (2, 'PROD-A', 'USER-2', 3, 'legacy fine', 'NORMAL'),
+        (3, 'PROD-B', 'USER-1', 1, NULL, 'RATING')
+    """,
+]
+
+def _describe(sync_conn) -> dict:
+    inspector = inspect(sync_conn)
+    return {
+        table: (
+            sorted((c["name"], str(c["type"]), c["nullable"]) for c in inspector.get_columns(table)),
+            sorted(index["name"] for index in inspector.get_indexes(table)),
+        )
+        for table in inspector.get_table_names()
+    }
+
+async def _engine(tmp_path, name: str):
+    return create_async_engine(f"sqlite+aiosqlite:///{tmp_path / name}.db")
+
+async def test_migrations_from_baseline_match_create_all(tmp_path):
+    """Test that migrating the first deployed schema yields exactly what create_all builds today."""
+    migrated, created = await _engine(tmp_path, "migrated"), await _engine(tmp_path, "created")
+    try:
+        async with migrated.begin() as conn:
+            for statement in BASELINE_DDL:
+                await conn.exec_driver_sql(statement)
+        assert await schema.migrate_schema(migrated) == schema.SCHEMA_VERSION
+        await schema.create_schema(created)
+
+        async with migrated.connect() as a, created.connect() as b:
+            assert await a.run_sync(_describe) == await b.run_sync(_describe)
+            # 트리거가 생기기 전의 행도 검색됩니다.
+            hits = await a.exec_driver_sql("SELECT rowid FROM reviews_fts WHERE reviews_fts MATCH 'legacy'")
+            assert sorted(row[0] for row in hits) == [1, 2]
+            # 평점 요약은 기존 리뷰로 채워집니다.
+            stats = await a.exec_driver_sql(
+                "SELECT product_id, review_count, rating_sum, rating_1, rating_3, rating_5 FROM product_rating_stats"
+            )
+            assert sorted(tuple(row) for row in stats) == [("PROD-A", 2, 8, 0, 1, 1), ("PROD-B", 1, 1, 1, 0, 0)]
+        await schema.check_schema(migrated)
+        # 이미 최신이면 아무것도 하지 않습니다.
+        assert await schema.migrate_schema(migrated) == schema.SCHEMA_VERSION
+    finally:
+        await migrated.dispose()
+        await created.dispose()
+
+async def test_create_mode_does_not_stamp_an_existing_database(tmp_path):
+    """Test that create mode refuses an older database instead of marking it current."""
+    engine = await _engine(tmp_path, "existing")
+    try:
+        async with engine.begin() as conn:
+            for statement in BASELINE_DDL:
+                await conn.exec_driver_sql(statement)
+        with pytest.raises(schema.SchemaVersionError, match="migrate"):
+            await schema.prepare_schema(engine, mode="create")
+
+        async with engine.connect() as conn:
+            assert await schema._read_version(conn) is None
+    finally:
+        await engine.dispose()
@@ -0,0 +1,129 @@
+# tests/test_moderation.py
+import json
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import select
+
+from app import crud
+from app.main import app
+from app.models import OutboxEvent
+from app.moderation import JOB_RUNNING, JOB_STALE, ModerationJobs, get_moderation_jobs
+
+pytestmark = pytest.mark.asyncio
+
+ADMIN_HEADERS = {"x-admin-token": "test-admin-token"}
+
+async def _create_reviews(client: AsyncClient, count: int, **fields) -> list:
+    ids = []
+    for i in range(count):
+        response = await client.post("/reviews/", json={"rating": 4, "comment": f"Moderation {i}", **fields})
+        ids.append(response.json()["id"])
+    return ids
+
+async def _outbox_events(db_session, topic: str, review_ids) -> list:
+    db_session.expire_all()
+    rows = (await db_session.execute(select(OutboxEvent).filter(OutboxEvent.topic == topic))).scalars().all()
+    return [row for row in rows if json.loads(row.payload)["review"]["id"] in review_ids]
+
+def _set_returning(db_session, monkeypatch, returning: bool):
+    dialect = db_session.get_bind().dialect
+    for kind in ("update", "delete"):
+        monkeypatch.setattr(dialect, f"{kind}_returning", returning and getattr(dialect, f"{kind}_returning"))
+
+@pytest.mark.parametrize("returning", [True, False])
+async def test_bulk_delete_by_product_in_chunks(client: AsyncClient, moderation_jobs, db_session, monkeypatch, returning):
+    """Test that every review of a product is deleted chunk by chunk with events and stats."""
+    _set_returning(db_session, monkeypatch, returning)
+    product_id = f"PROD-MODERATION-DELETE-{returning}"
+    deleted_ids = await _create_reviews(client, 5, product_id=product_id)
+    kept_id = (await _create_reviews(client, 1, product_id=f"PROD-MODERATION-KEEP-{returning}"))[0]
+    # 캐시에 올라간 리뷰도 삭제 후에는 보이지 않아야 합니다.
+    assert (await client.get(f"/reviews/{deleted_ids[0]}")).status_code == 200
+
+    response = await client.post(
+        "/admin/reviews/moderation", json={"action": "delete", "product_id": product_id}, headers=ADMIN_HEADERS,
+    )
+    assert response.status_code == 202
+    job_id = response.json()["id"]
+    await moderation_jobs.wait(job_id)
+
+    job = (await client.get(f"/admin/moderation-jobs/{job_id}", headers=ADMIN_HEADERS)).json()
+    assert job["status"] == "completed"
+    assert (job["total"], job["processed"]) == (5, 5)
+
+    assert (await client.get(f"/reviews/{deleted_ids[0]}")).status_code == 404
+    assert (await client.get(f"/reviews/{kept_id}")).status_code == 200
+    assert (await client.get(f"/products/{product_id}/rating-stats")).json()["review_count"] == 0
+    assert len(await _outbox_events(db_session, "review.deleted", deleted_ids)) == 5
+
+@pytest.mark.parametrize("returning", [True, False])
+async def test_bulk_retype_by_user(client: AsyncClient, moderation_jobs, db_session, monkeypatch, returning):
+    """Test that re-typing touches only reviews that still need it and emits update events."""
+    _set_returning(db_session, monkeypatch, returning)
+    user_id = f"USER-MODERATION-RETYPE-{returning}"
+    review_ids = await _create_reviews(client, 3, user_id=user_id, photo_name="photo.jpg")
+
+    response = await client.post(
+        "/admin/reviews/moderation",
+        json={"action": "retype", "user_id": user_id, "review_type": "NORMAL"},
+        headers=ADMIN_HEADERS,
+    )
+    job_id = response.json()["id"]
+    await moderation_jobs.wait(job_id)
+
+    assert (await moderation_jobs.get(job_id)).processed == 3
+    reviews = (await client.get(f"/users/{user_id}/reviews")).json()
+    assert {review["review_type"] for review in reviews} == {"NORMAL"}
+    events = await _outbox_events(db_session, "review.updated", review_ids)
+    assert {json.loads(event.payload)["review"]["review_type"] for event in events} == {"NORMAL"}
+    assert len(events) == 3
+
+async def test_moderation_requires_admin_token_and_target(client: AsyncClient, moderation_jobs):
+    """Test that moderation is forbidden without the token and rejects unscoped requests."""
+    body = {"action": "delete", "product_id": "PROD-001"}
+    assert (await client.post("/admin/reviews/moderation", json=body)).status_code == 403
+
+    response = await client.post("/admin/reviews/moderation", json={"action": "delete"}, headers=ADMIN_HEADERS)
+    assert response.status_code == 422
+
+async def test_job_progress_is_visible_from_another_worker(client: AsyncClient, moderation_jobs):
+    """Test that a job submitted to one worker can be polled through another worker's job store."""
+    product_id = "PROD-MODERATION-OTHER-WORKER"
+    await _create_reviews(client, 3, product_id=product_id)
+    response = await client.post(
+        "/admin/reviews/moderation", json={"action": "delete", "product_id": product_id}, headers=ADMIN_HEADERS,
+    )
+    job_id = response.json()["id"]
+    await moderation_jobs.wait(job_id)
+
+    # 다른 워커는 같은 테이블을 읽는 별도의 작업 관리자를 가집니다.
+    other_worker = ModerationJobs(moderation_jobs.session_factory)
+    app.dependency_overrides[get_moderation_jobs] = lambda: other_worker
+    job = (await client.get(f"/admin/moderation-jobs/{job_id}", headers=ADMIN_HEADERS)).json()
+    assert (job["status"], job["processed"]) == ("completed", 3)
+    assert job_id in [j["id"] for j in (await client.get("/admin/moderation-jobs", headers=ADMIN_HEADERS)).json()]
+    assert (await client.get(f"/admin/moderation-jobs/{job_id + 1}", headers=ADMIN_HEADERS)).status_code == 404
+
+async def test_job_without_heartbeat_is_reported_stale(client: AsyncClient, moderation_jobs):
+    """Test that a running job whose worker stopped updating it is reported as stale until it progresses again."""
+    # 실행하던 워커가 한 시간 전에 죽은 작업
+    async with moderation_jobs.session_factory() as session:
+        job = await crud.create_moderation_job(
+            session, action="delete", product_id="PROD-MODERATION-STALE", status=JOB_RUNNING,
+            updated_at=datetime.now(timezone.utc) - timedelta(hours=1),
+        )
+        await session.commit()
+
+    response = await client.get(f"/admin/moderation-jobs/{job.id}", headers=ADMIN_HEADERS)
+    assert response.json()["status"] == JOB_STALE
+    listed = (await client.get("/admin/moderation-jobs", headers=ADMIN_HEADERS)).json()
+    assert [j["status"] for j in listed if j["id"] == job.id] == [JOB_STALE]
+
+    # chunk를 커밋하면 heartbeat가 갱신됩니다.
+    async with moderation_jobs.session_factory() as session:
+        await crud.update_moderation_job(session, job.id, processed_delta=1)
+        await session.commit()
+    response = await client.get(f"/admin/moderation-jobs/{job.id}", headers=ADMIN_HEADERS)
+    assert (response.json()["status"], response.json()["processed"]) == (JOB_RUNNING, 1)
@@ -0,0 +1,71 @@
+# tests/test_outbox.py
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import select
+
+from app import crud
+from app.messaging.outbox import OUTBOX_RETENTION
+from app.models import OutboxEvent
+
+pytestmark = pytest.mark.asyncio
+
+async def test_create_review_writes_outbox_instead_of_publishing(client: AsyncClient, bus, db_session):
+    """Test that the write path records the event without touching the bus."""
+    response = await client.post("/reviews/", json={"rating": 5, "comment": "Outbox"})
+    assert response.status_code == 201
+    review_id = response.json()["id"]
+
+    assert bus.messages == []
+    outbox_events = (await db_session.execute(
+        select(OutboxEvent).filter(OutboxEvent.payload.contains(review_id))
+    )).scalars().all()
+    assert len(outbox_events) == 1
+    assert outbox_events[0].topic == "review.created"
+    assert outbox_events[0].published_at is None
+
+async def test_relay_publishes_in_order_and_marks_rows(client: AsyncClient, bus, outbox_relay, db_session):
+    """Test that the relay drains the outbox in order and marks rows as published."""
+    create_response = await client.post("/reviews/", json={"rating": 1, "comment": "Relay"})
+    review_id = create_response.json()["id"]
+    await client.put(f"/reviews/{review_id}", json={"rating": 2, "comment": "Relay updated"})
+
+    assert await outbox_relay.drain() >= 2
+    assert await outbox_relay.run_once() == 0
+
+    events_for_review = [m.event_type for m in bus.messages if m.review.id == review_id]
+    assert events_for_review == ["review.created", "review.updated"]
+
+    db_session.expire_all()
+    unpublished = (await db_session.execute(
+        select(OutboxEvent).filter(OutboxEvent.published_at.is_(None))
+    )).scalars().all()
+    assert unpublished == []
+
+async def test_relay_skips_batch_while_another_relay_holds_the_lock(client: AsyncClient, bus, outbox_relay, monkeypatch):
+    """Test that a relay which loses the leader lock leaves the outbox for the active relay."""
+    await client.post("/reviews/", json={"rating": 4, "comment": "Follower"})
+
+    async def lock_held_elsewhere(db, lock_id):
+        return False
+
+    monkeypatch.setattr(crud, "try_lock_outbox_relay", lock_held_elsewhere)
+    assert await outbox_relay.run_once() == 0
+    assert bus.messages == []
+
+async def test_purge_deletes_only_published_rows_past_retention(client: AsyncClient, outbox_relay, db_session):
+    """Test that the retention purge removes old published rows and keeps unpublished ones."""
+    await client.post("/reviews/", json={"rating": 3, "comment": "Purge published"})
+    await outbox_relay.drain()
+    await client.post("/reviews/", json={"rating": 3, "comment": "Purge pending"})
+
+    # 보존 기간 안이면 남겨 둡니다.
+    assert await outbox_relay.purge_published() == 0
+
+    later = datetime.now(timezone.utc) + timedelta(seconds=OUTBOX_RETENTION + 60)
+    assert await outbox_relay.purge_published(now=later) >= 1
+
+    db_session.expire_all()
+    remaining = (await db_session.execute(select(OutboxEvent))).scalars().all()
+    assert [event.published_at for event in remaining] == [None]
@@ -0,0 +1,67 @@
+# tests/test_profiling.py
+import cProfile
+
+import pytest
+from httpx import AsyncClient
+
+from app.admin import get_admin_token, require_admin_token
+from app.main import app
+from app.observability.profiling import RequestProfiler, request_profiler
+
+pytestmark = pytest.mark.asyncio
+
+@pytest.fixture
+def admin_token(monkeypatch):
+    monkeypatch.setattr(request_profiler, "token", "secret")
+    monkeypatch.setattr(request_profiler, "sample_rate", 0.0)
+    # 상위 몇 줄만 남기면 이벤트 루프 함수에 밀려 핸들러가 빠질 수 있습니다.
+    monkeypatch.setattr(request_profiler, "stats_lines", 1000)
+    app.dependency_overrides[get_admin_token] = lambda: "secret"
+    request_profiler.clear()
+    yield "secret"
+    request_profiler.clear()
+    app.dependency_overrides.pop(get_admin_token, None)
+
+async def test_profile_header_captures_request(client: AsyncClient, admin_token):
+    """Test that an admin-authorized profile header profiles the request and the admin endpoints return it."""
+    await client.post("/reviews/", json={"rating": 5, "comment": "Profiled"})
+    await client.post("/reviews/", json={"rating": 5, "comment": "Profiled"}, headers={"X-Profile": "1"})
+    await client.post(
+        "/reviews/", json={"rating": 5, "comment": "Profiled"}, headers={"X-Profile": "1", "X-Admin-Token": "wrong"},
+    )
+    assert request_profiler.profiles() == []
+
+    headers = {"X-Admin-Token": admin_token}
+    await client.post("/reviews/", json={"rating": 5, "comment": "Profiled"}, headers={"X-Profile": "1", **headers})
+
+    summaries = (await client.get("/admin/profiles", headers=headers)).json()
+    assert len(summaries) == 1
+    assert summaries[0]["method"] == "POST"
+    assert summaries[0]["path"] == "/reviews/"
+    assert summaries[0]["status_code"] == 201
+
+    stats = await client.get(f"/admin/profiles/{summaries[0]['id']}", headers=headers)
+    assert stats.status_code == 200
+    assert "create_review" in stats.text
+
+async def test_profile_endpoints_require_token(client: AsyncClient, admin_token):
+    """Test that profiles are not exposed without the admin token."""
+    assert (await client.get("/admin/profiles")).status_code == 403
+    assert (await client.get("/admin/profiles", headers={"X-Admin-Token": "wrong"})).status_code == 403
+
+async def test_every_admin_route_requires_admin_token():
+    """Test that no /admin/* route is registered without the shared admin dependency."""
+    admin_routes = [route for route in app.routes if route.path.startswith("/admin/")]
+    assert admin_routes
+    for route in admin_routes:
+        assert require_admin_token in [dependency.call for dependency in route.dependant.dependencies], route.path
+
+async def test_profiler_keeps_only_slowest():
+    """Test that only the N slowest profiles are kept."""
+    profile = cProfile.Profile()
+    profile.runcall(sum, range(10))
+
+    profiler = RequestProfiler(keep=2)
+    for duration in (5.0, 1.0, 9.0, 3.0):
+        profiler.record(profile, "GET", "/", 200, started_at=0.0, duration_ms=duration)
+    assert [profile.duration_ms for profile in profiler.profiles()] == [9.0, 5.0]
@@ -0,0 +1,56 @@
+# tests/test_rating_stats.py
+import uuid
+
+import pytest
+from httpx import AsyncClient
+
+from app import crud
+
+pytestmark = pytest.mark.asyncio
+
+@pytest.mark.parametrize("returning", [True, False])
+async def test_rating_stats_follow_create_update_delete(client: AsyncClient, db_session, monkeypatch, returning):
+    """Test that the per-product summary is kept in sync by every write path."""
+    if not returning:
+        dialect = db_session.get_bind().dialect
+        for kind in ("insert", "update", "delete"):
+            monkeypatch.setattr(dialect, f"{kind}_returning", False)
+
+    product_id = f"PROD-{uuid.uuid4().hex[:8]}"
+
+    empty = (await client.get(f"/products/{product_id}/rating-stats")).json()
+    assert empty["review_count"] == 0
+    assert empty["average_rating"] is None
+
+    first = (await client.post("/reviews/", json={"product_id": product_id, "rating": 5})).json()
+    await client.post("/reviews/batch", json=[
+        {"product_id": product_id, "rating": 4},
+        {"product_id": product_id, "rating": 3},
+    ])
+
+    stats = (await client.get(f"/products/{product_id}/rating-stats")).json()
+    assert stats["review_count"] == 3
+    assert stats["average_rating"] == 4.0
+    assert stats["histogram"] == {"1": 0, "2": 0, "3": 1, "4": 1, "5": 1}
+
+    await client.put(f"/reviews/{first['id']}", json={"rating": 1})
+    stats = (await client.get(f"/products/{product_id}/rating-stats")).json()
+    assert stats["review_count"] == 3
+    assert stats["histogram"] == {"1": 1, "2": 0, "3": 1, "4": 1, "5": 0}
+
+    await client.delete(f"/reviews/{first['id']}")
+    stats = (await client.get(f"/products/{product_id}/rating-stats")).json()
+    assert stats["review_count"] == 2
+    assert stats["average_rating"] == 3.5
+    assert stats["histogram"] == {"1": 0, "2": 0, "3": 1, "4": 1, "5": 0}
+
+async def test_adjust_rating_stats_upserts_on_conflict(db_session):
+    """Test that a second delta for the same product updates the existing row in place."""
+    product_id = f"PROD-{uuid.uuid4().hex[:8]}"
+    await crud.adjust_rating_stats(db_session, product_id, added_ratings=[5, 4])
+    await crud.adjust_rating_stats(db_session, product_id, added_ratings=[2], removed_ratings=[5])
+    await db_session.commit()
+
+    stats = await crud.get_rating_stats(db_session, product_id)
+    assert (stats.review_count, stats.average_rating) == (2, 3.0)
+    assert stats.histogram == {1: 0, 2: 1, 3: 0, 4: 1, 5: 0}
@@ -0,0 +1,84 @@
+# tests/test_read_replica.py
+import httpx
+import pytest
+import pytest_asyncio
+from httpx import ASGITransport
+from sqlalchemy import insert, select
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from app import models
+from app.database import Base, READ_PRIMARY_HEADER, get_db, get_read_db, make_read_db_dependency
+from app.main import app
+
+pytestmark = pytest.mark.asyncio
+
+@pytest_asyncio.fixture
+async def replica_sessions(tmp_path):
+    """서로 다른 SQLite 파일인 (primary, 복제본) 세션 팩토리. 복제는 일어나지 않습니다."""
+    engines = [
+        create_async_engine(f"sqlite+aiosqlite:///{tmp_path / name}.db")
+        for name in ("primary", "replica")
+    ]
+    for engine in engines:
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+    try:
+        yield tuple(sessionmaker(bind=engine, class_=AsyncSession, expire_on_commit=False) for engine in engines)
+    finally:
+        for engine in engines:
+            await engine.dispose()
+
+@pytest_asyncio.fixture
+async def replica_client(replica_sessions):
+    """primary와 복제본을 서로 다른 SQLite 파일로 둔 클라이언트."""
+    primary, replica = replica_sessions
+
+    async def override_get_db():
+        async with primary() as session:
+            yield session
+
+    overrides = dict(app.dependency_overrides)
+    app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_read_db] = make_read_db_dependency(primary, replica)
+    try:
+        async with httpx.AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as c:
+            yield c
+    finally:
+        app.dependency_overrides = overrides
+
+async def test_reads_go_to_replica_unless_primary_requested(replica_client: httpx.AsyncClient):
+    """Test that reads hit the replica by default and the primary when the header is set."""
+    response = await replica_client.post("/reviews/", json={"rating": 5, "comment": "Replica"})
+    assert response.status_code == 201
+    review_id = response.json()["id"]
+
+    # 복제본에는 아직 없으므로 기본 목록 읽기는 보이지 않습니다.
+    assert (await replica_client.get("/reviews/")).json() == []
+
+    headers = {READ_PRIMARY_HEADER: "true"}
+    response = await replica_client.get(f"/reviews/{review_id}", headers=headers)
+    assert response.status_code == 200
+    assert response.json()["comment"] == "Replica"
+    assert [r["id"] for r in (await replica_client.get("/reviews/", headers=headers)).json()] == [review_id]
+
+async def test_single_review_cache_is_filled_from_primary(replica_client: httpx.AsyncClient, replica_sessions):
+    """Test that an update is not undone by re-caching the lagging replica's old row."""
+    primary, replica = replica_sessions
+    response = await replica_client.post("/reviews/", json={"rating": 3, "comment": "Before"})
+    review_id = int(response.json()["id"])
+
+    # 복제본이 생성까지만 따라온 상태를 흉내 냅니다.
+    async with primary() as session:
+        row = (await session.execute(select(models.Review.__table__).filter(models.Review.id == review_id))).one()
+    async with replica() as session:
+        await session.execute(insert(models.Review), [row._asdict()])
+        await session.commit()
+
+    assert (await replica_client.get(f"/reviews/{review_id}")).json()["comment"] == "Before"
+    response = await replica_client.put(f"/reviews/{review_id}", json={"rating": 3, "comment": "After"})
+    assert response.status_code == 200
+
+    response = await replica_client.get(f"/reviews/{review_id}")
+    assert response.status_code == 200
+    assert response.json()["comment"] == "After"
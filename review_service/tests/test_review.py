@@ -1,4 +1,6 @@
 # tests/test_reviews.py
+import json
+
 import pytest
 from httpx import AsyncClient
 
@@ -68,3 +70,117 @@ async def test_delete_review(client: AsyncClient):
     assert delete_response.status_code == 204
     get_response = await client.get(f"/reviews/{review_id}")
     assert get_response.status_code == 404
+
+async def test_read_reviews_with_cursor(client: AsyncClient):
+    """Test keyset pagination with an opaque cursor."""
+    for i in range(3):
+        await client.post("/reviews/", json={"rating": 3, "comment": f"Cursor {i}"})
+
+    first_page = await client.get("/reviews/", params={"limit": 2})
+    assert first_page.status_code == 200
+    cursor = first_page.headers["X-Next-Cursor"]
+    first_ids = [review["id"] for review in first_page.json()]
+
+    second_page = await client.get("/reviews/", params={"limit": 2, "cursor": cursor})
+    assert second_page.status_code == 200
+    second_ids = [review["id"] for review in second_page.json()]
+
+    assert len(second_ids) >= 1
+    assert set(first_ids).isdisjoint(second_ids)
+    assert int(second_ids[0]) < int(first_ids[-1])
+
+async def test_read_reviews_with_invalid_cursor(client: AsyncClient):
+    """Test that a malformed cursor is rejected."""
+    response = await client.get("/reviews/", params={"cursor": "not-a-cursor"})
+    assert response.status_code == 400
+
+async def test_create_reviews_batch(client: AsyncClient, bus, outbox_relay):
+    """Test bulk creation with per-item results."""
+    response = await client.post(
+        "/reviews/batch",
+        json=[
+            {"rating": 5, "comment": "Batch photo", "photo_name": "a.png"},
+            {"rating": 9, "comment": "Out of range"},
+            {"rating": 2},
+        ],
+    )
+    assert response.status_code == 200
+    data = response.json()
+    assert data["created"] == 2
+    assert data["failed"] == 1
+
+    results = data["results"]
+    assert [result["index"] for result in results] == [0, 1, 2]
+    assert results[0]["success"] and results[0]["review"]["review_type"] == "PHOTO"
+    assert not results[1]["success"] and results[1]["error"]
+    assert results[2]["success"] and results[2]["review"]["review_type"] == "RATING"
+
+    await outbox_relay.drain()
+    published_ids = {message.review.id for message in bus.messages}
+    assert results[0]["review"]["id"] in published_ids
+    assert results[2]["review"]["id"] in published_ids
+
+    read_response = await client.get(f"/reviews/{results[0]['review']['id']}")
+    assert read_response.status_code == 200
+
+@pytest.mark.parametrize("returning", [True, False])
+async def test_write_path_with_and_without_returning(client: AsyncClient, db_session, monkeypatch, returning):
+    """Test create/update/delete on both the RETURNING path and the dialect fallback."""
+    dialect = db_session.get_bind().dialect
+    for kind in ("insert", "update", "delete"):
+        monkeypatch.setattr(dialect, f"{kind}_returning", returning and getattr(dialect, f"{kind}_returning"))
+
+    create_response = await client.post("/reviews/", json={"rating": 4, "comment": "Returning"})
+    assert create_response.status_code == 201
+    created = create_response.json()
+    assert created["created_at"] is not None
+
+    update_response = await client.put(f"/reviews/{created['id']}", json={"rating": 3})
+    assert update_response.status_code == 200
+    updated = update_response.json()
+    assert updated["rating"] == 3
+    assert updated["review_type"] == "RATING"
+    assert updated["updated_at"] is not None
+
+    missing_response = await client.put("/reviews/1", json={"rating": 3})
+    assert missing_response.status_code == 404
+
+    assert (await client.delete(f"/reviews/{created['id']}")).status_code == 204
+    assert (await client.delete(f"/reviews/{created['id']}")).status_code == 404
+
+async def test_read_product_and_user_reviews(client: AsyncClient):
+    """Test filtered listing by product and by user with keyset pagination."""
+    product_id, user_id = "PROD-FILTER", "USER-FILTER"
+    await client.post("/reviews/", json={"product_id": product_id, "user_id": user_id, "rating": 5})
+    await client.post("/reviews/", json={"product_id": product_id, "user_id": "USER-OTHER", "rating": 4, "comment": "Nice"})
+    await client.post("/reviews/", json={"product_id": "PROD-OTHER", "user_id": user_id, "rating": 3, "comment": "Ok"})
+
+    product_reviews = (await client.get(f"/products/{product_id}/reviews")).json()
+    assert len(product_reviews) == 2
+    assert all(review["product_id"] == product_id for review in product_reviews)
+    assert int(product_reviews[0]["id"]) > int(product_reviews[1]["id"])
+
+    rating_only = (await client.get(f"/products/{product_id}/reviews", params={"review_type": "RATING"})).json()
+    assert [review["user_id"] for review in rating_only] == [user_id]
+
+    first_page = await client.get(f"/users/{user_id}/reviews", params={"limit": 1})
+    assert [review["product_id"] for review in first_page.json()] == ["PROD-OTHER"]
+    second_page = await client.get(
+        f"/users/{user_id}/reviews", params={"limit": 1, "cursor": first_page.headers["X-Next-Cursor"]}
+    )
+    assert [review["product_id"] for review in second_page.json()] == [product_id]
+
+async def test_export_reviews_as_ndjson(client: AsyncClient):
+    """Test streaming export with the since_id filter."""
+    first_id = (await client.post("/reviews/", json={"rating": 5, "comment": "Export 1"})).json()["id"]
+    second_id = (await client.post("/reviews/", json={"rating": 4, "comment": "Export 2"})).json()["id"]
+
+    response = await client.get("/reviews/export", params={"since_id": first_id})
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    exported_ids = [review["id"] for review in lines]
+    assert first_id not in exported_ids
+    assert second_id in exported_ids
+    assert exported_ids == sorted(exported_ids, key=int)
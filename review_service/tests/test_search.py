@@ -0,0 +1,63 @@
+# tests/test_search.py
+import uuid
+from types import SimpleNamespace
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.search import SearchConfigurationError, check_search_support
+
+pytestmark = pytest.mark.asyncio
+
+async def test_search_reviews_ranked_and_filtered(client: AsyncClient):
+    """Test ranked full-text search with a product filter and keyset pagination."""
+    word = f"kw{uuid.uuid4().hex[:8]}"
+    product_id = f"PROD-{uuid.uuid4().hex[:8]}"
+    strong = (await client.post("/reviews/", json={
+        "product_id": product_id, "rating": 5, "comment": f"{word} {word} {word}",
+    })).json()
+    weak = (await client.post("/reviews/", json={
+        "product_id": product_id, "rating": 4,
+        "comment": f"{word} with a lot of other words that dilute the match considerably",
+    })).json()
+    await client.post("/reviews/", json={"product_id": "PROD-OTHER", "rating": 3, "comment": word})
+
+    response = await client.get("/reviews/search", params={"q": word, "product_id": product_id})
+    assert response.status_code == 200
+    hits = response.json()
+    assert [hit["id"] for hit in hits] == [strong["id"], weak["id"]]
+    assert hits[0]["score"] >= hits[1]["score"]
+
+    first_page = await client.get("/reviews/search", params={"q": word, "product_id": product_id, "limit": 1})
+    second_page = await client.get("/reviews/search", params={
+        "q": word, "product_id": product_id, "limit": 1, "cursor": first_page.headers["X-Next-Cursor"],
+    })
+    assert [hit["id"] for hit in second_page.json()] == [weak["id"]]
+
+async def test_search_follows_updates_and_deletes(client: AsyncClient):
+    """Test that the index is kept in sync with comment changes and deletions."""
+    before, after = f"kw{uuid.uuid4().hex[:8]}", f"kw{uuid.uuid4().hex[:8]}"
+    review_id = (await client.post("/reviews/", json={"rating": 2, "comment": before})).json()["id"]
+
+    await client.put(f"/reviews/{review_id}", json={"rating": 2, "comment": after})
+    assert (await client.get("/reviews/search", params={"q": before})).json() == []
+    assert [hit["id"] for hit in (await client.get("/reviews/search", params={"q": after})).json()] == [review_id]
+
+    await client.delete(f"/reviews/{review_id}")
+    assert (await client.get("/reviews/search", params={"q": after})).json() == []
+
+async def test_search_treats_query_as_plain_text(client: AsyncClient):
+    """Test that FTS syntax characters in the query do not cause errors."""
+    response = await client.get("/reviews/search", params={"q": 'NEAR( "unterminated * OR'})
+    assert response.status_code == 200
+
+async def test_unsupported_dialect_fails_at_startup():
+    """Test that an engine without a search backend is rejected once, before serving requests."""
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    try:
+        check_search_support(engine)
+        with pytest.raises(SearchConfigurationError, match="mssql"):
+            check_search_support(engine, SimpleNamespace(dialect=SimpleNamespace(name="mssql")))
+    finally:
+        await engine.dispose()
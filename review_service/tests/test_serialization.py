@@ -0,0 +1,92 @@
+# tests/test_serialization.py
+import gzip
+import zlib
+from datetime import datetime, timezone
+
+import msgpack
+import pytest
+from httpx import AsyncClient
+
+from app import models, schemas
+from app.compression import choose_encoding
+from app.pagination import NEXT_CURSOR_HEADER
+from app.serialization import MSGPACK_MEDIA_TYPE, review_to_dict
+
+@pytest.mark.parametrize("created_at", [
+    datetime(2025, 1, 2, 3, 4, 5, tzinfo=timezone.utc),
+    datetime(2025, 1, 2, 3, 4, 5, 678901),
+])
+def test_fast_path_matches_review_read(created_at):
+    """Test that the serializer fast path produces exactly what ReviewRead would."""
+    review = models.Review(
+        id=899068574025384676, product_id="PROD-001", user_id="USER-001", rating=4, comment="짧은 리뷰",
+        review_type=models.ReviewType.NORMAL, created_at=created_at, updated_at=None,
+    )
+    assert review_to_dict(review) == schemas.ReviewRead.model_validate(review).model_dump(mode="json")
+
+@pytest.mark.parametrize("accept_encoding, expected", [
+    ("gzip, deflate", "gzip"),
+    ("deflate", "deflate"),
+    ("gzip;q=0, deflate", "deflate"),
+    ("gzip;q=0.5, deflate;q=0.8", "deflate"),
+    ("*", "gzip"),
+    ("identity", ""),
+    ("", ""),
+])
+def test_choose_encoding(accept_encoding, expected):
+    """Test Accept-Encoding negotiation, including q-values and refusals."""
+    assert choose_encoding(accept_encoding) == expected
+
+async def _create_product_reviews(client: AsyncClient, product_id: str, count: int):
+    response = await client.post("/reviews/batch", json=[
+        {"product_id": product_id, "user_id": "USER-001", "rating": 5, "comment": "꽤 긴 리뷰 본문입니다. " * 10}
+        for _ in range(count)
+    ])
+    assert response.json()["created"] == count
+
+@pytest.mark.asyncio
+async def test_list_reviews_as_msgpack(client: AsyncClient):
+    """Test that Accept: application/msgpack returns the same page as JSON, with the cursor header."""
+    await _create_product_reviews(client, "PROD-MSGPACK", 3)
+    params = {"limit": 2}
+
+    as_json = await client.get("/products/PROD-MSGPACK/reviews", params=params)
+    as_msgpack = await client.get(
+        "/products/PROD-MSGPACK/reviews", params=params,
+        headers={"Accept": f"{MSGPACK_MEDIA_TYPE}, application/json;q=0.5"},
+    )
+
+    assert as_json.headers["content-type"] == "application/json"
+    assert as_msgpack.status_code == 200
+    assert as_msgpack.headers["content-type"] == MSGPACK_MEDIA_TYPE
+    assert msgpack.unpackb(as_msgpack.content) == as_json.json()
+    assert as_msgpack.headers[NEXT_CURSOR_HEADER] == as_json.headers[NEXT_CURSOR_HEADER]
+    assert "accept" in as_msgpack.headers["vary"].lower()
+
+    preferring_json = await client.get(
+        "/products/PROD-MSGPACK/reviews", params=params,
+        headers={"Accept": f"application/json, {MSGPACK_MEDIA_TYPE};q=0.5"},
+    )
+    assert preferring_json.headers["content-type"] == "application/json"
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("encoding, decompress", [("gzip", gzip.decompress), ("deflate", zlib.decompress)])
+async def test_large_list_responses_are_compressed(client: AsyncClient, encoding, decompress):
+    """Test that large list bodies are compressed on request and small ones are left alone."""
+    product_id = f"PROD-COMPRESS-{encoding}"
+    await _create_product_reviews(client, product_id, 20)
+
+    async with client.stream(
+        "GET", f"/products/{product_id}/reviews", headers={"Accept-Encoding": encoding},
+    ) as response:
+        raw = b"".join([chunk async for chunk in response.aiter_raw()])
+    plain = await client.get(f"/products/{product_id}/reviews", headers={"Accept-Encoding": "identity"})
+
+    assert response.headers["content-encoding"] == encoding
+    assert len(raw) < len(plain.content) / 4
+    assert decompress(raw) == plain.content
+    assert "content-encoding" not in plain.headers
+
+    small = await client.get("/products/PROD-EMPTY-COMPRESS/reviews", headers={"Accept-Encoding": encoding})
+    assert "content-encoding" not in small.headers
+    assert small.json() == []
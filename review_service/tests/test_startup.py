@@ -0,0 +1,84 @@
+# tests/test_startup.py
+import asyncio
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app import schema
+from app.main import app
+from app.messaging.bus import connect_with_retry
+
+pytestmark = pytest.mark.asyncio
+
+async def test_check_mode_requires_created_schema():
+    """Test that check mode fails on an empty database and passes once the schema is created."""
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    try:
+        with pytest.raises(schema.SchemaVersionError):
+            await schema.prepare_schema(engine, mode="check")
+
+        await schema.prepare_schema(engine, mode="create")
+        await schema.prepare_schema(engine, mode="check")
+    finally:
+        await engine.dispose()
+
+async def test_check_mode_rejects_version_mismatch(monkeypatch):
+    """Test that a build expecting a newer schema refuses to start."""
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    try:
+        await schema.create_schema(engine)
+        monkeypatch.setattr(schema, "SCHEMA_VERSION", schema.SCHEMA_VERSION + 1)
+        with pytest.raises(schema.SchemaVersionError, match="expects"):
+            await schema.check_schema(engine)
+    finally:
+        await engine.dispose()
+
+async def test_health_endpoints(client: AsyncClient, monkeypatch):
+    """Test that liveness is unconditional and readiness waits only for the schema."""
+    monkeypatch.setattr(app.state, "schema_ready", False, raising=False)
+    assert (await client.get("/health/live")).status_code == 200
+    assert (await client.get("/health/ready")).status_code == 503
+
+    monkeypatch.setattr(app.state, "schema_ready", True)
+    response = await client.get("/health/ready")
+    assert response.status_code == 200
+    # 테스트 환경의 실제 버스는 연결되지 않았지만 준비 상태를 막지 않습니다.
+    assert response.json() == {"status": "ready", "message_bus": "connecting"}
+
+async def test_connect_with_retry_until_bus_is_up(bus):
+    """Test that the background connect keeps retrying until the broker accepts."""
+    attempts = []
+
+    async def flaky_connect():
+        attempts.append(1)
+        if len(attempts) < 3:
+            raise ConnectionError("broker down")
+
+    bus.connect = flaky_connect
+    await asyncio.wait_for(connect_with_retry(bus, initial_delay=0.01), timeout=1)
+    assert len(attempts) == 3
+
+async def test_relay_waits_for_bus_connection(client: AsyncClient, bus, outbox_relay, monkeypatch):
+    """Test that the relay leaves the outbox untouched until the bus is connected."""
+    connected = False
+    monkeypatch.setattr(type(bus), "is_connected", property(lambda self: connected))
+    monkeypatch.setattr(outbox_relay, "_poll_interval", 0.01)
+    relay = outbox_relay
+
+    response = await client.post("/reviews/", json={"rating": 4, "comment": "Startup relay"})
+    review_id = response.json()["id"]
+
+    relay.start()
+    try:
+        await asyncio.sleep(0.05)
+        assert bus.messages == []
+
+        connected = True
+        for _ in range(100):
+            if any(m.review.id == review_id for m in bus.messages):
+                break
+            await asyncio.sleep(0.01)
+        assert any(m.review.id == review_id for m in bus.messages)
+    finally:
+        await relay.stop()
@@ -0,0 +1,50 @@
+# tests/test_workers.py
+import pytest
+
+from app import serve
+from app.database import pool_options
+from app.messaging import bus
+
+POSTGRES_URL = "postgresql+asyncpg://user:password@db/review_db"
+
+def test_pool_budget_is_split_across_workers():
+    """Test that each worker gets a fixed-size share of the connection budget."""
+    assert pool_options(POSTGRES_URL, 40, workers=4) == {
+        "pool_size": 10, "max_overflow": 0, "pool_timeout": pool_options(POSTGRES_URL, 1)["pool_timeout"],
+    }
+    assert pool_options(POSTGRES_URL, 3, workers=8)["pool_size"] == 1
+
+def test_pool_defaults_without_budget_or_for_sqlite():
+    """Test that no budget, or a SQLite URL, keeps SQLAlchemy's default pool."""
+    assert pool_options(POSTGRES_URL, None, workers=4) == {}
+    assert pool_options("sqlite+aiosqlite:///./test.db", 40, workers=4) == {}
+
+def test_channel_budget_is_split_across_workers(monkeypatch):
+    """Test that the RabbitMQ channel budget is divided per worker."""
+    monkeypatch.setattr(bus, "RABBITMQ_CHANNEL_BUDGET", None)
+    assert bus.channel_pool_size(workers=4) == bus.RABBITMQ_CHANNEL_POOL_SIZE
+
+    monkeypatch.setattr(bus, "RABBITMQ_CHANNEL_BUDGET", 16)
+    assert bus.channel_pool_size(workers=4) == 4
+    assert bus.channel_pool_size(workers=32) == 1
+
+def test_serve_arguments_default_to_web_concurrency(monkeypatch):
+    """Test that the worker count falls back to WEB_CONCURRENCY."""
+    monkeypatch.setenv("WEB_CONCURRENCY", "3")
+    args = serve._parse_args(["--port", "9000", "--graceful-timeout", "5"])
+
+    assert (args.workers, args.port) == (3, 9000)
+    assert serve._uvicorn_options(args)["timeout_graceful_shutdown"] == 5
+    assert serve.APP == "app.main:app"
+
+def test_node_base_uses_tsid_node_or_a_random_range_that_fits(monkeypatch):
+    """Test that pods without TSID_NODE get a random node range instead of all sharing node 0."""
+    monkeypatch.setattr("app.ids.TSID_NODE_BITS", 3)
+    monkeypatch.delenv("TSID_NODE", raising=False)
+    bases = {serve._node_base(workers=4) for _ in range(200)}
+    assert bases == {0, 1, 2, 3, 4}
+
+    monkeypatch.setenv("TSID_NODE", "4")
+    assert serve._node_base(workers=4) == 4
+    with pytest.raises(SystemExit):
+        serve._node_base(workers=5)
@@ -0,0 +1,85 @@
+import os
+from collections import OrderedDict
+from typing import NamedTuple, Optional
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+
+# 워커 하나가 상태를 기억해 둘 계정 수. 0이면 캐시를 쓰지 않습니다.
+REWARD_ACCOUNT_CACHE_SIZE = int(os.getenv("REWARD_ACCOUNT_CACHE_SIZE", "10000"))
+
+_PENDING_KEY = "reward_account_cache_pending"
+_LISTENING_KEY = "reward_account_cache_listening"
+
+
+class CachedAccount(NamedTuple):
+    version: int
+    balance: int
+
+
+class RewardAccountCache:
+    """
+    Bounded LRU of committed RewardAccount state, keyed by user id.
+
+    An entry is always the state at some committed version, never ahead of the event store,
+    so a hit only needs the events after `version` to be current, even if other workers
+    appended to the account meanwhile. State written by `save` is therefore held per session
+    and only published after that session commits; any rollback, including a savepoint's,
+    evicts it instead.
+    """
+    def __init__(self, maxsize: int = REWARD_ACCOUNT_CACHE_SIZE):
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[str, CachedAccount]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, user_id: str) -> Optional[CachedAccount]:
+        entry = self._entries.get(user_id)
+        if entry is not None:
+            self._entries.move_to_end(user_id)
+        return entry
+
+    def put(self, user_id: str, version: int, balance: int):
+        if self.maxsize <= 0:
+            return
+        current = self._entries.get(user_id)
+        # 느리게 끝난 읽기가 더 최신 상태를 덮어쓰지 않게 합니다.
+        if current is not None and current.version > version:
+            self._entries.move_to_end(user_id)
+            return
+        self._entries[user_id] = CachedAccount(version, balance)
+        self._entries.move_to_end(user_id)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def evict(self, user_id: str):
+        self._entries.pop(user_id, None)
+
+    def clear(self):
+        self._entries.clear()
+
+    def put_after_commit(self, session: AsyncSession, user_id: str, version: int, balance: int):
+        """Caches state written in `session` once it commits. A rollback evicts the account instead."""
+        if _LISTENING_KEY not in session.info:
+            # 세션 객체에 거는 리스너이므로 세션과 함께 사라집니다.
+            session.info[_LISTENING_KEY] = True
+            event.listen(session.sync_session, "after_commit", self._publish_pending)
+            # savepoint 롤백도 잡도록 soft rollback을 씁니다. 그 세션의 대기 상태는 모두 버립니다.
+            event.listen(session.sync_session, "after_soft_rollback", self._discard_pending)
+        session.info.setdefault(_PENDING_KEY, {})[user_id] = CachedAccount(version, balance)
+
+    def has_pending(self, session: AsyncSession, user_id: str) -> bool:
+        """True if `session` has written this account but not committed yet."""
+        return user_id in session.info.get(_PENDING_KEY, ())
+
+    def _publish_pending(self, sync_session):
+        for user_id, entry in sync_session.info.pop(_PENDING_KEY, {}).items():
+            self.put(user_id, entry.version, entry.balance)
+
+    def _discard_pending(self, sync_session, previous_transaction):
+        for user_id in sync_session.info.pop(_PENDING_KEY, {}):
+            self.evict(user_id)
+
+
+account_cache = RewardAccountCache()
@@ -20,6 +20,19 @@ class RewardEvent(Base):
         UniqueConstraint("aggregate_id", "version", name="uq_events_aggregate_version"),
     )
 
+class RewardAccountSnapshot(Base):
+    """
+    reward_snapshots 테이블. version까지의 이벤트를 재생한 RewardAccount 상태입니다.
+    format_version이 현재 RewardAccount.SNAPSHOT_FORMAT과 다른 스냅샷은 읽지 않습니다.
+    """
+    __tablename__ = "reward_snapshots"
+
+    aggregate_id = Column(String(255), primary_key=True)
+    version = Column(Integer, primary_key=True)
+    format_version = Column(Integer, nullable=False)
+    balance = Column(Integer, nullable=False)
+    created_at = Column(TIMESTAMP(timezone=True), nullable=False)
+
 class RewardBalance(Base):
     """reward_balances 테이블 (유저의 총 잔액 지갑)"""
     __tablename__ = "reward_balances"
@@ -1,76 +1,170 @@
+import os
+from datetime import datetime, timezone
+from typing import Optional
+
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import Text, cast, select
 from sqlalchemy.exc import IntegrityError
 
 from app.domain import models, events
-from .orm import RewardEvent
+from app.domain.registry import EventRegistry, event_registry
+from .cache import RewardAccountCache, account_cache
+from .orm import RewardAccountSnapshot, RewardEvent
+
+# 이벤트가 이 개수만큼 쌓일 때마다 save()가 스냅샷을 남깁니다. 0이면 스냅샷을 쓰지 않습니다.
+SNAPSHOT_INTERVAL = int(os.getenv("REWARD_SNAPSHOT_INTERVAL", "100"))
 
 class ConcurrencyError(Exception):
     """Custom exception for version conflicts."""
     pass
 
 class RewardAccountRepository:
-    def __init__(self, session: AsyncSession):
+    def __init__(
+        self,
+        session: AsyncSession,
+        snapshot_interval: int = SNAPSHOT_INTERVAL,
+        cache: Optional[RewardAccountCache] = account_cache,
+        registry: EventRegistry = event_registry,
+    ):
         self.session = session
+        self.snapshot_interval = snapshot_interval
+        self.cache = cache
+        self.registry = registry
 
     async def save(self, account: models.RewardAccount) -> list[events.Event]:
         """
         Saves uncommitted events from the aggregate to the event store.
+        When the batch crosses a multiple of `snapshot_interval`, a snapshot of the
+        resulting state is written in the same flush, so it exists only if the events do.
+        The cache takes the new state when the session commits; a version conflict evicts it.
         """
         if not account._uncommitted_events:
             return []
 
         # Convert domain events to ORM model instances
         orm_events = []
+        start_version = account.version - len(account._uncommitted_events)
         for i, event in enumerate(account._uncommitted_events):
             # Calculate the correct version for each event in the batch
-            event_version = (account.version - len(account._uncommitted_events)) + i + 1
+            event_version = start_version + i + 1
             orm_events.append(
                 RewardEvent(
                     event_id=event.event_id,
-                    aggregate_id=account.id,
-                    event_type=type(event).__name__,
+                    aggregate_id=account.user_id,
+                    event_type=self.registry.name_of(event),
                     payload=event.model_dump(mode="json"),
                     version=event_version,
                     timestamp=event.timestamp,
                 )
             )
-        
+
         # Add all new ORM event objects to the session
         self.session.add_all(orm_events)
-        
+        if self._snapshot_due(start_version, account.version):
+            self.session.add(self._snapshot_of(account))
+
         try:
             await self.session.flush()
         except IntegrityError as e:
-            raise ConcurrencyError(f"Version conflict for account {account.id}") from e
+            # 다른 쓰기가 먼저 들어왔으므로 캐시된 상태도 믿지 않습니다.
+            if self.cache is not None:
+                self.cache.evict(account.user_id)
+            raise ConcurrencyError(f"Version conflict for account {account.user_id}") from e
 
+        if self.cache is not None:
+            self.cache.put_after_commit(self.session, account.user_id, account.version, account.balance)
         saved_events = list(account._uncommitted_events)
         account._uncommitted_events.clear()
         return saved_events
 
     async def load(self, user_id: str) -> models.RewardAccount:
         """
-        Loads an aggregate's current state by replaying all its events.
+        Loads an aggregate's current state. A cached account only needs the events after
+        its cached version; otherwise the latest snapshot plus the events recorded after it
+        are used, or the full event stream if there is no snapshot.
+        """
+        cached = self.cache.get(user_id) if self.cache is not None else None
+        if cached is not None:
+            domain_events = await self._load_events(user_id, cached.version)
+            account = models.RewardAccount.from_snapshot(user_id, cached.version, cached.balance, domain_events)
+        else:
+            account = await self._load_from_store(user_id)
+
+        if self.cache is not None:
+            self._remember(account)
+        return account
+
+    async def _load_from_store(self, user_id: str) -> models.RewardAccount:
+        snapshot = await self._latest_snapshot(user_id)
+        after_version = snapshot.version if snapshot is not None else 0
+        domain_events = await self._load_events(user_id, after_version)
+
+        if snapshot is None:
+            if not domain_events:
+                raise ValueError(f"Account for user {user_id} not found.")
+            # Use the class method to replay events and build the aggregate state
+            return models.RewardAccount.replay_from_events(domain_events)
+        return models.RewardAccount.from_snapshot(user_id, snapshot.version, snapshot.balance, domain_events)
+
+    def _remember(self, account: models.RewardAccount):
+        if self.cache.has_pending(self.session, account.user_id):
+            # 이 세션이 아직 커밋하지 않은 이벤트가 섞인 상태이므로 커밋할 때 반영합니다.
+            self.cache.put_after_commit(self.session, account.user_id, account.version, account.balance)
+        else:
+            self.cache.put(account.user_id, account.version, account.balance)
+
+    async def rebuild_snapshot(self, user_id: str) -> RewardAccountSnapshot:
+        """
+        Replays the full event stream and snapshots the result in the current format.
+        Use this after bumping `RewardAccount.SNAPSHOT_FORMAT` instead of waiting for the next save.
         """
-        # Use the ORM model in the select statement
+        domain_events = await self._load_events(user_id, after_version=0)
+        if not domain_events:
+            raise ValueError(f"Account for user {user_id} not found.")
+        account = models.RewardAccount.replay_from_events(domain_events)
+
+        # 같은 버전의 옛 형식 스냅샷이 있으면 덮어씁니다.
+        snapshot = await self.session.merge(self._snapshot_of(account))
+        await self.session.flush()
+        return snapshot
+
+    async def _load_events(self, user_id: str, after_version: int) -> list[events.Event]:
+        # 우리가 쓴 행이므로 ORM 객체를 만들지 않고, payload도 JSON 텍스트 그대로 받아
+        # 이벤트 클래스의 검증기가 한 번에 파싱하게 합니다. 드라이버의 JSON 디코더를 피하려고
+        # TEXT로 CAST합니다(PostgreSQL의 json은 텍스트로 저장되므로 비용이 거의 없습니다).
         stmt = (
-            select(RewardEvent)
-            .where(RewardEvent.aggregate_id == user_id)
+            select(RewardEvent.event_type, cast(RewardEvent.payload, Text))
+            .where(RewardEvent.aggregate_id == user_id, RewardEvent.version > after_version)
             .order_by(RewardEvent.version)
         )
-        
+
         result = await self.session.execute(stmt)
-        # .scalars().all() directly returns a list of OrmEvent objects
-        orm_event_rows = result.scalars().all()
+        decode = self.registry.decode_stored
+        return [decode(event_type, payload) for event_type, payload in result]
 
-        if not orm_event_rows:
-            raise ValueError(f"Account for user {user_id} not found.")
+    def _snapshot_due(self, start_version: int, end_version: int) -> bool:
+        if self.snapshot_interval <= 0:
+            return False
+        return end_version // self.snapshot_interval > start_version // self.snapshot_interval
 
-        # Recreate domain events from the ORM model's payload
-        domain_events = []
-        for row in orm_event_rows:
-            event_class = getattr(events, row.event_type)
-            domain_events.append(event_class(**row.payload))
+    @staticmethod
+    def _snapshot_of(account: models.RewardAccount) -> RewardAccountSnapshot:
+        return RewardAccountSnapshot(
+            aggregate_id=account.user_id,
+            version=account.version,
+            format_version=models.RewardAccount.SNAPSHOT_FORMAT,
+            balance=account.balance,
+            created_at=datetime.now(timezone.utc),
+        )
 
-        # Use the class method to replay events and build the aggregate state
-        return models.RewardAccount.replay_from_events(domain_events)
\ No newline at end of file
+    async def _latest_snapshot(self, user_id: str) -> Optional[RewardAccountSnapshot]:
+        stmt = (
+            select(RewardAccountSnapshot)
+            .where(
+                RewardAccountSnapshot.aggregate_id == user_id,
+                RewardAccountSnapshot.format_version == models.RewardAccount.SNAPSHOT_FORMAT,
+            )
+            .order_by(RewardAccountSnapshot.version.desc())
+            .limit(1)
+        )
+        return (await self.session.execute(stmt)).scalar_one_or_none()
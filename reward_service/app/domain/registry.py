@@ -0,0 +1,82 @@
+import json
+from typing import Callable, Optional, Union
+
+from . import events
+
+# 업캐스터가 서로를 가리켜 끝나지 않는 경우를 막습니다.
+MAX_UPCAST_STEPS = 16
+
+Upcaster = Callable[[dict], tuple[str, dict]]
+
+
+class UnknownEventTypeError(ValueError):
+    """Raised when a stored event type is neither registered nor upcastable."""
+    pass
+
+
+class EventRegistry:
+    """
+    Explicit mapping between stored event type names and event classes.
+
+    When an event is renamed or its payload changes shape, register the new class under a new
+    name and add an upcaster for the old name. Stored rows keep their original name; the
+    upcaster turns `(old name, payload)` into `(new name, payload)` while decoding.
+    """
+    def __init__(self):
+        self._classes: dict[str, type[events.Event]] = {}
+        self._names: dict[type[events.Event], str] = {}
+        self._upcasters: dict[str, Upcaster] = {}
+
+    def register(self, event_class: type[events.Event], name: Optional[str] = None) -> type[events.Event]:
+        name = name or event_class.__name__
+        if name in self._classes or name in self._upcasters:
+            raise ValueError(f"Event type {name!r} is already registered.")
+        self._classes[name] = event_class
+        self._names[event_class] = name
+        return event_class
+
+    def upcaster(self, old_name: str) -> Callable[[Upcaster], Upcaster]:
+        """Decorator registering `fn(payload) -> (new_name, new_payload)` for rows stored as `old_name`."""
+        def decorator(upcast: Upcaster) -> Upcaster:
+            if old_name in self._classes or old_name in self._upcasters:
+                raise ValueError(f"Event type {old_name!r} is already registered.")
+            self._upcasters[old_name] = upcast
+            return upcast
+        return decorator
+
+    def name_of(self, event: events.Event) -> str:
+        try:
+            return self._names[type(event)]
+        except KeyError:
+            raise UnknownEventTypeError(f"Event class {type(event).__name__} is not registered.") from None
+
+    def decode(self, event_type: str, payload: dict) -> events.Event:
+        """Builds an event from a payload dict, upcasting legacy types first. Fully validated."""
+        for _ in range(MAX_UPCAST_STEPS):
+            event_class = self._classes.get(event_type)
+            if event_class is not None:
+                return event_class.model_validate(payload)
+            upcast = self._upcasters.get(event_type)
+            if upcast is None:
+                raise UnknownEventTypeError(f"Unknown event type {event_type!r}.")
+            event_type, payload = upcast(payload)
+        raise UnknownEventTypeError(f"Too many upcasting steps for event type {event_type!r}.")
+
+    def decode_stored(self, event_type: str, payload: Union[str, bytes, dict]) -> events.Event:
+        """
+        Fast path for rows this service wrote itself. Current event types are parsed straight
+        from the stored JSON text by the class's compiled validator, without building an
+        intermediate dict. Legacy types fall back to `decode` so their upcasters still run.
+        """
+        event_class = self._classes.get(event_type)
+        if event_class is None:
+            return self.decode(event_type, json.loads(payload) if isinstance(payload, (str, bytes)) else payload)
+        if isinstance(payload, dict):
+            # 드라이버가 이미 JSON을 풀어 준 경우
+            return event_class.model_validate(payload)
+        return event_class.model_validate_json(payload)
+
+
+event_registry = EventRegistry()
+for _event_class in (events.RewardPointsGranted, events.RewardPointsRefunded, events.RewardPointsRevoked):
+    event_registry.register(_event_class)
@@ -0,0 +1,15 @@
+from app.adapters.cache import RewardAccountCache
+
+def test_cache_is_bounded_and_keeps_newest_version():
+    """
+    캐시는 maxsize를 넘으면 가장 오래 쓰지 않은 항목을 버리고, 더 오래된 버전으로 덮어쓰지 않는지 테스트합니다.
+    """
+    cache = RewardAccountCache(maxsize=2)
+    cache.put("a", 5, 50)
+    cache.put("b", 1, 10)
+    cache.get("a")
+    cache.put("c", 1, 10)
+    assert cache.get("b") is None and len(cache) == 2
+
+    cache.put("a", 3, 30)
+    assert cache.get("a") == (5, 50)
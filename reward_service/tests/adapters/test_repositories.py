@@ -0,0 +1,178 @@
+import pytest
+from sqlalchemy import delete, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.adapters.cache import RewardAccountCache, account_cache
+from app.adapters.orm import RewardAccountSnapshot, RewardEvent
+from app.adapters.repositories import ConcurrencyError, RewardAccountRepository
+from app.domain.events import RewardPointsGranted
+from app.domain.models import RewardAccount
+from app.domain.registry import EventRegistry
+
+pytestmark = pytest.mark.asyncio
+
+USER_ID = "user-repository"
+
+@pytest.fixture(autouse=True)
+def empty_account_cache():
+    """테스트 트랜잭션은 롤백되므로 모듈 캐시에 남은 상태가 다음 테스트로 넘어가지 않게 합니다."""
+    account_cache.clear()
+    yield
+    account_cache.clear()
+
+async def test_save_and_load_round_trip(db_session: AsyncSession):
+    """
+    저장한 이벤트를 다시 재생하면 같은 잔액과 버전의 계정이 복원되는지 테스트합니다.
+    """
+    account = RewardAccount(user_id=USER_ID)
+    account.grant_points(100, reason="리뷰 보상", review_id="review-1")
+    account.refund_points(30, reason="주문 사용", order_id="order-1")
+
+    repository = RewardAccountRepository(db_session)
+    saved = await repository.save(account)
+    assert len(saved) == 2
+    assert account._uncommitted_events == []
+
+    loaded = await repository.load(USER_ID)
+    assert loaded.balance == 70
+    assert loaded.version == 2
+
+async def test_save_with_stale_version_raises_concurrency_error(db_session: AsyncSession):
+    """
+    같은 버전에서 출발한 두 계정이 저장하면 두 번째는 ConcurrencyError가 나는지 테스트합니다.
+    """
+    first, second = RewardAccount(user_id=USER_ID), RewardAccount(user_id=USER_ID)
+    first.grant_points(10, reason="첫 번째", review_id="review-2")
+    second.grant_points(20, reason="두 번째", review_id="review-3")
+
+    repository = RewardAccountRepository(db_session)
+    await repository.save(first)
+    with pytest.raises(ConcurrencyError):
+        # 실패한 flush가 픽스처의 바깥 트랜잭션까지 되돌리지 않도록 savepoint 안에서 저장합니다.
+        async with db_session.begin_nested():
+            await repository.save(second)
+
+async def test_load_reads_latest_snapshot_and_tail_events(db_session: AsyncSession):
+    """
+    interval마다 스냅샷이 저장되고, load는 스냅샷 이후의 이벤트만 읽어 복원하는지 테스트합니다.
+    """
+    user_id = "user-snapshot"
+    account = RewardAccount(user_id=user_id)
+    repository = RewardAccountRepository(db_session, snapshot_interval=4)
+    for i in range(10):
+        account.grant_points(10, reason="리뷰 보상", review_id=f"review-snapshot-{i}")
+        if i % 3 == 2:
+            await repository.save(account)
+    await repository.save(account)
+
+    snapshots = (await db_session.execute(
+        select(RewardAccountSnapshot.version, RewardAccountSnapshot.balance)
+        .where(RewardAccountSnapshot.aggregate_id == user_id)
+        .order_by(RewardAccountSnapshot.version)
+    )).all()
+    assert [tuple(row) for row in snapshots] == [(6, 60), (9, 90)]
+
+    # 스냅샷 이전 이벤트를 지워도 복원 결과가 같으면 스냅샷 뒤쪽만 읽은 것입니다.
+    await db_session.execute(
+        delete(RewardEvent).where(RewardEvent.aggregate_id == user_id, RewardEvent.version <= 9)
+    )
+    loaded = await repository.load(user_id)
+    assert (loaded.balance, loaded.version) == (100, 10)
+
+async def test_outdated_snapshot_format_is_ignored_until_rebuilt(db_session: AsyncSession, monkeypatch):
+    """
+    스냅샷 형식이 바뀌면 옛 스냅샷 대신 전체 이벤트를 재생하고, rebuild_snapshot으로 새로 만드는지 테스트합니다.
+    """
+    user_id = "user-snapshot-format"
+    account = RewardAccount(user_id=user_id)
+    repository = RewardAccountRepository(db_session, snapshot_interval=2)
+    account.grant_points(100, reason="리뷰 보상", review_id="review-format-1")
+    account.refund_points(30, reason="주문 사용", order_id="order-format-1")
+    await repository.save(account)
+
+    # 옛 형식의 스냅샷이 잘못된 잔액을 담고 있다고 가정합니다.
+    await db_session.execute(
+        update(RewardAccountSnapshot).where(RewardAccountSnapshot.aggregate_id == user_id).values(balance=-1)
+    )
+    assert (await repository.load(user_id)).balance == -1
+
+    monkeypatch.setattr(RewardAccount, "SNAPSHOT_FORMAT", RewardAccount.SNAPSHOT_FORMAT + 1)
+    assert (await repository.load(user_id)).balance == 70
+
+    snapshot = await repository.rebuild_snapshot(user_id)
+    assert (snapshot.version, snapshot.balance, snapshot.format_version) == (2, 70, RewardAccount.SNAPSHOT_FORMAT)
+    await db_session.execute(delete(RewardEvent).where(RewardEvent.aggregate_id == user_id))
+    assert (await repository.load(user_id)).balance == 70
+
+async def test_cache_reads_only_events_after_cached_version(db_session: AsyncSession):
+    """
+    커밋된 save는 캐시에 반영되고, 캐시 hit이면 캐시된 버전 이후의 이벤트만 읽는지 테스트합니다.
+    """
+    user_id = "user-cache"
+    cache = RewardAccountCache(maxsize=10)
+    repository = RewardAccountRepository(db_session, snapshot_interval=0, cache=cache)
+    account = RewardAccount(user_id=user_id)
+    account.grant_points(100, reason="리뷰 보상", review_id="review-cache-1")
+    account.refund_points(30, reason="주문 사용", order_id="order-cache-1")
+    await repository.save(account)
+    assert cache.get(user_id) is None  # 커밋 전에는 반영하지 않습니다.
+
+    await db_session.commit()
+    assert cache.get(user_id) == (2, 70)
+
+    # 다른 워커가 이벤트를 추가했다고 가정합니다. 캐시된 버전 이전 이벤트는 읽지 않아야 합니다.
+    other = RewardAccount.from_snapshot(user_id, 2, 70)
+    other.grant_points(5, reason="다른 워커", review_id="review-cache-2")
+    await RewardAccountRepository(db_session, snapshot_interval=0, cache=None).save(other)
+    await db_session.execute(delete(RewardEvent).where(RewardEvent.aggregate_id == user_id, RewardEvent.version <= 2))
+
+    loaded = await repository.load(user_id)
+    assert (loaded.balance, loaded.version) == (75, 3)
+    assert cache.get(user_id) == (3, 75)
+
+async def test_cache_drops_state_on_rollback_and_conflict(db_session: AsyncSession):
+    """
+    롤백된 save는 캐시에 남지 않고, ConcurrencyError는 캐시 항목을 지우는지 테스트합니다.
+    """
+    user_id = "user-cache-evict"
+    cache = RewardAccountCache(maxsize=10)
+    repository = RewardAccountRepository(db_session, snapshot_interval=0, cache=cache)
+    account = RewardAccount(user_id=user_id)
+    account.grant_points(10, reason="리뷰 보상", review_id="review-evict-1")
+    await repository.save(account)
+    await db_session.commit()
+    assert cache.get(user_id) == (1, 10)
+
+    async with db_session.begin_nested() as savepoint:
+        account.grant_points(10, reason="롤백될 보상", review_id="review-evict-2")
+        await repository.save(account)
+        await savepoint.rollback()
+    await db_session.commit()
+    assert cache.get(user_id) is None
+
+    cache.put(user_id, 1, 10)
+    stale = RewardAccount.from_snapshot(user_id, 0, 0)
+    stale.grant_points(10, reason="충돌", review_id="review-evict-3")
+    with pytest.raises(ConcurrencyError):
+        async with db_session.begin_nested():
+            await repository.save(stale)
+    assert cache.get(user_id) is None
+
+async def test_load_upcasts_legacy_event_rows(db_session: AsyncSession):
+    """
+    이름이 바뀌기 전에 저장된 이벤트 행도 레지스트리의 업캐스터로 복원되는지 테스트합니다.
+    """
+    user_id = "user-legacy-events"
+    registry = EventRegistry()
+    registry.register(RewardPointsGranted)
+    registry.upcaster("PointsAwarded")(lambda payload: ("RewardPointsGranted", payload))
+
+    legacy = RewardPointsGranted(user_id=user_id, review_id="review-legacy", points=40, reason="옛 이벤트")
+    db_session.add(RewardEvent(
+        event_id=legacy.event_id, aggregate_id=user_id, event_type="PointsAwarded",
+        payload=legacy.model_dump(mode="json"), version=1, timestamp=legacy.timestamp,
+    ))
+    await db_session.flush()
+
+    loaded = await RewardAccountRepository(db_session, cache=None, registry=registry).load(user_id)
+    assert (loaded.balance, loaded.version) == (40, 1)
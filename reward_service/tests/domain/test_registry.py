@@ -0,0 +1,56 @@
+import json
+
+import pytest
+
+from app.domain import events
+from app.domain.registry import EventRegistry, UnknownEventTypeError, event_registry
+
+def _stored(event: events.Event) -> tuple[str, str]:
+    return event_registry.name_of(event), json.dumps(event.model_dump(mode="json"))
+
+@pytest.mark.parametrize("event", [
+    events.RewardPointsGranted(user_id="u", review_id="r", points=10, reason="보상"),
+    events.RewardPointsRefunded(user_id="u", order_id="o", points=5, reason="사용"),
+    events.RewardPointsRevoked(user_id="u", review_id="r", points=3, reason="회수"),
+])
+def test_decode_stored_round_trips_registered_events(event):
+    """저장된 JSON 텍스트, bytes, dict 어느 형태로 받아도 원래 이벤트로 복원되는지 테스트합니다."""
+    event_type, payload = _stored(event)
+
+    assert event_registry.decode_stored(event_type, payload) == event
+    assert event_registry.decode_stored(event_type, payload.encode()) == event
+    assert event_registry.decode_stored(event_type, json.loads(payload)) == event
+
+def test_upcaster_decodes_renamed_and_changed_events():
+    """옛 이름과 옛 payload 형태로 저장된 이벤트가 업캐스터를 거쳐 현재 클래스로 복원되는지 테스트합니다."""
+    registry = EventRegistry()
+    registry.register(events.RewardPointsGranted)
+
+    @registry.upcaster("PointsAwarded")
+    def points_awarded(payload: dict):
+        payload = dict(payload, points=payload.pop("amount"), reason="legacy")
+        return "RewardPointsGranted", payload
+
+    stored = json.dumps({
+        "event_id": "5f0c6a58-3f0e-4a4e-9d55-7c1c3f4f8e21", "timestamp": "2024-05-01T12:00:00",
+        "user_id": "u", "review_id": "r", "amount": 7,
+    })
+    event = registry.decode_stored("PointsAwarded", stored)
+
+    assert isinstance(event, events.RewardPointsGranted)
+    assert (event.points, event.reason) == (7, "legacy")
+    assert str(event.event_id) == "5f0c6a58-3f0e-4a4e-9d55-7c1c3f4f8e21"
+
+def test_unknown_and_duplicate_event_types_are_rejected():
+    """등록되지 않은 이름은 getattr처럼 아무 속성이나 집지 않고 거절하는지 테스트합니다."""
+    registry = EventRegistry()
+    registry.register(events.RewardPointsGranted)
+
+    with pytest.raises(UnknownEventTypeError):
+        registry.decode_stored("Event", "{}")
+    with pytest.raises(UnknownEventTypeError):
+        registry.name_of(events.RewardPointsRevoked(user_id="u", review_id="r", points=1, reason="x"))
+    with pytest.raises(ValueError):
+        registry.register(events.RewardPointsGranted)
+    with pytest.raises(ValueError):
+        registry.upcaster("RewardPointsGranted")(lambda payload: ("RewardPointsGranted", payload))
@@ -0,0 +1,25 @@
+import pytest
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from service_observability.database import instrument_engine
+from service_observability.metrics import MetricsRegistry
+
+
+@pytest.mark.asyncio
+async def test_instrumented_engine_records_query_metrics():
+    """공유 계측 모듈로 감싼 엔진의 쿼리 지표가 레지스트리에 기록되는지 테스트합니다."""
+    # Arrange
+    registry = MetricsRegistry()
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    instrument_engine(engine, registry=registry)
+
+    # Act
+    async with engine.connect() as conn:
+        await conn.execute(text("SELECT 1"))
+    await engine.dispose()
+    body = registry.render()
+
+    # Assert
+    assert 'db_query_duration_seconds_count{database=":memory:",fingerprint="SELECT ?"} 1.0' in body
+    assert "db_pool_checkout_wait_seconds_count" in body
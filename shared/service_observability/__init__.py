@@ -0,0 +1,4 @@
+"""
+두 서비스가 함께 쓰는 관측 도구. 의존성 없는 Prometheus 텍스트 포맷 레지스트리(metrics)와
+SQLAlchemy 엔진·풀 계측(database)을 제공합니다. 노출은 각 서비스가 맡습니다.
+"""
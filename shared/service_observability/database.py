@@ -0,0 +1,133 @@
+# service_observability/database.py
+import functools
+import json
+import logging
+import os
+import re
+import time
+from typing import Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from .metrics import MetricsRegistry, registry as default_registry
+
+DATABASE_METRICS_ENABLED = os.getenv("DATABASE_METRICS_ENABLED", "true").lower() == "true"
+DATABASE_SLOW_QUERY_MS = float(os.getenv("DATABASE_SLOW_QUERY_MS", "500"))
+DATABASE_MAX_FINGERPRINTS = int(os.getenv("DATABASE_MAX_FINGERPRINTS", "200"))
+
+slow_query_logger = logging.getLogger("app.db.slow_query")
+
+_PLACEHOLDER = r"(?:\?|\$\d+(?:::[\w ]+)?|%\([^)]+\)s|:\w+)"
+_FINGERPRINT_RULES = [
+    (re.compile(r"'(?:[^']|'')*'"), "?"),                                  # 문자열 리터럴
+    (re.compile(_PLACEHOLDER), "?"),                                        # 드라이버별 바인드 파라미터
+    (re.compile(r"\b\d+(?:\.\d+)?\b"), "?"),                               # 숫자 리터럴
+    # IN (?, ?, ...) 목록과 multi-row VALUES (?, ?), (?, ?), ...
+    (re.compile(r"\(\s*\?(?:\s*,\s*\?)*\s*\)(?:\s*,\s*\(\s*\?(?:\s*,\s*\?)*\s*\))*"), "(...)"),
+    (re.compile(r"\s+"), " "),
+]
+_MAX_FINGERPRINT_LENGTH = 200
+_OTHER_FINGERPRINT = "other"
+
+
+@functools.lru_cache(maxsize=2048)
+def fingerprint_statement(statement: str) -> str:
+    """리터럴과 바인드 파라미터, 가변 길이 목록을 지워 같은 형태의 쿼리를 하나로 묶습니다."""
+    fingerprint = statement
+    for pattern, replacement in _FINGERPRINT_RULES:
+        fingerprint = pattern.sub(replacement, fingerprint)
+    return fingerprint.strip()[:_MAX_FINGERPRINT_LENGTH]
+
+
+def instrument_engine(
+    engine: AsyncEngine | Engine,
+    registry: MetricsRegistry = default_registry,
+    slow_query_ms: float = DATABASE_SLOW_QUERY_MS,
+    max_fingerprints: int = DATABASE_MAX_FINGERPRINTS,
+    database: Optional[str] = None,
+):
+    """
+    엔진/풀 이벤트에 훅을 걸어 쿼리 지연 히스토그램(쿼리 fingerprint별), 풀 대기 시간,
+    사용 중/유휴 커넥션 게이지, 느린 쿼리 로그를 수집합니다.
+    database 레이블은 기본적으로 URL의 DB 이름이며, 같은 DB의 복제본처럼 구분이 필요하면 지정합니다.
+    """
+    sync_engine = engine.sync_engine if isinstance(engine, AsyncEngine) else engine
+    pool = sync_engine.pool
+    database = database or sync_engine.url.database or sync_engine.url.get_backend_name()
+
+    query_duration = registry.histogram(
+        "db_query_duration_seconds", "SQL statement latency by statement fingerprint.",
+        ["database", "fingerprint"],
+    )
+    query_errors = registry.counter(
+        "db_query_errors", "SQL statements that raised an error.", ["database", "fingerprint"],
+    )
+    slow_queries = registry.counter(
+        "db_slow_queries", "SQL statements slower than the slow query threshold.", ["database"],
+    )
+    checkout_wait = registry.histogram(
+        "db_pool_checkout_wait_seconds", "Time spent waiting for a pooled connection.", ["database"],
+    )
+    connections = registry.gauge(
+        "db_pool_connections", "Pooled connections by state.", ["database", "state"],
+    )
+
+    # 수집 시점에 풀 상태를 읽습니다. QueuePool 계열이 아니면 해당 값이 없습니다.
+    for state, method_name in (("active", "checkedout"), ("idle", "checkedin"), ("overflow", "overflow")):
+        method = getattr(pool, method_name, None)
+        if method is not None:
+            connections.set_function(method, database=database, state=state)
+
+    known_fingerprints = set()
+
+    def label_for(statement: str) -> str:
+        fingerprint = fingerprint_statement(statement)
+        if fingerprint in known_fingerprints:
+            return fingerprint
+        if len(known_fingerprints) >= max_fingerprints:
+            return _OTHER_FINGERPRINT
+        known_fingerprints.add(fingerprint)
+        return fingerprint
+
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_start_time", []).append(time.perf_counter())
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - conn.info["query_start_time"].pop()
+        query_duration.observe(elapsed, database=database, fingerprint=label_for(statement))
+
+        if elapsed * 1000 >= slow_query_ms:
+            slow_queries.inc(database=database)
+            slow_query_logger.warning(json.dumps({
+                "event": "slow_query",
+                "database": database,
+                "duration_ms": round(elapsed * 1000, 3),
+                "threshold_ms": slow_query_ms,
+                "fingerprint": fingerprint_statement(statement),
+                "executemany": executemany,
+            }, ensure_ascii=False))
+
+    @event.listens_for(sync_engine, "handle_error")
+    def handle_error(exception_context):
+        conn = exception_context.connection
+        if conn is not None and conn.info.get("query_start_time"):
+            conn.info["query_start_time"].pop()
+        if exception_context.statement:
+            query_errors.inc(database=database, fingerprint=label_for(exception_context.statement))
+
+    # 풀에는 "체크아웃 시작" 이벤트가 없으므로 connect()를 감싸 대기 시간을 잽니다.
+    original_connect = pool.connect
+
+    @functools.wraps(original_connect)
+    def timed_connect():
+        started = time.perf_counter()
+        try:
+            return original_connect()
+        finally:
+            checkout_wait.observe(time.perf_counter() - started, database=database)
+
+    pool.connect = timed_connect